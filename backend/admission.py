@@ -0,0 +1,125 @@
+"""Admission control and load shedding for the recommend endpoint."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from major_matcher import config
+from major_matcher.metrics import Metrics, get_metrics
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; carries the HTTP status and Retry-After seconds."""
+
+    def __init__(self, status: int, retry_after: int, reason: str) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class Admission:
+    """Outcome of an admitted request."""
+
+    def __init__(self, degraded: bool, waited: float) -> None:
+        self.degraded = degraded
+        self.waited = waited
+
+
+class AdmissionController:
+    """Bounded in-flight limit with a deadline-bounded wait queue.
+
+    The expected wait of a new request is estimated from the queue depth and a
+    moving average of service times. Requests are rejected up front when the
+    queue is full (429) or the estimate exceeds the wait budget (503), and
+    give up with 503 when their deadline passes while queued.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        wait_budget: Optional[float] = None,
+        degraded_mode: Optional[bool] = None,
+        degrade_queue_depth: Optional[int] = None,
+        metrics: Optional[Metrics] = None,
+        clock: Callable[[], float] = time.monotonic,
+        initial_service_time: float = 0.05,
+    ) -> None:
+        self.max_in_flight = config.ADMISSION_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+        self.max_queue = config.ADMISSION_MAX_QUEUE if max_queue is None else max_queue
+        self.wait_budget = config.ADMISSION_WAIT_BUDGET_SECONDS if wait_budget is None else wait_budget
+        self.degraded_mode = config.ADMISSION_DEGRADED_MODE if degraded_mode is None else degraded_mode
+        self.degrade_queue_depth = (
+            config.ADMISSION_DEGRADE_QUEUE_DEPTH if degrade_queue_depth is None else degrade_queue_depth
+        )
+        self.metrics = metrics or get_metrics()
+        self._clock = clock
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.queued = 0
+        self.service_time = initial_service_time
+
+    def estimated_wait(self) -> float:
+        """Seconds a request arriving now is expected to queue."""
+
+        if self.in_flight < self.max_in_flight:
+            return 0.0
+        return (self.queued + 1) * self.service_time / self.max_in_flight
+
+    def _publish_locked(self) -> None:
+        self.metrics.gauge("admission.in_flight", self.in_flight)
+        self.metrics.gauge("admission.queue_depth", self.queued)
+
+    def _reject(self, status: int, wait: float, reason: str) -> AdmissionRejected:
+        self.metrics.incr(f"admission.shed.{reason}")
+        return AdmissionRejected(status, max(1, math.ceil(wait)), reason)
+
+    @contextmanager
+    def admit(self) -> Iterator[Admission]:
+        """Hold an in-flight slot for the duration of the ``with`` block."""
+
+        arrived = self._clock()
+        with self._cond:
+            wait = self.estimated_wait()
+            if self.in_flight >= self.max_in_flight and self.queued >= self.max_queue:
+                raise self._reject(429, wait, "queue_full")
+            if wait > self.wait_budget:
+                raise self._reject(503, wait, "overload")
+
+            depth_at_arrival = self.queued
+            deadline = arrived + self.wait_budget
+            self.queued += 1
+            self._publish_locked()
+            try:
+                while self.in_flight >= self.max_in_flight:
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        raise self._reject(503, self.estimated_wait(), "timeout")
+                    self._cond.wait(remaining)
+            finally:
+                self.queued -= 1
+            self.in_flight += 1
+            self._publish_locked()
+
+        degraded = self.degraded_mode and depth_at_arrival >= self.degrade_queue_depth
+        self.metrics.incr("admission.admitted")
+        if degraded:
+            self.metrics.incr("admission.degraded")
+        started = self._clock()
+        try:
+            yield Admission(degraded=degraded, waited=started - arrived)
+        finally:
+            elapsed = self._clock() - started
+            with self._cond:
+                self.in_flight -= 1
+                self.service_time = 0.8 * self.service_time + 0.2 * elapsed
+                self._publish_locked()
+                self._cond.notify()
+
+
+__all__ = ["Admission", "AdmissionController", "AdmissionRejected"]
@@ -2,43 +2,303 @@
 
 from __future__ import annotations
 
+import logging
 import os, sys
+import time
+import uuid
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.routing import PathConverter
 
-from major_matcher import normalize_user_data, recommend
+from backend.admission import AdmissionController, AdmissionRejected
+from backend.static_assets import StaticAssets
+
+from major_matcher import (
+    CAPTURE_PATH,
+    CAPTURE_SAMPLE_RATE,
+    DIVERSITY_MODES,
+    FAST_JSON_RESPONSES,
+    SHADOW_VARIANTS,
+    STATIC_SERVING,
+    WARMUP_ON_STARTUP,
+    UnknownCatalogError,
+    UnknownMajorError,
+    UnknownSessionError,
+    RequestLogger,
+    WEIGHT_PROFILES,
+    assign_variant,
+    get_metrics,
+    get_readiness,
+    get_request_logger,
+    get_session_store,
+    normalize_user_data,
+    recommend_with_shadows,
+    related_majors,
+    render_response,
+    start_warm_up,
+    to_form_data,
+    what_if,
+)
 
 app = Flask(__name__)
 CORS(app)
+if FAST_JSON_RESPONSES:
+    # Compact JSON even under app.run(debug=True), so the fragment path stays on.
+    app.json.compact = True
+
+admission = AdmissionController()
+capture = RequestLogger(path=str(CAPTURE_PATH), sample_rate=CAPTURE_SAMPLE_RATE, name="capture")
+
+if WARMUP_ON_STARTUP:
+    start_warm_up()
+
+
+@app.route("/readyz", methods=["GET"])
+def readyz():
+    readiness = get_readiness()
+    return jsonify(readiness.snapshot()), 200 if readiness.ready else 503
+
+
+def _choose_variant(payload) -> str:
+    requested = payload.get("variant")
+    if requested in WEIGHT_PROFILES:
+        return requested
+    unit_id = payload.get("user_id") or payload.get("session_id") or uuid.uuid4().hex
+    return assign_variant(str(unit_id))
+
+
+def _fast_json() -> bool:
+    """Whether pre-rendered fragments reproduce what ``jsonify`` would send."""
+
+    provider = app.json
+    return (
+        FAST_JSON_RESPONSES
+        and type(provider) is DefaultJSONProvider
+        and provider.ensure_ascii
+        and provider.sort_keys
+        and (provider.compact or (provider.compact is None and not app.debug))
+    )
+
+
+def _record_variant_metrics(variant, served_top, shadows) -> None:
+    metrics = get_metrics()
+    metrics.incr(f"variant.{variant}.requests")
+    for name, ranked in shadows.items():
+        metrics.incr(f"shadow.{name}.requests")
+        shadow_top = ranked[0]["major_name"] if ranked else None
+        if shadow_top == served_top:
+            metrics.incr(f"shadow.{name}.top1_agree")
+
+
+def _log_request(request_id, started, status, trace, **fields) -> None:
+    """Queue one sampled request record; ``trace`` is ``None`` for unsampled requests."""
+
+    if trace is None:
+        return
+    timings = {name: round(ms, 2) for name, ms in trace.get("timings_ms", {}).items()}
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+    record = {
+        "request_id": request_id,
+        "route": request.path,
+        "status": status,
+        "catalog_version": trace.get("catalog_version"),
+        "timings_ms": timings,
+        "top_ids": trace.get("top_ids", []),
+    }
+    record.update(fields)
+    get_request_logger().log(record)
 
 
 @app.route("/api/recommend", methods=["POST"])
 def api_recommend():
+    started = time.perf_counter()
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    trace = {} if get_request_logger().sampled() else None
     payload = request.get_json(force=True, silent=True) or {}
+    explain = payload.get("explain") is True
+    rendered = _fast_json()
+
+    catalog = request.args.get("catalog") or payload.get("catalog")
+    variant = _choose_variant(payload)
+    shadow_variants = [name for name in SHADOW_VARIANTS if name != variant]
+    diversity = payload.get("diversity") if payload.get("diversity") in DIVERSITY_MODES else None
 
     normalized = normalize_user_data(payload)
+    if capture.sampled():
+        capture.log({
+            "catalog": catalog,
+            "variant": payload.get("variant"),
+            "explain": explain,
+            "payload": to_form_data(normalized),
+        })
     try:
-        recommendations = recommend(normalized)
+        with admission.admit() as admitted:
+            recommendations, shadows = recommend_with_shadows(
+                normalized,
+                variant=variant,
+                shadow_variants=shadow_variants,
+                catalog=catalog,
+                degraded=admitted.degraded,
+                trace=trace,
+                rendered=rendered,
+                diversity=diversity,
+                explain=explain,
+            )
+    except AdmissionRejected as exc:
+        _log_request(request_id, started, exc.status, trace, catalog=catalog, shed=exc.reason)
+        response = jsonify({"error": "Server busy, please retry.", "reason": exc.reason})
+        response.headers["Retry-After"] = str(exc.retry_after)
+        return response, exc.status
+    except UnknownCatalogError:
+        _log_request(request_id, started, 404, trace, catalog=catalog)
+        return jsonify({"error": f"Unknown catalog: {catalog}"}), 404
     except Exception as exc:  # pragma: no cover - surfaced via JSON
+        _log_request(request_id, started, 500, trace, catalog=catalog, error=str(exc))
         return jsonify({"error": str(exc)}), 500
 
-    if not recommendations:
-        return jsonify({
-            "top_recommendation": None,
-            "alternatives": [],
-            "message": "No recommendation available. Please add more details.",
+    served_top = None
+    if recommendations:
+        served_top = recommendations[0].major_name if rendered else recommendations[0]["major_name"]
+    _record_variant_metrics(variant, served_top, shadows)
+    _log_request(
+        request_id,
+        started,
+        200,
+        trace,
+        catalog=catalog,
+        variant=variant,
+        degraded=admitted.degraded,
+        queued_ms=round(admitted.waited * 1000, 2),
+    )
+
+    fields = {
+        "variant": variant,
+        "degraded": admitted.degraded,
+        "message": "success" if recommendations else "No recommendation available. Please add more details.",
+    }
+    if rendered:
+        response = app.response_class(render_response(recommendations, fields), mimetype=app.json.mimetype)
+    else:
+        response = jsonify({
+            "top_recommendation": recommendations[0] if recommendations else None,
+            "alternatives": recommendations[1:],
+            **fields,
         })
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+@app.route("/api/metrics", methods=["GET"])
+def api_metrics():
+    return jsonify(get_metrics().snapshot())
+
+
+@app.route("/api/recommend/what-if", methods=["POST"])
+def api_what_if():
+    payload = request.get_json(force=True, silent=True) or {}
+
+    catalog = request.args.get("catalog") or payload.get("catalog")
+    variant = payload.get("variant") if payload.get("variant") in WEIGHT_PROFILES else None
+    target_major = payload.get("target_major")
+
+    normalized = normalize_user_data(payload)
+    try:
+        result = what_if(
+            normalized,
+            payload.get("grade_deltas") or {},
+            catalog=catalog,
+            variant=variant,
+            target_major=target_major,
+        )
+    except UnknownCatalogError:
+        return jsonify({"error": f"Unknown catalog: {catalog}"}), 404
+    except UnknownMajorError:
+        return jsonify({"error": f"Unknown major: {target_major}"}), 404
+    except (TypeError, ValueError) as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    return jsonify(result)
+
+
+@app.route("/api/sessions", methods=["POST"])
+def api_create_session():
+    payload = request.get_json(force=True, silent=True) or {}
+
+    catalog = request.args.get("catalog") or payload.get("catalog")
+    variant = payload.get("variant") if payload.get("variant") in WEIGHT_PROFILES else None
+
+    store = get_session_store()
+    try:
+        session_id = store.create(normalize_user_data(payload), catalog=catalog, variant=variant)
+        recommendations = store.update(session_id, [])
+    except UnknownCatalogError:
+        return jsonify({"error": f"Unknown catalog: {catalog}"}), 404
+
+    return jsonify({"session_id": session_id, "recommendations": recommendations}), 201
+
+
+@app.route("/api/sessions/<session_id>", methods=["PATCH"])
+def api_update_session(session_id: str):
+    payload = request.get_json(force=True, silent=True) or {}
+    edits = payload.get("edits", [])
+    if not isinstance(edits, list):
+        return jsonify({"error": "edits must be a list"}), 400
+
+    try:
+        recommendations = get_session_store().update(session_id, edits)
+    except UnknownSessionError:
+        return jsonify({"error": f"Unknown or expired session: {session_id}"}), 404
+    except (TypeError, ValueError) as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    return jsonify({"session_id": session_id, "recommendations": recommendations})
+
+
+@app.route("/api/sessions/<session_id>", methods=["DELETE"])
+def api_close_session(session_id: str):
+    try:
+        get_session_store().close(session_id)
+    except UnknownSessionError:
+        return jsonify({"error": f"Unknown or expired session: {session_id}"}), 404
+    return jsonify({"session_id": session_id, "closed": True})
+
+
+class _AssetPathConverter(PathConverter):
+    """A ``path`` that never starts with ``api/``, so API misses keep Flask's 404/405."""
+
+    regex = r"(?!api(?:/|$))[^/].*?"
+
+
+if STATIC_SERVING:
+    static_assets = StaticAssets()
+    app.url_map.converters["asset_path"] = _AssetPathConverter
+
+    @app.route("/", defaults={"name": "index.html"}, methods=["GET"])
+    @app.route("/<asset_path:name>", methods=["GET"])
+    def frontend_asset(name: str):
+        response = static_assets.response(name)
+        if response is None:
+            return jsonify({"error": f"Not found: {name}"}), 404
+        return response
+
+
+@app.route("/api/majors/<major_id>/related", methods=["GET"])
+def api_related_majors(major_id: str):
+    k = request.args.get("k", default=5, type=int)
+    catalog = request.args.get("catalog")
+    try:
+        related = related_majors(major_id, k=k, catalog=catalog)
+    except UnknownCatalogError:
+        return jsonify({"error": f"Unknown catalog: {catalog}"}), 404
+    except UnknownMajorError:
+        return jsonify({"error": f"Unknown major: {major_id}"}), 404
 
-    top = recommendations[0]
-    alternatives = recommendations[1:]
-    return jsonify({
-        "top_recommendation": top,
-        "alternatives": alternatives,
-        "message": "success",
-    })
+    return jsonify({"major_id": major_id, "related": related})
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     app.run(host="0.0.0.0", port=5000, debug=True)
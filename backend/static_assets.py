@@ -0,0 +1,229 @@
+"""Precompressed, cache-validated serving of the frontend files.
+
+``build_static`` copies the frontend into a build directory. Stylesheets and
+scripts get a content hash in their file name, and the HTML pages are
+rewritten to point at those names. Every text asset is stored next to
+``.gz`` (and ``.br`` when the ``brotli`` package is installed) copies, and a
+manifest records the strong ETag of each variant.
+``StaticAssets`` then answers requests from the manifest: it picks brotli,
+then gzip, as far as the client accepts them, returns 304 for a matching
+``If-None-Match`` and sends the file through ``send_file``, which uses the
+server's ``wsgi.file_wrapper`` (``sendfile`` on servers such as gunicorn).
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from flask import Response, request, send_file
+
+from major_matcher import config
+
+try:  # optional: brotli is smaller than gzip but not a hard dependency
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+FINGERPRINTED_SUFFIXES = (".css", ".js")
+MIME_TYPES = {
+    ".html": "text/html",
+    ".css": "text/css",
+    ".js": "application/javascript",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".ico": "image/x-icon",
+}
+COMPRESSIBLE_SUFFIXES = (".html", ".css", ".js", ".json", ".svg")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# Encoding suffix on disk, preferred first.
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _compress(data: bytes) -> Dict[str, bytes]:
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    return variants
+
+
+def build_static(source_dir: Optional[Path] = None, build_dir: Optional[Path] = None) -> Dict[str, object]:
+    """Fingerprint and precompress the frontend; returns the written manifest.
+
+    The build is written to a temporary sibling directory and renamed into
+    place, so processes starting together (server workers, the reloader) never
+    see a half-written build. If another process installs its build first,
+    that one is kept; both are built from the same sources.
+    """
+
+    source_dir = Path(source_dir or config.FRONTEND_DIR)
+    build_dir = Path(build_dir or config.STATIC_BUILD_DIR)
+    build_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{build_dir.name}-", dir=build_dir.parent))
+    try:
+        manifest = _write_build(source_dir, staging)
+        _install(staging, build_dir)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    logger.info("Built %d static assets into %s", len(manifest["files"]), build_dir)
+    return manifest
+
+
+def _install(staging: Path, build_dir: Path) -> None:
+    """Swap ``staging`` in as ``build_dir`` with directory renames."""
+
+    retired = None
+    if build_dir.exists():
+        retired = staging.with_name(staging.name + "-old")
+        try:
+            os.replace(build_dir, retired)
+        except FileNotFoundError:  # another process moved it first
+            retired = None
+    try:
+        os.replace(staging, build_dir)
+    except OSError:
+        # Another process installed its build in between; keep that one.
+        if not (build_dir / MANIFEST_NAME).exists():
+            raise
+    if retired is not None:
+        shutil.rmtree(retired, ignore_errors=True)
+
+
+def _write_build(source_dir: Path, build_dir: Path) -> Dict[str, object]:
+    sources = sorted(
+        path for path in source_dir.iterdir() if path.is_file() and path.suffix in MIME_TYPES
+    )
+    renames: Dict[str, str] = {}
+    for path in sources:
+        if path.suffix in FINGERPRINTED_SUFFIXES:
+            renames[path.name] = f"{path.stem}.{_digest(path.read_bytes())[:10]}{path.suffix}"
+    reference = None
+    if renames:
+        reference = re.compile(r'((?:href|src)=")(' + "|".join(map(re.escape, renames)) + r')(")')
+
+    files: Dict[str, Dict[str, object]] = {}
+    for path in sources:
+        data = path.read_bytes()
+        if path.suffix == ".html" and reference is not None:
+            text = reference.sub(lambda m: m.group(1) + renames[m.group(2)] + m.group(3), data.decode("utf-8"))
+            data = text.encode("utf-8")
+        names = [path.name] + ([renames[path.name]] if path.name in renames else [])
+        variants = {"identity": data}
+        if path.suffix in COMPRESSIBLE_SUFFIXES and len(data) >= config.STATIC_COMPRESS_MIN_BYTES:
+            variants.update(
+                (encoding, body) for encoding, body in _compress(data).items() if len(body) < len(data)
+            )
+        for name in names:
+            entry = {"immutable": name != path.name, "encodings": {}}
+            for encoding, body in variants.items():
+                suffix = dict(_ENCODINGS).get(encoding, "")
+                (build_dir / (name + suffix)).write_bytes(body)
+                entry["encodings"][encoding] = {
+                    "file": name + suffix,
+                    "etag": _digest(body)[:32],
+                    "size": len(body),
+                }
+            files[name] = entry
+
+    manifest = {"source": str(source_dir), "files": files}
+    (build_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return manifest
+
+
+def _is_stale(source_dir: Path, build_dir: Path) -> bool:
+    manifest_path = build_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return True
+    built = manifest_path.stat().st_mtime
+    return any(path.stat().st_mtime > built for path in source_dir.iterdir() if path.suffix in MIME_TYPES)
+
+
+def _accepts(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _sep, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+class StaticAssets:
+    """Manifest-backed static file responses."""
+
+    def __init__(self, source_dir: Optional[Path] = None, build_dir: Optional[Path] = None) -> None:
+        self.source_dir = Path(source_dir or config.FRONTEND_DIR)
+        self.build_dir = Path(build_dir or config.STATIC_BUILD_DIR)
+        if _is_stale(self.source_dir, self.build_dir):
+            manifest = build_static(self.source_dir, self.build_dir)
+        else:
+            try:
+                manifest = json.loads((self.build_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+            except FileNotFoundError:  # swapped out by a concurrent build
+                manifest = build_static(self.source_dir, self.build_dir)
+        self.files: Dict[str, Dict[str, object]] = manifest["files"]
+
+    def _choose(self, encodings: Dict[str, Dict[str, object]]) -> str:
+        accepted = _accepts(request.headers.get("Accept-Encoding", ""))
+        for encoding, _suffix in _ENCODINGS:
+            if encoding in encodings and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                return encoding
+        return "identity"
+
+    def response(self, name: str) -> Optional[Response]:
+        """Response for ``name``, or ``None`` if it is not a built asset."""
+
+        entry = self.files.get(name)
+        if entry is None:
+            return None
+        encoding = self._choose(entry["encodings"])
+        variant = entry["encodings"][encoding]
+        cache_control = IMMUTABLE_CACHE if entry["immutable"] else REVALIDATE_CACHE
+
+        if variant["etag"] in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = send_file(
+                self.build_dir / variant["file"],
+                mimetype=MIME_TYPES[Path(name).suffix],
+                conditional=False,
+                etag=False,
+                max_age=None,
+            )
+            # The stored file may be ``name.gz``; the client should see ``name``.
+            del response.headers["Content-Disposition"]
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(variant["etag"])
+        response.headers["Cache-Control"] = cache_control
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+__all__ = ["StaticAssets", "build_static"]
@@ -1,8 +1,13 @@
-
+import os, sys
+import time
+import uuid
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS 
 
+from major_matcher.request_log import get_request_logger
+
 app = Flask(__name__)
 CORS(app) 
 
@@ -91,6 +96,8 @@ MAJORS_DATA = [
     }
 ]
 
+MAJOR_IDS = {major["name_en"]: major["id"] for major in MAJORS_DATA}
+
 
 def calculate_match_score(user_data, major):
     score = 10 
@@ -188,9 +195,11 @@ def get_recommendations():
     if not request.json:
         return jsonify({"error": "Missing JSON data"}), 400
 
+    started = time.perf_counter()
+    request_logger = get_request_logger()
+    sampled = request_logger.sampled()
     user_data = request.json
-    print("Received data from frontend:", user_data)
-    
+
     results = []
     
     for major in MAJORS_DATA:
@@ -205,7 +214,17 @@ def get_recommendations():
             })
     
     results.sort(key=lambda x: int(x['match_score'].replace('%', '')), reverse=True)
-    
+
+    if sampled:
+        request_logger.log({
+            "request_id": request.headers.get("X-Request-ID") or uuid.uuid4().hex,
+            "route": request.path,
+            "status": 200,
+            "catalog_version": "builtin",
+            "timings_ms": {"total": round((time.perf_counter() - started) * 1000, 2)},
+            "top_ids": [MAJOR_IDS[result["name_en"]] for result in results[:5]],
+        })
+
     return jsonify(results[:5]) 
 
 if __name__ == '__main__':
@@ -1,21 +1,79 @@
-"""Utility package for the MajorMatch recommender demo."""
+"""Utility package for the MajorMatch recommender demo.
+
+Only ``config`` is imported eagerly; every other public name is imported from
+its submodule on first access. This keeps ``major_matcher.slim`` free of pandas
+and scikit-learn.
+"""
+
+import importlib
 
 from .config import *
-from .data_loader import load_context, load_majors_data
-from .recommender import recommend
-from .similarity import compute_similarity_scores, vectorize_majors, vectorize_user_profile
-from .user_profile import normalize_user_data
-from .rules import apply_rules, generate_recommendation_report, build_reason
-
-__all__ = [
-    "recommend",
-    "normalize_user_data",
-    "load_context",
-    "load_majors_data",
-    "vectorize_majors",
-    "vectorize_user_profile",
-    "compute_similarity_scores",
-    "apply_rules",
-    "generate_recommendation_report",
-    "build_reason",
-] + [name for name in dir() if name.isupper()]
+
+_CONFIG_NAMES = [name for name in dir() if name.isupper()]
+
+_EXPORTS = {
+    "recommend": "recommender",
+    "recommend_with_shadows": "recommender",
+    "related_majors": "recommender",
+    "RenderedRecommendation": "fragments",
+    "render_response": "fragments",
+    "what_if": "what_if_analysis",
+    "apply_grade_deltas": "what_if_analysis",
+    "minimal_grade_changes": "what_if_analysis",
+    "UnknownMajorError": "recommender",
+    "CatalogRegistry": "catalog",
+    "UnknownCatalogError": "catalog",
+    "get_registry": "catalog",
+    "register_catalog": "catalog",
+    "normalize_user_data": "user_profile",
+    "to_form_data": "user_profile",
+    "ProfileBatch": "profile_batch",
+    "normalize_batch": "profile_batch",
+    "load_context": "data_loader",
+    "load_majors_data": "data_loader",
+    "load_majors_columns": "stream_loader",
+    "load_majors_stream": "stream_loader",
+    "vectorize_majors": "similarity",
+    "vectorize_user_profile": "similarity",
+    "compute_similarity_scores": "similarity",
+    "apply_rules": "rules",
+    "apply_rule_variants": "rules",
+    "compute_rule_features": "rules",
+    "assign_variant": "experiments",
+    "resolve_weights": "experiments",
+    "UnknownVariantError": "experiments",
+    "Metrics": "metrics",
+    "get_metrics": "metrics",
+    "RequestLogger": "request_log",
+    "get_request_logger": "request_log",
+    "LiveSession": "live_session",
+    "SessionStore": "live_session",
+    "UnknownSessionError": "live_session",
+    "get_session_store": "live_session",
+    "Readiness": "warmup",
+    "get_readiness": "warmup",
+    "start_warm_up": "warmup",
+    "warm_up": "warmup",
+    "generate_recommendation_report": "rules",
+    "build_reason": "rules",
+    "CohortAggregator": "cohort",
+    "aggregate_cohort": "cohort",
+    "diversify": "diversity",
+    "explain_results": "explain",
+}
+
+__all__ = list(_EXPORTS) + _CONFIG_NAMES
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
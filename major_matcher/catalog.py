@@ -0,0 +1,306 @@
+"""Registry of majors catalogs with lazy loading and LRU eviction."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from . import config
+from .data_loader import load_context, load_majors_data, majors_digest
+from .fragments import MajorFragments
+from .index_io import load_index
+from .memory import deep_sizeof, index_memory_report
+from .similarity import vectorize_majors
+from .stream_loader import load_majors_stream
+from .term_cache import build_term_cache
+
+logger = logging.getLogger(__name__)
+
+Resources = Tuple[pd.DataFrame, Dict[str, object], Dict[str, object]]
+
+# Discoverable catalog names are plain folder names under CATALOGS_DIR.
+_CATALOG_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class UnknownCatalogError(KeyError):
+    """Raised when a catalog name is neither registered nor discoverable."""
+
+
+def estimate_resources_bytes(resources: Resources) -> int:
+    """Approximate the resident size of a loaded catalog in bytes."""
+
+    majors_df, context, vectors = resources
+    total = int(majors_df.memory_usage(deep=True).sum()) if not majors_df.empty else 0
+    total += deep_sizeof(context)
+    return total + index_memory_report(vectors)["total"]
+
+
+def index_source(majors_path: str | Path) -> Dict[str, str]:
+    """What a saved index of ``majors_path`` depends on: the file's content and the index settings."""
+
+    settings = {
+        "INDEX_MODE": config.INDEX_MODE,
+        "INDEX_COMPACT": bool(config.INDEX_COMPACT),
+        "COMPACT_MIN_DF": config.COMPACT_MIN_DF,
+        "COMPACT_MAX_FEATURES": config.COMPACT_MAX_FEATURES,
+        "LSA_COMPONENTS": config.LSA_COMPONENTS,
+        # Field weights are applied at query time; only the fields and their order shape the index.
+        "FIELD_WEIGHTS": list(config.FIELD_WEIGHTS),
+    }
+    encoded = json.dumps(settings, sort_keys=True, default=str).encode("utf-8")
+    return {"majors_sha256": majors_digest(majors_path), "settings_sha256": hashlib.sha256(encoded).hexdigest()}
+
+
+def _load_saved_index(majors_path: Path, majors_df: pd.DataFrame) -> Optional[Dict[str, object]]:
+    """Load ``CATALOG_INDEX_FILENAME`` next to ``majors_path`` if it was built from the same file and settings."""
+
+    index_path = majors_path.with_name(config.CATALOG_INDEX_FILENAME)
+    if not index_path.exists():
+        return None
+    try:
+        vectors = load_index(index_path)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Ignoring unreadable index %s: %s", index_path, exc)
+        return None
+    if vectors.get("source") != index_source(majors_path) or vectors["matrix"].shape[0] != len(majors_df):
+        logger.info("Ignoring stale index %s", index_path)
+        return None
+    if "major_id" in majors_df.columns:
+        vectors["major_ids"] = {str(major_id): row for row, major_id in enumerate(majors_df["major_id"])}
+    return vectors
+
+
+def _catalog_version(majors_path: Path) -> str:
+    """Short identifier of the majors file a catalog was built from."""
+
+    stat = majors_path.stat()
+    key = f"{majors_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+class _PendingBuild:
+    """Single-flight marker shared by concurrent first requests."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.resources: Optional[Resources] = None
+        self.error: Optional[BaseException] = None
+
+
+class CatalogRegistry:
+    """Map catalog names to majors/context files and cache their indexes.
+
+    Indexes are built on first use. All loaded catalogs share one memory budget;
+    once it is exceeded the least recently used catalogs are evicted (the most
+    recent one is always kept). Concurrent first requests for a catalog wait on
+    a single build instead of each building their own copy.
+    """
+
+    def __init__(self, memory_budget: Optional[int] = None) -> None:
+        self.memory_budget = config.CATALOG_MEMORY_BUDGET if memory_budget is None else memory_budget
+        self._specs: Dict[str, Dict[str, Path]] = {}
+        self._loaded: "OrderedDict[str, Tuple[Resources, int]]" = OrderedDict()
+        self._pending: Dict[str, _PendingBuild] = {}
+        self._lock = threading.Lock()
+        for name, spec in config.CATALOGS.items():
+            self.register(name, spec["majors_path"], spec.get("context_path"))
+
+    def register(
+        self,
+        name: str,
+        majors_path: str | Path,
+        context_path: str | Path | None = None,
+    ) -> None:
+        """Add or replace a catalog; a replaced catalog is rebuilt on next use."""
+
+        majors_path = Path(majors_path)
+        if context_path is None:
+            sibling = majors_path.with_name("context.txt")
+            context_path = sibling if sibling.exists() else config.CONTEXT_PATH
+        with self._lock:
+            self._specs[name] = {"majors_path": majors_path, "context_path": Path(context_path)}
+            self._loaded.pop(name, None)
+
+    def _discover(self, name: str) -> Optional[Dict[str, Path]]:
+        # Names come from requests; never let them leave CATALOGS_DIR.
+        if not isinstance(name, str) or not _CATALOG_NAME.fullmatch(name):
+            return None
+        base = config.CATALOGS_DIR.resolve()
+        folder = (base / name).resolve()
+        if folder.parent != base:
+            return None
+        majors_path = folder / "majors.json"
+        if not majors_path.exists():
+            return None
+        context_path = folder / "context.txt"
+        return {
+            "majors_path": majors_path,
+            "context_path": context_path if context_path.exists() else config.CONTEXT_PATH,
+        }
+
+    def spec(self, name: str) -> Dict[str, Path]:
+        """Return the ``majors_path``/``context_path`` of a registered or discoverable catalog."""
+
+        with self._lock:
+            spec = self._specs.get(name)
+        spec = spec or self._discover(name)
+        if spec is None:
+            raise UnknownCatalogError(name)
+        return dict(spec)
+
+    def names(self) -> List[str]:
+        discovered = []
+        if config.CATALOGS_DIR.is_dir():
+            discovered = [p.name for p in config.CATALOGS_DIR.iterdir() if (p / "majors.json").exists()]
+        with self._lock:
+            return sorted(set(self._specs) | set(discovered))
+
+    def loaded(self) -> Dict[str, int]:
+        """Return loaded catalogs (coldest first) with their estimated size."""
+
+        with self._lock:
+            return {name: size for name, (_resources, size) in self._loaded.items()}
+
+    def get(self, name: Optional[str] = None) -> Resources:
+        """Return ``(majors_df, context, vectors)`` for a catalog, building it once.
+
+        A build whose catalog was re-registered while it ran is dropped and
+        started again from the new spec.
+        """
+
+        name = name or config.DEFAULT_CATALOG
+        while True:
+            resources = self._get_once(name)
+            if resources is not None:
+                return resources
+
+    def _get_once(self, name: str) -> Optional[Resources]:
+        with self._lock:
+            if name in self._loaded:
+                self._loaded.move_to_end(name)
+                return self._loaded[name][0]
+            pending = self._pending.get(name)
+            owner = pending is None
+            if owner:
+                spec = self._specs.get(name)
+                if spec is None:
+                    spec = self._discover(name)
+                    if spec is None:
+                        raise UnknownCatalogError(name)
+                    self._specs[name] = spec
+                pending = _PendingBuild()
+                self._pending[name] = pending
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.resources
+
+        try:
+            resources = self._build(spec)
+            size = estimate_resources_bytes(resources)
+        except BaseException as exc:
+            pending.error = exc
+            with self._lock:
+                self._pending.pop(name, None)
+            pending.done.set()
+            raise
+
+        with self._lock:
+            self._pending.pop(name, None)
+            current = self._specs.get(name) is spec
+            if current:
+                self._loaded[name] = (resources, size)
+                self._loaded.move_to_end(name)
+                self._evict_locked()
+        if current:
+            pending.resources = resources
+        pending.done.set()
+        return pending.resources
+
+    def _build(self, spec: Dict[str, Path]) -> Resources:
+        majors_path = spec["majors_path"]
+        if not majors_path.exists():
+            raise FileNotFoundError(f"Majors file not found: {majors_path}")
+        started = time.perf_counter()
+        if majors_path.stat().st_size >= config.STREAMING_LOAD_MIN_BYTES:
+            majors_df, errors = load_majors_stream(majors_path)
+            for error in errors:
+                logger.warning("Skipped malformed record in %s: %s", majors_path, error)
+        else:
+            majors_df = load_majors_data(majors_path)
+        context = load_context(spec["context_path"])
+        loaded = time.perf_counter()
+
+        vectors = _load_saved_index(majors_path, majors_df)
+        source = "loaded" if vectors is not None else "built"
+        if vectors is None:
+            vectors = vectorize_majors(majors_df)
+        indexed = time.perf_counter()
+        vectors["term_cache"] = build_term_cache(vectors, context)
+        vectors["fragments"] = MajorFragments(majors_df)
+        vectors["catalog_version"] = _catalog_version(majors_path)
+        finished = time.perf_counter()
+        logger.info(
+            "Catalog %s: %d majors read in %.0f ms, index %s in %.0f ms, term cache in %.0f ms",
+            majors_path,
+            len(majors_df),
+            (loaded - started) * 1000,
+            source,
+            (indexed - loaded) * 1000,
+            (finished - indexed) * 1000,
+        )
+        return majors_df, context, vectors
+
+    def _evict_locked(self) -> None:
+        total = sum(size for _resources, size in self._loaded.values())
+        while total > self.memory_budget and len(self._loaded) > 1:
+            _name, (_resources, size) = self._loaded.popitem(last=False)
+            total -= size
+
+    def evict(self, name: str) -> bool:
+        with self._lock:
+            return self._loaded.pop(name, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._loaded.clear()
+
+
+_registry: Optional[CatalogRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> CatalogRegistry:
+    """Return the process-wide catalog registry."""
+
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CatalogRegistry()
+    return _registry
+
+
+def register_catalog(name: str, majors_path: str | Path, context_path: str | Path | None = None) -> None:
+    get_registry().register(name, majors_path, context_path)
+
+
+__all__ = [
+    "CatalogRegistry",
+    "UnknownCatalogError",
+    "estimate_resources_bytes",
+    "get_registry",
+    "index_source",
+    "register_catalog",
+]
@@ -0,0 +1,407 @@
+"""Streaming cohort analytics over recommendation results.
+
+``CohortAggregator`` consumes ``(profile, results)`` pairs one at a time. It
+keeps these, by segment (stream and overall-grade band) and by major:
+
+- how often each major is recommended and how often it ranks first;
+- a score sum and a fixed-bin score histogram;
+- one quantile sketch of scores per major.
+
+Majors are keyed by ``major_id`` when the caller passes the served ids, so
+same-named majors at different universities stay apart; the name is kept for
+display. Memory depends on the number of majors and segments, not on the
+cohort size.
+Every part merges exactly (sketches within their error bound), so workers can
+aggregate chunks and the parent merges them. ``to_dict`` and ``from_dict``
+serialize the state as JSON for merging across machines.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import config
+from .data_loader import load_context
+from .synthetic import grade_bands
+from .user_profile import normalize_user_data
+
+UNKNOWN_SEGMENT = "unknown"
+
+
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch with deterministic compaction.
+
+    Level ``h`` holds items of weight ``2**h``. A full level is sorted, and
+    every other item moves up one level. Memory is ``O(k)``, and the rank error
+    stays within about ``4 / k`` however many values are added.
+    """
+
+    def __init__(self, k: int = config.COHORT_SKETCH_SIZE) -> None:
+        self.k = int(k)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._levels: List[List[float]] = [[]]
+        self._flip = 0
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - 1 - level
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append([])
+                items.sort()
+                keep = [items.pop()] if len(items) % 2 else []
+                self._levels[level + 1].extend(items[self._flip :: 2])
+                self._flip ^= 1
+                self._levels[level] = keep
+            level += 1
+
+    def add(self, value: float) -> None:
+        value = float(value)
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._levels[0].append(value)
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """Approximate values at each fraction in ``qs``; ``None`` when empty."""
+
+        if not self.count:
+            return [None for _ in qs]
+        values = np.array([value for items in self._levels for value in items])
+        weights = np.concatenate(
+            [np.full(len(items), 2.0**level) for level, items in enumerate(self._levels)]
+        )
+        order = np.argsort(values, kind="stable")
+        values, cumulative = values[order], np.cumsum(weights[order])
+        answers = []
+        for q in qs:
+            if q <= 0:
+                answers.append(self.min)
+            elif q >= 1:
+                answers.append(self.max)
+            else:
+                position = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+                answers.append(float(min(max(values[min(position, len(values) - 1)], self.min), self.max)))
+        return answers
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "k": self.k,
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "levels": [list(items) for items in self._levels],
+            "flip": self._flip,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, object]) -> "QuantileSketch":
+        sketch = cls(int(state["k"]))
+        sketch.count = int(state["count"])
+        if sketch.count:
+            sketch.min, sketch.max = float(state["min"]), float(state["max"])
+        sketch._levels = [[float(value) for value in items] for items in state["levels"]] or [[]]
+        sketch._flip = int(state.get("flip", 0))
+        return sketch
+
+
+def grade_band(overall: Optional[float], bands: Dict[str, Tuple[float, float]]) -> str:
+    """Letter band of an overall grade: the highest band whose lower bound it reaches."""
+
+    if overall is None or overall != overall:
+        return UNKNOWN_SEGMENT
+    ordered = sorted(bands.items(), key=lambda item: item[1][0], reverse=True)
+    for letter, (low, _high) in ordered:
+        if overall >= low:
+            return letter
+    return ordered[-1][0]
+
+
+class _MajorCounters:
+    __slots__ = ("recommended", "top1", "score_sum", "histogram")
+
+    def __init__(self, bins: int) -> None:
+        self.recommended = 0
+        self.top1 = 0
+        self.score_sum = 0.0
+        self.histogram = np.zeros(bins, dtype=np.int64)
+
+    def merge(self, other: "_MajorCounters") -> None:
+        self.recommended += other.recommended
+        self.top1 += other.top1
+        self.score_sum += other.score_sum
+        self.histogram += other.histogram
+
+
+class CohortAggregator:
+    """Mergeable per-segment, per-major demand counters for a stream of results."""
+
+    def __init__(
+        self,
+        bands: Optional[Dict[str, Tuple[float, float]]] = None,
+        score_range: Tuple[float, float] = config.COHORT_SCORE_RANGE,
+        bins: int = config.COHORT_HISTOGRAM_BINS,
+        sketch_size: int = config.COHORT_SKETCH_SIZE,
+    ) -> None:
+        if bands is None:
+            bands = grade_bands(str(load_context().get("grade_scale", "")))
+        self.bands = {letter: (float(low), float(high)) for letter, (low, high) in bands.items()}
+        self.score_range = (float(score_range[0]), float(score_range[1]))
+        self.bins = int(bins)
+        self.sketch_size = int(sketch_size)
+        self.profiles = 0
+        self.segments: Dict[str, int] = {}
+        self._counters: Dict[Tuple[str, str], _MajorCounters] = {}
+        self._sketches: Dict[str, QuantileSketch] = {}
+        # major_id -> major_name; majors added without ids are keyed by name.
+        self._names: Dict[str, str] = {}
+
+    def segment(self, user_data: Dict[str, object]) -> str:
+        """``"<stream>/<band>"`` from the ``stream`` and ``overall_grade`` of a normalized profile."""
+
+        stream = user_data.get("stream") or UNKNOWN_SEGMENT
+        return f"{stream}/{grade_band(user_data.get('overall_grade'), self.bands)}"
+
+    def _bin(self, score: float) -> int:
+        low, high = self.score_range
+        position = int((score - low) / (high - low) * self.bins) if high > low else 0
+        return min(max(position, 0), self.bins - 1)
+
+    def add(
+        self,
+        user_data: Dict[str, object],
+        results: Sequence[Dict[str, object]],
+        major_ids: Optional[Sequence[object]] = None,
+    ) -> None:
+        """Count one profile and the recommendations it was served.
+
+        ``major_ids`` are the catalog ids of ``results`` in the same order
+        (``trace["top_ids"]`` of ``recommend_with_shadows``); without them
+        majors are told apart by name only.
+        """
+
+        segment = self.segment(user_data)
+        self.profiles += 1
+        self.segments[segment] = self.segments.get(segment, 0) + 1
+        for rank, item in enumerate(results):
+            name = str(item["major_name"])
+            key = name
+            if major_ids:
+                key = str(major_ids[rank])
+                self._names[key] = name
+            score = float(item["score"])
+            counters = self._counters.get((segment, key))
+            if counters is None:
+                counters = self._counters[(segment, key)] = _MajorCounters(self.bins)
+            counters.recommended += 1
+            counters.top1 += rank == 0
+            counters.score_sum += score
+            counters.histogram[self._bin(score)] += 1
+            sketch = self._sketches.get(key)
+            if sketch is None:
+                sketch = self._sketches[key] = QuantileSketch(self.sketch_size)
+            sketch.add(score)
+
+    def _check_compatible(self, other: "CohortAggregator") -> None:
+        if (self.bands, self.score_range, self.bins) != (other.bands, other.score_range, other.bins):
+            raise ValueError("Cannot merge cohort aggregates with different bands or histogram bins.")
+
+    def merge(self, other: "CohortAggregator") -> "CohortAggregator":
+        """Fold ``other`` into this aggregate and return it."""
+
+        self._check_compatible(other)
+        self.profiles += other.profiles
+        for segment, count in other.segments.items():
+            self.segments[segment] = self.segments.get(segment, 0) + count
+        for key, counters in other._counters.items():
+            mine = self._counters.get(key)
+            if mine is None:
+                mine = self._counters[key] = _MajorCounters(self.bins)
+            mine.merge(counters)
+        for key, sketch in other._sketches.items():
+            mine = self._sketches.get(key)
+            if mine is None:
+                mine = self._sketches[key] = QuantileSketch(self.sketch_size)
+            mine.merge(sketch)
+        self._names.update(other._names)
+        return self
+
+    def to_dict(self) -> Dict[str, object]:
+        """JSON-serializable state; ``from_dict`` restores a mergeable aggregate."""
+
+        return {
+            "bands": {letter: list(bounds) for letter, bounds in self.bands.items()},
+            "score_range": list(self.score_range),
+            "bins": self.bins,
+            "sketch_size": self.sketch_size,
+            "profiles": self.profiles,
+            "segments": dict(self.segments),
+            "counters": [
+                [segment, key, counters.recommended, counters.top1, counters.score_sum, counters.histogram.tolist()]
+                for (segment, key), counters in self._counters.items()
+            ],
+            "sketches": {key: sketch.to_dict() for key, sketch in self._sketches.items()},
+            "names": dict(self._names),
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, object]) -> "CohortAggregator":
+        aggregate = cls(
+            bands={letter: tuple(bounds) for letter, bounds in state["bands"].items()},
+            score_range=tuple(state["score_range"]),
+            bins=int(state["bins"]),
+            sketch_size=int(state["sketch_size"]),
+        )
+        aggregate.profiles = int(state["profiles"])
+        aggregate.segments = {segment: int(count) for segment, count in state["segments"].items()}
+        for segment, key, recommended, top1, score_sum, histogram in state["counters"]:
+            counters = aggregate._counters[(segment, key)] = _MajorCounters(aggregate.bins)
+            counters.recommended, counters.top1, counters.score_sum = int(recommended), int(top1), float(score_sum)
+            counters.histogram[:] = histogram
+        aggregate._sketches = {key: QuantileSketch.from_dict(sketch) for key, sketch in state["sketches"].items()}
+        aggregate._names = {str(key): str(name) for key, name in state.get("names", {}).items()}
+        return aggregate
+
+    def summary(self, quantiles: Sequence[float] = (0.1, 0.5, 0.9)) -> Dict[str, object]:
+        """Cohort report: per-major demand overall and by segment, most recommended first.
+
+        Rows of majors added with ids carry their ``major_id``.
+        """
+
+        low, high = self.score_range
+        majors: Dict[str, Dict[str, object]] = {}
+        for (segment, key), counters in sorted(self._counters.items()):
+            entry = majors.get(key)
+            if entry is None:
+                entry = majors[key] = {"totals": _MajorCounters(self.bins), "segments": {}}
+            entry["totals"].merge(counters)
+            entry["segments"][segment] = {
+                "recommended": counters.recommended,
+                "share": counters.recommended / self.segments[segment],
+                "top1": counters.top1,
+            }
+
+        rows = []
+        for key, entry in majors.items():
+            totals = entry["totals"]
+            row: Dict[str, object] = {
+                "major_name": self._names.get(key, key),
+                "recommended": totals.recommended,
+                "share": totals.recommended / self.profiles,
+                "top1": totals.top1,
+                "mean_score": totals.score_sum / totals.recommended,
+                "quantiles": {
+                    f"p{round(q * 100):g}": value
+                    for q, value in zip(quantiles, self._sketches[key].quantiles(quantiles))
+                },
+                "histogram": totals.histogram.tolist(),
+                "segments": entry["segments"],
+            }
+            if key in self._names:
+                row["major_id"] = key
+            rows.append(row)
+        rows.sort(key=lambda row: (-row["recommended"], -row["top1"], row["major_name"], row.get("major_id", "")))
+        return {
+            "profiles": self.profiles,
+            "segments": dict(sorted(self.segments.items())),
+            "histogram_edges": np.linspace(low, high, self.bins + 1).tolist(),
+            "majors": rows,
+        }
+
+
+def _aggregate_into(
+    aggregate: CohortAggregator,
+    payloads: List[Dict[str, object]],
+    catalog: Optional[str],
+    variant: Optional[str],
+) -> CohortAggregator:
+    from .recommender import recommend_with_shadows
+
+    for payload in payloads:
+        user_data = normalize_user_data(payload)
+        trace: Dict[str, object] = {}
+        results, _shadows = recommend_with_shadows(user_data, variant=variant, catalog=catalog, trace=trace)
+        aggregate.add(user_data, results, trace["top_ids"])
+    return aggregate
+
+
+def _aggregate_chunk(
+    payloads: List[Dict[str, object]],
+    catalog: Optional[str],
+    variant: Optional[str],
+    bands: Dict[str, Tuple[float, float]],
+) -> Dict[str, object]:
+    return _aggregate_into(CohortAggregator(bands=bands), payloads, catalog, variant).to_dict()
+
+
+def aggregate_cohort(
+    payloads: Iterable[Dict[str, object]],
+    catalog: Optional[str] = None,
+    variant: Optional[str] = None,
+    workers: int = 1,
+    chunk_size: int = config.COHORT_CHUNK_SIZE,
+) -> CohortAggregator:
+    """Recommend for every questionnaire payload and aggregate the results in one pass.
+
+    ``payloads`` is consumed lazily, in chunks of ``chunk_size``. With
+    ``workers > 1`` each chunk is scored and aggregated in a worker process.
+    At most ``2 * workers`` chunks are in flight, and each worker's aggregate
+    is merged as it completes.
+    """
+
+    total = CohortAggregator()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    in_flight: deque = deque()
+    chunk: List[Dict[str, object]] = []
+
+    def submit() -> None:
+        nonlocal chunk
+        if not chunk:
+            return
+        if executor is None:
+            _aggregate_into(total, chunk, catalog, variant)
+        else:
+            while len(in_flight) >= 2 * workers:
+                total.merge(CohortAggregator.from_dict(in_flight.popleft().result()))
+            in_flight.append(executor.submit(_aggregate_chunk, chunk, catalog, variant, total.bands))
+        chunk = []
+
+    try:
+        for payload in payloads:
+            chunk.append(payload)
+            if len(chunk) >= chunk_size:
+                submit()
+        submit()
+        while in_flight:
+            total.merge(CohortAggregator.from_dict(in_flight.popleft().result()))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return total
+
+
+__all__ = ["CohortAggregator", "QuantileSketch", "aggregate_cohort", "grade_band"]
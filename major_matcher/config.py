@@ -11,6 +11,71 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 MAJORS_PATH = DATA_DIR / "majors.json"
 CONTEXT_PATH = DATA_DIR / "context.txt"
+FRONTEND_DIR = BASE_DIR / "frontend"
+
+# Catalog registry: every catalog has its own majors/context files. Extra
+# catalogs are discovered from ``data/catalogs/<name>/majors.json``.
+DEFAULT_CATALOG = "default"
+CATALOGS_DIR = DATA_DIR / "catalogs"
+CATALOGS = {
+    DEFAULT_CATALOG: {"majors_path": MAJORS_PATH, "context_path": CONTEXT_PATH},
+}
+# Shared budget for all loaded catalog indexes; cold catalogs are evicted first.
+CATALOG_MEMORY_BUDGET = 512 * 1024 * 1024
+# Majors files at least this large are parsed with the streaming loader.
+STREAMING_LOAD_MIN_BYTES = 64 * 1024 * 1024
+# A saved index (see ``scripts/build_index.py``) next to a majors file is loaded
+# instead of rebuilding, as long as it was built from the same majors file content
+# and the current INDEX_*, COMPACT_*, LSA_COMPONENTS settings and FIELD_WEIGHTS
+# fields (the weights themselves are applied at query time).
+CATALOG_INDEX_FILENAME = "index.npz"
+
+# Admission control for /api/recommend: at most ADMISSION_MAX_IN_FLIGHT
+# requests are scored at once and ADMISSION_MAX_QUEUE wait for a slot. A
+# request is shed when its estimated or actual wait exceeds the budget. With
+# degraded mode on, requests admitted while at least ADMISSION_DEGRADE_QUEUE_DEPTH
+# others are queued get similarity-only results (no rules, no reasons).
+ADMISSION_MAX_IN_FLIGHT = 8
+ADMISSION_MAX_QUEUE = 64
+ADMISSION_WAIT_BUDGET_SECONDS = 2.0
+ADMISSION_DEGRADED_MODE = True
+ADMISSION_DEGRADE_QUEUE_DEPTH = 16
+
+# Backend start-up: catalogs built and exercised before /readyz reports ready.
+WARMUP_ON_STARTUP = True
+WARMUP_CATALOGS = (DEFAULT_CATALOG,)
+
+# Index settings: "sparse" scores bigram TF-IDF cosine directly, "lsa" projects
+# TF-IDF vectors onto LSA_COMPONENTS latent dimensions with a truncated SVD and
+# "fields" keeps one TF-IDF block per majors field, weighted by FIELD_WEIGHTS.
+INDEX_MODE = "sparse"
+LSA_COMPONENTS = 128
+LSA_RANDOM_STATE = 0
+# Per-field weights for the "fields" index mode. They are applied at query time,
+# so they can be changed without rebuilding the index.
+FIELD_WEIGHTS = {
+    "major_name": 1.0,
+    "faculty": 0.5,
+    "degree_type": 0.2,
+    "required_hs_subjects": 0.5,
+    "example_career_paths": 1.5,
+    "curriculum_keywords": 0.6,
+    "industry_keywords": 1.2,
+    "learning_style": 0.3,
+}
+# Compact indexes store float32/int32 matrices, drop terms seen in fewer than
+# COMPACT_MIN_DF majors (optionally capping at COMPACT_MAX_FEATURES) and keep the
+# vocabulary in a flat sorted array instead of a dict.
+INDEX_COMPACT = False
+COMPACT_MIN_DF = 2
+COMPACT_MAX_FEATURES = None
+# Major-to-major neighbour table: NEIGHBOUR_TOP_N neighbours per major (0 turns
+# it off), computed in row blocks of at most NEIGHBOUR_BLOCK_CELLS similarities.
+NEIGHBOUR_TOP_N = 20
+NEIGHBOUR_BLOCK_CELLS = 4_000_000
+
+# Stream values sent by the questionnaire pages; their term counts are precomputed.
+CANONICAL_STREAMS = ("science", "literary")
 
 # Recommendation settings
 RULES_TOP_N = 10
@@ -20,12 +85,124 @@ GRADE_PENALTY_FACTOR = 0.75
 SUBJECT_GRADE_PENALTY = 0.6
 CAREER_BOOST_FACTOR = 1.15
 SKILL_BOOST_FACTOR = 1.10
+CAREER_BOOST_CAP = 1.4
+
+# Named rule-weight profiles for A/B tests. Each profile overrides some of the
+# settings above; "control" uses them unchanged.
+WEIGHT_PROFILES = {
+    "control": {},
+    "soft-grades": {"GRADE_PENALTY_FACTOR": 0.85, "SUBJECT_GRADE_PENALTY": 0.75},
+    "career-heavy": {"CAREER_BOOST_FACTOR": 1.25, "RULES_TOP_N": 15},
+}
+# Traffic share per live variant, and profiles shadow-scored on every request
+# for logging only.
+AB_SPLIT = {"control": 1.0}
+SHADOW_VARIANTS = ()
+
+# What-if grade analysis: base profiles (similarity + overlap features) kept
+# per process, and how many failing subjects are searched exhaustively.
+WHAT_IF_CACHE_SIZE = 256
+WHAT_IF_EXHAUSTIVE_SUBJECTS = 8
+
+# Live questionnaire sessions: at most this many are kept (least recently used
+# evicted first), idle ones expire, and scores are recomputed from scratch
+# every LIVE_SESSION_RESYNC_EDITS edits to drop floating-point drift.
+LIVE_SESSION_MAX = 1000
+LIVE_SESSION_IDLE_SECONDS = 900
+LIVE_SESSION_RESYNC_EDITS = 200
+
+# Structured request logging: the share of requests logged (0 disables it),
+# the queue bound beyond which records are dropped, and the JSON-lines file
+# (None writes to stderr).
+REQUEST_LOG_SAMPLE_RATE = 0.1
+REQUEST_LOG_QUEUE_SIZE = 10000
+REQUEST_LOG_PATH = None
+
+# Traffic capture for load-test replay: the share of /api/recommend payloads
+# written (normalized, in request form) to CAPTURE_PATH; 0 disables capture.
+CAPTURE_SAMPLE_RATE = 0.0
+CAPTURE_PATH = BASE_DIR / "build" / "capture.jsonl"
+
+# Assemble /api/recommend responses from pre-rendered per-major JSON fragments
+# (byte-identical to jsonify). The backend then pins app.json.compact = True, so
+# debug mode also sends compact JSON; a customised JSON provider turns it off.
+FAST_JSON_RESPONSES = True
+
+# Memory-budget test (tests/test_memory_budget.py): a synthetic catalog of
+# this many majors must build and serve requests within these traced bytes.
+MEMORY_TEST_MAJORS = 500
+MEMORY_TEST_PEAK_BYTES = 32 * 1024 * 1024
+MEMORY_TEST_RETAINED_BYTES = 16 * 1024 * 1024
+MEMORY_TEST_REQUEST_PEAK_BYTES = 4 * 1024 * 1024
+
+# Static frontend serving from the backend: fingerprinted, precompressed copies
+# of FRONTEND_DIR are built here at start-up (or by scripts/build_static.py);
+# smaller files are not compressed.
+STATIC_SERVING = True
+STATIC_BUILD_DIR = BASE_DIR / "build" / "static"
+STATIC_COMPRESS_MIN_BYTES = 256
+
+# Persistent profile store (major_matcher/profile_store.py): SQLite file,
+# connections kept open, profiles per read/write batch, and how many most
+# similar majors are kept per profile so catalog changes can be applied
+# without re-scoring a profile against every major (at least RULES_TOP_N).
+PROFILE_STORE_PATH = BASE_DIR / "build" / "profiles.sqlite3"
+PROFILE_STORE_POOL_SIZE = 4
+PROFILE_STORE_BATCH_SIZE = 1000
+PROFILE_STORE_CANDIDATE_DEPTH = 30
+
+# Cohort analytics (major_matcher.cohort): equal-width score histogram bins
+# over COHORT_SCORE_RANGE (scores outside land in the end bins), the size
+# parameter of each per-major quantile sketch (rank error within about 4/k),
+# and profiles per worker chunk when aggregating in several processes.
+COHORT_SCORE_RANGE = (0.0, 1.0)
+COHORT_HISTOGRAM_BINS = 20
+COHORT_SKETCH_SIZE = 128
+COHORT_CHUNK_SIZE = 500
+
+# Optional diversity re-ranking of the rule-adjusted list (major_matcher.diversity).
+# DIVERSITY_MODE is "off", "mmr" (maximal marginal relevance over the neighbour
+# table, trading relevance against redundancy by DIVERSITY_MMR_LAMBDA) or
+# "caps" (at most DIVERSITY_CAPS[column] results per university / faculty).
+# Requests may pick any of DIVERSITY_MODES.
+DIVERSITY_MODES = ("off", "mmr", "caps")
+DIVERSITY_MODE = "off"
+DIVERSITY_MMR_LAMBDA = 0.7
+DIVERSITY_CAPS = {"university_name": 2, "faculty": 2}
+
+# Explanations are only computed when a request asks for them (explain=True);
+# each result then lists its EXPLAIN_TOP_TERMS largest TF-IDF term contributions.
+EXPLAIN_TOP_TERMS = 5
 
 __all__ = [
     "BASE_DIR",
     "DATA_DIR",
     "MAJORS_PATH",
     "CONTEXT_PATH",
+    "FRONTEND_DIR",
+    "DEFAULT_CATALOG",
+    "CATALOGS_DIR",
+    "CATALOGS",
+    "CATALOG_MEMORY_BUDGET",
+    "STREAMING_LOAD_MIN_BYTES",
+    "CATALOG_INDEX_FILENAME",
+    "ADMISSION_MAX_IN_FLIGHT",
+    "ADMISSION_MAX_QUEUE",
+    "ADMISSION_WAIT_BUDGET_SECONDS",
+    "ADMISSION_DEGRADED_MODE",
+    "ADMISSION_DEGRADE_QUEUE_DEPTH",
+    "WARMUP_ON_STARTUP",
+    "WARMUP_CATALOGS",
+    "INDEX_MODE",
+    "LSA_COMPONENTS",
+    "LSA_RANDOM_STATE",
+    "FIELD_WEIGHTS",
+    "INDEX_COMPACT",
+    "COMPACT_MIN_DF",
+    "COMPACT_MAX_FEATURES",
+    "NEIGHBOUR_TOP_N",
+    "NEIGHBOUR_BLOCK_CELLS",
+    "CANONICAL_STREAMS",
     "RULES_TOP_N",
     "RETURN_TOP_K",
     "SKILL_OVERLAP_THRESHOLD",
@@ -33,4 +210,39 @@ __all__ = [
     "SUBJECT_GRADE_PENALTY",
     "CAREER_BOOST_FACTOR",
     "SKILL_BOOST_FACTOR",
+    "CAREER_BOOST_CAP",
+    "WEIGHT_PROFILES",
+    "AB_SPLIT",
+    "SHADOW_VARIANTS",
+    "WHAT_IF_CACHE_SIZE",
+    "WHAT_IF_EXHAUSTIVE_SUBJECTS",
+    "LIVE_SESSION_MAX",
+    "LIVE_SESSION_IDLE_SECONDS",
+    "LIVE_SESSION_RESYNC_EDITS",
+    "REQUEST_LOG_SAMPLE_RATE",
+    "REQUEST_LOG_QUEUE_SIZE",
+    "REQUEST_LOG_PATH",
+    "CAPTURE_SAMPLE_RATE",
+    "CAPTURE_PATH",
+    "FAST_JSON_RESPONSES",
+    "MEMORY_TEST_MAJORS",
+    "MEMORY_TEST_PEAK_BYTES",
+    "MEMORY_TEST_RETAINED_BYTES",
+    "MEMORY_TEST_REQUEST_PEAK_BYTES",
+    "STATIC_SERVING",
+    "STATIC_BUILD_DIR",
+    "STATIC_COMPRESS_MIN_BYTES",
+    "PROFILE_STORE_PATH",
+    "PROFILE_STORE_POOL_SIZE",
+    "PROFILE_STORE_BATCH_SIZE",
+    "PROFILE_STORE_CANDIDATE_DEPTH",
+    "COHORT_SCORE_RANGE",
+    "COHORT_HISTOGRAM_BINS",
+    "COHORT_SKETCH_SIZE",
+    "COHORT_CHUNK_SIZE",
+    "DIVERSITY_MODES",
+    "DIVERSITY_MODE",
+    "DIVERSITY_MMR_LAMBDA",
+    "DIVERSITY_CAPS",
+    "EXPLAIN_TOP_TERMS",
 ]
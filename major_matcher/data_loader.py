@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
-
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
 
 from . import config
 from .subject_normalization import normalize_subject, normalize_subject_list
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 SectionData = Dict[str, Iterable[str]]
 
 
@@ -59,6 +61,47 @@ def _normalize_grade_requirements(value):
     return normalized
 
 
+MAJOR_LIST_FIELDS = (
+    "required_hs_subjects",
+    "example_career_paths",
+    "curriculum_keywords",
+    "industry_keywords",
+    "learning_style",
+)
+MAJOR_TEXT_FIELDS = ("major_name", "faculty", "degree_type")
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def normalize_major_record(record: Dict[str, object]) -> Dict[str, object]:
+    """Normalize one raw majors record the same way ``load_majors_data`` does per row."""
+
+    normalized = dict(record)
+    for field in MAJOR_LIST_FIELDS:
+        value = normalized.get(field)
+        normalized[field] = value if isinstance(value, list) else []
+    normalized["required_hs_subjects"] = normalize_subject_list(normalized["required_hs_subjects"])
+
+    for field in MAJOR_TEXT_FIELDS:
+        if normalized.get(field) is None:
+            normalized[field] = ""
+
+    overall = normalized.get("min_overall_percentage")
+    if overall is None or overall != overall:
+        overall = normalized.get("min_overall_percentage (%)")
+    normalized["min_overall_percentage"] = _to_float(overall)
+
+    normalized["min_grade_requirements"] = _normalize_grade_requirements(
+        normalized.get("min_grade_requirements")
+    )
+    return normalized
+
+
 def _load_candidates(path: Path) -> Path:
     normalized_path = path.with_name(f"{path.stem}.normalized{path.suffix}")
     if normalized_path.exists():
@@ -66,8 +109,8 @@ def _load_candidates(path: Path) -> Path:
     return path
 
 
-def load_majors_data(json_path: str | Path | None = None) -> pd.DataFrame:
-    """Load the majors JSON into a DataFrame, handling edge cases gracefully."""
+def resolve_majors_path(json_path: str | Path | None = None) -> Path | None:
+    """Pick the majors file to read, preferring a ``.normalized`` sibling."""
 
     base_path = Path(json_path) if json_path else config.MAJORS_PATH
     path = _load_candidates(base_path)
@@ -75,7 +118,32 @@ def load_majors_data(json_path: str | Path | None = None) -> pd.DataFrame:
         if json_path:
             path = _load_candidates(config.MAJORS_PATH)
         if not path.exists():
-            return pd.DataFrame()
+            return None
+    return path
+
+
+def majors_digest(json_path: str | Path | None = None) -> str:
+    """SHA-256 of the majors file ``resolve_majors_path`` picks, to tell whether an index still matches it."""
+
+    path = resolve_majors_path(json_path)
+    if path is None:
+        raise FileNotFoundError(f"Majors file not found: {json_path or config.MAJORS_PATH}")
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_majors_data(json_path: str | Path | None = None) -> pd.DataFrame:
+    """Load the majors JSON into a DataFrame, handling edge cases gracefully."""
+
+    # Imported here so the record helpers work in the pandas-free slim runtime.
+    import pandas as pd
+
+    path = resolve_majors_path(json_path)
+    if path is None:
+        return pd.DataFrame()
 
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
@@ -172,4 +240,26 @@ def load_context(txt_path: str | Path | None = None) -> Dict[str, object]:
     }
 
 
-__all__ = ["load_majors_data", "load_context"]
+_CHECKBOX_PATTERN = re.compile(r'type="checkbox"\s+name="(skills|hobbies)"\s+value="([^"]+)"')
+
+
+def load_questionnaire_options(frontend_dir: str | Path | None = None) -> Dict[str, List[str]]:
+    """Collect the skill/hobby checkbox values offered by the questionnaire pages."""
+
+    folder = Path(frontend_dir) if frontend_dir else config.FRONTEND_DIR
+    options: Dict[str, List[str]] = {"skills": [], "hobbies": []}
+    for page in sorted(folder.glob("questionnaire*.html")):
+        for kind, value in _CHECKBOX_PATTERN.findall(page.read_text(encoding="utf-8")):
+            if value not in options[kind]:
+                options[kind].append(value)
+    return options
+
+
+__all__ = [
+    "load_majors_data",
+    "load_context",
+    "load_questionnaire_options",
+    "majors_digest",
+    "normalize_major_record",
+    "resolve_majors_path",
+]
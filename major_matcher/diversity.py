@@ -0,0 +1,141 @@
+"""Diversity re-ranking of rule-adjusted results.
+
+Near-duplicate programs (the same degree at several universities) can fill
+the whole top-k. Two optional re-rankers pick the first ``k`` results from the
+rule-adjusted list:
+
+- ``mmr``: maximal marginal relevance. Major-to-major similarity is read from
+  the precomputed neighbour table. Pairs outside a major's table row count as
+  unrelated, so no pairwise cosine is computed per request.
+- ``caps``: at most ``DIVERSITY_CAPS[column]`` results per university or faculty.
+  When the caps leave fewer than ``k`` results, the skipped ones fill the gap
+  in their original order.
+
+Both keep each entry's score; only the order of the first ``k`` changes.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from . import config
+
+_LOCK = threading.Lock()
+
+
+def group_codes(vectors: Dict[str, object], majors_df) -> Dict[str, np.ndarray]:
+    """Integer codes of each ``DIVERSITY_CAPS`` column, built on first use and kept in ``vectors``.
+
+    Blank values get ``-1`` and are never capped.
+    """
+
+    codes = vectors.get("diversity_groups")
+    if codes is None:
+        with _LOCK:
+            codes = vectors.get("diversity_groups")
+            if codes is None:
+                codes = {}
+                for column in config.DIVERSITY_CAPS:
+                    values = majors_df[column].tolist() if column in majors_df.columns else [None] * len(majors_df)
+                    seen: Dict[str, int] = {}
+                    codes[column] = np.array(
+                        [
+                            seen.setdefault(str(value).strip().lower(), len(seen))
+                            if isinstance(value, str) and value.strip()
+                            else -1
+                            for value in values
+                        ],
+                        dtype=np.int32,
+                    )
+                vectors["diversity_groups"] = codes
+    return codes
+
+
+def mmr_rerank(
+    adjusted: List[Dict[str, object]],
+    neighbours: Optional[Dict[str, np.ndarray]],
+    k: int,
+    weight: float = config.DIVERSITY_MMR_LAMBDA,
+) -> List[Dict[str, object]]:
+    """Greedy MMR over ``adjusted``: relevance weighted by ``weight``, redundancy by ``1 - weight``.
+
+    Relevance is each score divided by the best one. Redundancy is the highest
+    neighbour-table similarity to a major already picked.
+    """
+
+    if neighbours is None or len(adjusted) <= 1 or k <= 1:
+        return adjusted
+    k = min(k, len(adjusted))
+    relevance = np.array([entry["score"] for entry in adjusted], dtype=np.float64)
+    top = relevance.max()
+    if top > 0:
+        relevance /= top
+    position = {entry["index"]: pos for pos, entry in enumerate(adjusted)}
+    redundancy = np.zeros(len(adjusted), dtype=np.float64)
+    available = np.ones(len(adjusted), dtype=bool)
+    table_indices, table_scores = neighbours["indices"], neighbours["scores"]
+
+    picked: List[int] = []
+    for _ in range(k):
+        gain = np.where(available, weight * relevance - (1.0 - weight) * redundancy, -np.inf)
+        best = int(np.argmax(gain))
+        picked.append(best)
+        available[best] = False
+        row = adjusted[best]["index"]
+        for other, similarity in zip(table_indices[row].tolist(), table_scores[row].tolist()):
+            pos = position.get(other)
+            if pos is not None and similarity > redundancy[pos]:
+                redundancy[pos] = similarity
+    return [adjusted[pos] for pos in picked] + [adjusted[pos] for pos in np.flatnonzero(available).tolist()]
+
+
+def cap_rerank(
+    adjusted: List[Dict[str, object]],
+    codes: Dict[str, np.ndarray],
+    k: int,
+    caps: Optional[Dict[str, int]] = None,
+) -> List[Dict[str, object]]:
+    """Take ``adjusted`` in order, skipping entries whose group is already at its cap."""
+
+    caps = config.DIVERSITY_CAPS if caps is None else caps
+    counts: Dict[str, Dict[int, int]] = {column: {} for column in caps}
+    chosen: List[Dict[str, object]] = []
+    skipped: List[Dict[str, object]] = []
+    for entry in adjusted:
+        if len(chosen) >= k:
+            skipped.append(entry)
+            continue
+        groups = {column: int(codes[column][entry["index"]]) for column in caps if column in codes}
+        if any(code >= 0 and counts[column].get(code, 0) >= caps[column] for column, code in groups.items()):
+            skipped.append(entry)
+            continue
+        chosen.append(entry)
+        for column, code in groups.items():
+            counts[column][code] = counts[column].get(code, 0) + 1
+    return chosen + skipped
+
+
+def diversify(
+    adjusted: List[Dict[str, object]],
+    vectors: Dict[str, object],
+    majors_df,
+    mode: Optional[str] = None,
+    k: Optional[int] = None,
+) -> List[Dict[str, object]]:
+    """Re-rank ``adjusted`` with ``mode`` (default ``config.DIVERSITY_MODE``) for a top-``k`` response."""
+
+    mode = config.DIVERSITY_MODE if mode is None else mode
+    k = config.RETURN_TOP_K if k is None else k
+    if mode == "off":
+        return adjusted
+    if mode == "mmr":
+        return mmr_rerank(adjusted, vectors.get("neighbours"), k, weight=config.DIVERSITY_MMR_LAMBDA)
+    if mode == "caps":
+        return cap_rerank(adjusted, group_codes(vectors, majors_df), k)
+    raise ValueError(f"Unknown diversity mode: {mode}")
+
+
+__all__ = ["cap_rerank", "diversify", "group_codes", "mmr_rerank"]
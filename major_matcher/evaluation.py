@@ -0,0 +1,202 @@
+"""Offline evaluation of rule weights against labeled profiles.
+
+Similarity scores and rule features are computed once per profile into
+(profiles, candidates) arrays. Every weight setting is then just array math
+over those tensors, so large grids can be scored without re-running the
+recommender.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import config
+from .experiments import base_weights
+from .rules import compute_rule_features, rule_factors
+from .similarity import rank_scores, score_majors, vectorize_user_profile
+from .user_profile import normalize_user_data
+
+EVAL_PROFILES_PATH = config.DATA_DIR / "eval_profiles.json"
+
+FEATURE_KEYS = ("score", "overall_fail", "subject_fails", "career_hits", "skill_overlap")
+
+# Settings that must stay whole numbers when sampled.
+INTEGER_WEIGHTS = ("RULES_TOP_N", "SKILL_OVERLAP_THRESHOLD")
+
+
+def load_labeled_profiles(path: Optional[Path] = None) -> List[Dict[str, object]]:
+    """Load ``[{"profile": {...}, "expected": [major ids or names]}]``.
+
+    Profiles are stored as raw form data and normalized on load.
+    """
+
+    path = Path(path) if path else EVAL_PROFILES_PATH
+    with path.open("r", encoding="utf-8") as handle:
+        records = json.load(handle)
+    return [
+        {
+            "name": record.get("name", f"profile-{i}"),
+            "profile": normalize_user_data(record["profile"]),
+            "expected": [str(item) for item in record.get("expected", [])],
+        }
+        for i, record in enumerate(records)
+    ]
+
+
+def _expected_rows(expected: Iterable[str], majors_df: pd.DataFrame) -> set:
+    ids = majors_df["major_id"].astype(str).tolist() if "major_id" in majors_df else []
+    names = majors_df["major_name"].astype(str).str.lower().tolist()
+    rows = set()
+    for label in expected:
+        rows.update(i for i, major_id in enumerate(ids) if major_id == label)
+        rows.update(i for i, name in enumerate(names) if name == label.lower())
+    return rows
+
+
+def build_feature_tensors(
+    labeled: Sequence[Dict[str, object]],
+    majors_df: pd.DataFrame,
+    vectors: Dict[str, object],
+    top_n: int,
+) -> Dict[str, np.ndarray]:
+    """Score every profile once and stack its rule features for the top ``top_n`` majors.
+
+    Returns (profiles, candidates) arrays for ``FEATURE_KEYS`` plus ``relevant``
+    (bool) and ``n_relevant`` (profiles,), the number of labeled majors found in
+    the catalog, used for the ideal DCG.
+    """
+
+    top_n = min(top_n, len(majors_df))
+    stacked = {key: [] for key in FEATURE_KEYS}
+    relevant, n_relevant = [], []
+    for item in labeled:
+        profile = item["profile"]
+        user_vector = vectorize_user_profile(profile, vectors["vectorizer"], vectors.get("term_cache"))
+        ranked = rank_scores(score_majors(user_vector, vectors), majors_df)
+        features = compute_rule_features(ranked, profile, majors_df, top_n=top_n)
+        for key in FEATURE_KEYS:
+            stacked[key].append(features[key])
+        rows = _expected_rows(item["expected"], majors_df)
+        relevant.append(np.isin(features["index"], list(rows)))
+        n_relevant.append(len(rows))
+
+    tensors = {key: np.array(values).reshape(len(labeled), top_n) for key, values in stacked.items()}
+    tensors["relevant"] = np.array(relevant, dtype=bool).reshape(len(labeled), top_n)
+    tensors["n_relevant"] = np.array(n_relevant, dtype=np.int64)
+    return tensors
+
+
+def weight_grid(grid: Mapping[str, Sequence[float]]) -> List[Dict[str, float]]:
+    """Every combination of ``grid`` values on top of the current config weights."""
+
+    keys = list(grid)
+    base = base_weights()
+    return [dict(base, **dict(zip(keys, values))) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def random_weights(
+    n: int,
+    ranges: Mapping[str, Tuple[float, float]],
+    seed: int = 0,
+) -> List[Dict[str, float]]:
+    """``n`` settings with each key of ``ranges`` drawn uniformly from ``(low, high)``."""
+
+    rng = np.random.default_rng(seed)
+    base = base_weights()
+    samples = {}
+    for key, (low, high) in ranges.items():
+        if key in INTEGER_WEIGHTS:
+            samples[key] = rng.integers(int(low), int(high) + 1, size=n)
+        else:
+            samples[key] = rng.uniform(low, high, size=n)
+    return [dict(base, **{key: samples[key][i].item() for key in ranges}) for i in range(n)]
+
+
+def _unique_rule_inputs(tensors: Dict[str, np.ndarray]):
+    # Few distinct (fail, fails, hits, overlap) combinations occur, so factors
+    # are computed per combination and gathered back into place.
+    keys = FEATURE_KEYS[1:]
+    stacked = np.stack([tensors[key] for key in keys], axis=-1).reshape(-1, len(keys))
+    combos, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    return {key: combos[:, i] for i, key in enumerate(keys)}, inverse.reshape(tensors["score"].shape)
+
+
+def _score_chunk(tensors, combos, inverse, weights: List[Dict[str, float]], ks: Sequence[int]):
+    factors = rule_factors(combos, weights)[:, inverse]
+    n_candidates = factors.shape[-1]
+    top_n = np.array([int(w["RULES_TOP_N"]) for w in weights]).reshape(-1, 1, 1)
+    positions = np.arange(n_candidates)
+    adjusted = np.where(positions < top_n, tensors["score"][None] * factors, -np.inf)
+    order = np.argsort(-adjusted, axis=-1, kind="stable")
+    # Masked majors sort last, so the first RULES_TOP_N ranks are the shown ones.
+    hits = np.take_along_axis(np.broadcast_to(tensors["relevant"], order.shape), order, axis=-1)
+    hits &= positions < top_n
+
+    first = np.where(hits.any(axis=-1), hits.argmax(axis=-1) + 1, 0)
+    reciprocal = np.where(first > 0, 1.0 / np.maximum(first, 1), 0.0)
+    discounts = 1.0 / np.log2(positions + 2)
+
+    labeled = tensors["n_relevant"] > 0
+    results = {"mrr": reciprocal[:, labeled].mean(axis=1)}
+    for k in ks:
+        top = hits[..., :k]
+        dcg = (top * discounts[: top.shape[-1]]).sum(axis=-1)
+        ideal = np.cumsum(discounts)[np.minimum(tensors["n_relevant"], min(k, n_candidates)) - 1]
+        results[f"hit@{k}"] = top.any(axis=-1)[:, labeled].mean(axis=1)
+        results[f"ndcg@{k}"] = (dcg[:, labeled] / ideal[labeled]).mean(axis=1)
+    return results
+
+
+def evaluate_weights(
+    tensors: Dict[str, np.ndarray],
+    settings: Sequence[Dict[str, float]],
+    ks: Sequence[int] = (1, config.RETURN_TOP_K),
+    workers: int = 1,
+    chunk_cells: int = 1_000_000,
+) -> Dict[str, np.ndarray]:
+    """Top-k accuracy, MRR and NDCG@k of every weight setting, each shaped (settings,).
+
+    Settings are scored in chunks of at most ``chunk_cells`` (setting, profile,
+    candidate) cells; with ``workers > 1`` chunks run on a thread pool, since
+    the NumPy kernels release the GIL. Profiles without any labeled major in
+    the catalog are ignored. Metrics only see majors within each setting's
+    ``RULES_TOP_N``.
+    """
+
+    settings = list(settings)
+    if tensors["score"].shape[-1] < max(int(w["RULES_TOP_N"]) for w in settings):
+        raise ValueError("Feature tensors hold fewer candidates than a setting's RULES_TOP_N.")
+    if not (tensors["n_relevant"] > 0).any():
+        raise ValueError("No labeled profile has an expected major in this catalog.")
+
+    combos, inverse = _unique_rule_inputs(tensors)
+    cells = max(1, tensors["score"].size)
+    chunk = max(1, chunk_cells // cells)
+    chunks = [settings[start : start + chunk] for start in range(0, len(settings), chunk)]
+
+    def run(part):
+        return _score_chunk(tensors, combos, inverse, part, ks)
+
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(run, chunks))
+    else:
+        parts = [run(part) for part in chunks]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+__all__ = [
+    "EVAL_PROFILES_PATH",
+    "build_feature_tensors",
+    "evaluate_weights",
+    "load_labeled_profiles",
+    "random_weights",
+    "weight_grid",
+]
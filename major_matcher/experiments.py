@@ -0,0 +1,70 @@
+"""Rule-weight profiles and deterministic A/B variant assignment."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Mapping, Optional
+
+from . import config
+
+WEIGHT_KEYS = (
+    "RULES_TOP_N",
+    "SKILL_OVERLAP_THRESHOLD",
+    "GRADE_PENALTY_FACTOR",
+    "SUBJECT_GRADE_PENALTY",
+    "CAREER_BOOST_FACTOR",
+    "CAREER_BOOST_CAP",
+    "SKILL_BOOST_FACTOR",
+)
+
+Weights = Dict[str, float]
+
+
+class UnknownVariantError(KeyError):
+    """Raised for a variant name missing from ``config.WEIGHT_PROFILES``."""
+
+
+def base_weights() -> Weights:
+    """Current rule settings from ``config`` (read at call time)."""
+
+    return {key: getattr(config, key) for key in WEIGHT_KEYS}
+
+
+def resolve_weights(variant: Optional[str] = None) -> Weights:
+    """Settings for a named profile; ``None`` means the plain config values."""
+
+    weights = base_weights()
+    if variant is None:
+        return weights
+    if variant not in config.WEIGHT_PROFILES:
+        raise UnknownVariantError(variant)
+    overrides = config.WEIGHT_PROFILES[variant]
+    unknown = set(overrides) - set(WEIGHT_KEYS)
+    if unknown:
+        raise ValueError(f"Profile {variant!r} overrides unknown settings: {sorted(unknown)}")
+    weights.update(overrides)
+    return weights
+
+
+def assign_variant(unit_id: str, split: Optional[Mapping[str, float]] = None) -> str:
+    """Map a stable unit id (user, session) onto a variant of ``split``.
+
+    The assignment hashes the id, so the same unit always sees the same variant
+    as long as the split does not change.
+    """
+
+    split = config.AB_SPLIT if split is None else split
+    total = float(sum(split.values()))
+    if not split or total <= 0:
+        raise ValueError("AB split must contain at least one positive share.")
+    digest = hashlib.sha256(str(unit_id).encode("utf-8")).digest()
+    point = int.from_bytes(digest[:8], "big") / 2**64 * total
+    cumulative = 0.0
+    for name, share in split.items():
+        cumulative += share
+        if point < cumulative:
+            return name
+    return next(reversed(list(split)))
+
+
+__all__ = ["WEIGHT_KEYS", "UnknownVariantError", "assign_variant", "base_weights", "resolve_weights"]
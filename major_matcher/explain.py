@@ -0,0 +1,120 @@
+"""On-demand explanations of recommendation scores.
+
+Only requests with ``explain=True`` pay for this. Each served result gets:
+
+- ``terms``: the TF-IDF terms that contribute most to its similarity. The
+  contributions are the sparse elementwise product of the user row and the
+  major's row, so in ``sparse`` and ``fields`` mode all of them together add
+  up to ``similarity``. In ``lsa`` mode the score is computed in the reduced
+  space, and the terms show the underlying TF-IDF overlap instead.
+- ``rules``: the multiplier each rule applied (see ``rules.rule_factor_parts``).
+  Their product is ``multiplier``, and ``similarity * multiplier`` is the score.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+from sklearn.preprocessing import normalize
+
+from . import config
+from .rules import rule_factor_parts
+from .similarity import _weight_user_rows
+
+_LOCK = threading.Lock()
+
+
+def term_names(vectors: Dict[str, object]) -> Dict[str, np.ndarray]:
+    """Term (and, in ``fields`` mode, field) of every matrix column, built on first use and kept in ``vectors``."""
+
+    names = vectors.get("term_names")
+    if names is None:
+        with _LOCK:
+            names = vectors.get("term_names")
+            if names is None:
+                vectorizer = vectors["vectorizer"]
+                if vectors.get("mode") == "fields":
+                    blocks = [
+                        (field, vectorizer.vectorizers[field].vocabulary_, start)
+                        for field, (start, _stop) in vectorizer.field_slices.items()
+                    ]
+                    n_features = vectorizer.n_features
+                else:
+                    blocks = [(None, vectorizer.vocabulary_, 0)]
+                    n_features = len(vectorizer.vocabulary_)
+                terms = np.empty(n_features, dtype=object)
+                fields = np.empty(n_features, dtype=object)
+                for field, vocabulary, start in blocks:
+                    for term, column in vocabulary.items():
+                        terms[start + column] = term
+                        fields[start + column] = field
+                names = {"terms": terms, "fields": fields}
+                vectors["term_names"] = names
+    return names
+
+
+def _user_row(user_vector, vectors: Dict[str, object]):
+    """The user row as it enters the dot product against ``vectors["matrix"]``."""
+
+    if vectors.get("mode") == "fields":
+        return _weight_user_rows(user_vector, vectors)
+    # cosine_similarity normalizes the user row; the majors rows are unit length already.
+    return normalize(user_vector.tocsr(), copy=True)
+
+
+def term_contributions(user_row, matrix, index: int, names: Dict[str, np.ndarray], top: int) -> List[Dict[str, object]]:
+    """The ``top`` largest entries of ``user_row * matrix[index]``, largest first."""
+
+    product = user_row.multiply(matrix[index]).tocsr()
+    product.eliminate_zeros()
+    columns, values = product.indices, product.data.astype(np.float64)
+    order = np.argsort(-values, kind="stable")[:top]
+    contributions = []
+    for pos in order.tolist():
+        column = int(columns[pos])
+        item: Dict[str, object] = {"term": names["terms"][column], "weight": float(values[pos])}
+        if names["fields"][column] is not None:
+            item["field"] = names["fields"][column]
+        contributions.append(item)
+    return contributions
+
+
+def explain_results(
+    adjusted: List[Dict[str, object]],
+    features: Dict[str, np.ndarray],
+    weights: Dict[str, float],
+    user_vector,
+    vectors: Dict[str, object],
+    k: Optional[int] = None,
+    top_terms: Optional[int] = None,
+) -> List[Dict[str, object]]:
+    """One explanation dict per entry of ``adjusted[:k]``, for the weight set ``weights``."""
+
+    k = config.RETURN_TOP_K if k is None else k
+    top_terms = config.EXPLAIN_TOP_TERMS if top_terms is None else top_terms
+    names = term_names(vectors)
+    user_row = _user_row(user_vector, vectors)
+    parts = {rule: values[0] for rule, values in rule_factor_parts(features, [weights]).items()}
+    positions = {index: pos for pos, index in enumerate(features["index"].tolist())}
+
+    explanations = []
+    for entry in adjusted[:k]:
+        pos = positions[entry["index"]]
+        rules = {rule: float(values[pos]) for rule, values in parts.items()}
+        explanations.append(
+            {
+                "similarity": float(features["score"][pos]),
+                "terms": term_contributions(user_row, vectors["matrix"], entry["index"], names, top_terms),
+                "rules": rules,
+                "multiplier": float(
+                    parts["grade_penalty"][pos] * parts["subject_penalty"][pos]
+                    * parts["career_boost"][pos] * parts["skill_boost"][pos]
+                ),
+            }
+        )
+    return explanations
+
+
+__all__ = ["explain_results", "term_contributions", "term_names"]
@@ -0,0 +1,114 @@
+"""Pre-rendered JSON fragments for recommendation responses.
+
+The per-major parts of a recommendation (the escaped name and the
+``Key subjects: ...`` highlight) are prepared once per index. A response is
+then assembled from bytes. The output is byte-identical to Flask's default
+``jsonify`` in compact mode (sorted keys, ASCII escapes, ``,``/``:``
+separators and a trailing newline). Strings are escaped with the C
+accelerated ``encode_basestring_ascii`` that ``json`` itself uses; encoders
+such as ``orjson`` do not produce ASCII escapes and would change the bytes.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+from json.encoder import encode_basestring_ascii
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+from .rules import reason_text, subjects_highlight
+
+_LOCK = threading.Lock()
+
+
+class MajorFragments:
+    """Escaped name and ``Key subjects`` highlight of every major, by row."""
+
+    def __init__(self, majors_df: pd.DataFrame) -> None:
+        rows = len(majors_df)
+        names = majors_df["major_name"].tolist() if "major_name" in majors_df else [""] * rows
+        if "required_hs_subjects" in majors_df:
+            required = majors_df["required_hs_subjects"].tolist()
+        else:
+            required = [[]] * rows
+        self.names: List[bytes] = []
+        self.subjects: List[Optional[str]] = []
+        for name, subjects in zip(names, required):
+            self.names.append(encode_basestring_ascii(str(name)).encode("ascii"))
+            self.subjects.append(subjects_highlight(subjects))
+
+    def reason(self, index: int, skill_overlap: int, career_hits: int) -> bytes:
+        """JSON string of ``rules.build_reason`` for the given row and features."""
+
+        return encode_basestring_ascii(reason_text(skill_overlap, career_hits, self.subjects[index])).encode("ascii")
+
+
+def major_fragments(vectors: Dict[str, object], majors_df: pd.DataFrame) -> MajorFragments:
+    """Fragments for an index, built on first use and kept in ``vectors``."""
+
+    fragments = vectors.get("fragments")
+    if fragments is None:
+        with _LOCK:
+            fragments = vectors.get("fragments")
+            if fragments is None:
+                fragments = MajorFragments(majors_df)
+                vectors["fragments"] = fragments
+    return fragments
+
+
+class RenderedRecommendation(NamedTuple):
+    """One recommendation as its JSON object bytes, with the name for logging."""
+
+    major_name: str
+    json: bytes
+
+
+def _number(value: float) -> bytes:
+    value = float(value)
+    return (repr(value) if math.isfinite(value) else json.dumps(value)).encode("ascii")
+
+
+def _value(value: object) -> bytes:
+    return json.dumps(value, ensure_ascii=True, sort_keys=True, separators=(",", ":")).encode("ascii")
+
+
+def render_recommendation(
+    name: bytes,
+    major_name: str,
+    score: float,
+    reason: bytes,
+    explanation: Optional[Dict[str, object]] = None,
+) -> RenderedRecommendation:
+    """One result object; an ``explanation`` is serialized with ``json`` like ``fields``."""
+
+    head = b'{"explanation":' + _value(explanation) + b',"major_name":' if explanation is not None else b'{"major_name":'
+    return RenderedRecommendation(
+        major_name,
+        head + name + b',"reason":' + reason + b',"score":' + _number(score) + b"}",
+    )
+
+
+def render_response(recommendations: Sequence[RenderedRecommendation], fields: Dict[str, object]) -> bytes:
+    """Bytes of ``jsonify({"top_recommendation", "alternatives", **fields})``.
+
+    ``top_recommendation`` is the first recommendation (``null`` if none) and
+    ``alternatives`` the rest; ``fields`` are serialized with ``json``.
+    """
+
+    parts = dict((key, _value(value)) for key, value in fields.items())
+    parts["top_recommendation"] = recommendations[0].json if recommendations else b"null"
+    parts["alternatives"] = b"[" + b",".join(item.json for item in recommendations[1:]) + b"]"
+    body = b",".join(_value(key) + b":" + parts[key] for key in sorted(parts))
+    return b"{" + body + b"}\n"
+
+
+__all__ = [
+    "MajorFragments",
+    "RenderedRecommendation",
+    "major_fragments",
+    "render_recommendation",
+    "render_response",
+]
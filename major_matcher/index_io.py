@@ -0,0 +1,168 @@
+"""Save and load built indexes as a single ``.npz`` artifact.
+
+The artifact only holds plain arrays (vocabulary terms, IDF weights, the CSR
+parts of the majors matrix, any dense LSA arrays and the neighbour table) plus
+a JSON block with the analyzer settings, so it can be read without unpickling.
+Field-weighted indexes store one ``terms``/``idf`` pair per field.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .similarity import StackedFieldVectorizer
+from .vocabulary import CompactVocabulary
+
+INDEX_FORMAT_VERSION = 1
+_DENSE_KEYS = ("projection", "embeddings")
+
+
+def _analyzer_settings(vectorizer: TfidfVectorizer) -> Dict[str, object]:
+    return {
+        "lowercase": vectorizer.lowercase,
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": sorted(vectorizer.get_stop_words() or []),
+        "norm": vectorizer.norm,
+        "use_idf": vectorizer.use_idf,
+        "smooth_idf": vectorizer.smooth_idf,
+        "sublinear_tf": vectorizer.sublinear_tf,
+        "dtype": np.dtype(vectorizer.dtype).name,
+    }
+
+
+def _field_vectorizers(vectors: Dict[str, object]) -> Dict[str, TfidfVectorizer]:
+    """Vectorizers keyed by array suffix: ``""`` for a single vocabulary."""
+
+    vectorizer = vectors["vectorizer"]
+    if isinstance(vectorizer, StackedFieldVectorizer):
+        return {f"__{field}": field_vectorizer for field, field_vectorizer in vectorizer.vectorizers.items()}
+    return {"": vectorizer}
+
+
+def _terms_array(vectorizer: TfidfVectorizer) -> np.ndarray:
+    terms = np.empty(len(vectorizer.vocabulary_), dtype=object)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+    return terms.astype(str)
+
+
+def save_index(vectors: Dict[str, object], path: str | Path, source: Optional[Dict[str, str]] = None) -> Path:
+    """Write the vectorizer state, majors matrix and dense arrays to ``path``.
+
+    ``source`` (see ``catalog.index_source``) records what the index was built
+    from; it is read back as ``vectors["source"]``.
+    """
+
+    matrix = vectors["matrix"]
+    if matrix is None:
+        raise ValueError("Cannot export an empty index.")
+
+    vectorizers = _field_vectorizers(vectors)
+    matrix = sparse.csr_matrix(matrix)
+    meta = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "mode": vectors.get("mode", "sparse"),
+        "compact": bool(vectors.get("compact", False)),
+        "fields": [suffix[2:] for suffix in vectorizers] if "" not in vectorizers else None,
+        "analyzer": _analyzer_settings(next(iter(vectorizers.values()))),
+        "source": source,
+    }
+    arrays = {
+        "meta": np.array(json.dumps(meta)),
+        "matrix_data": matrix.data,
+        "matrix_indices": matrix.indices,
+        "matrix_indptr": matrix.indptr,
+        "matrix_shape": np.array(matrix.shape),
+    }
+    for suffix, vectorizer in vectorizers.items():
+        arrays[f"terms{suffix}"] = _terms_array(vectorizer)
+        arrays[f"idf{suffix}"] = vectorizer.idf_
+    for key in _DENSE_KEYS:
+        if vectors.get(key) is not None:
+            arrays[key] = vectors[key]
+    neighbours = vectors.get("neighbours")
+    if neighbours is not None:
+        arrays["neighbour_indices"] = neighbours["indices"]
+        arrays["neighbour_scores"] = neighbours["scores"]
+
+    path = Path(path)
+    with path.open("wb") as handle:
+        np.savez(handle, **arrays)
+    return path
+
+
+def read_index_arrays(path: str | Path) -> Dict[str, object]:
+    """Load the raw arrays and metadata of an exported index."""
+
+    with np.load(Path(path), allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    meta = json.loads(str(arrays.pop("meta")))
+    if meta.get("format_version") != INDEX_FORMAT_VERSION:
+        raise ValueError(f"Unsupported index format: {meta.get('format_version')}")
+    arrays["meta"] = meta
+    arrays["matrix"] = sparse.csr_matrix(
+        (arrays.pop("matrix_data"), arrays.pop("matrix_indices"), arrays.pop("matrix_indptr")),
+        shape=tuple(arrays.pop("matrix_shape")),
+    )
+    return arrays
+
+
+def _rebuild_vectorizer(settings: Dict[str, object], terms: np.ndarray, idf: np.ndarray, compact: bool):
+    vectorizer = TfidfVectorizer(
+        lowercase=settings["lowercase"],
+        token_pattern=settings["token_pattern"],
+        ngram_range=tuple(settings["ngram_range"]),
+        stop_words=settings["stop_words"] or None,
+        norm=settings["norm"],
+        use_idf=settings["use_idf"],
+        smooth_idf=settings["smooth_idf"],
+        sublinear_tf=settings["sublinear_tf"],
+        dtype=np.dtype(settings.get("dtype", "float64")),
+        vocabulary={term: column for column, term in enumerate(terms.tolist())},
+    )
+    vectorizer.idf_ = idf
+    if compact:
+        vectorizer.vocabulary_ = CompactVocabulary(vectorizer.vocabulary_)
+    return vectorizer
+
+
+def load_index(path: str | Path) -> Dict[str, object]:
+    """Rebuild the ``vectors`` dict produced by ``vectorize_majors`` from disk."""
+
+    arrays = read_index_arrays(path)
+    meta = arrays["meta"]
+    settings = meta["analyzer"]
+    compact = bool(meta.get("compact"))
+    if meta.get("fields"):
+        vectorizer = StackedFieldVectorizer(
+            {
+                field: _rebuild_vectorizer(settings, arrays[f"terms__{field}"], arrays[f"idf__{field}"], compact)
+                for field in meta["fields"]
+            }
+        )
+    else:
+        vectorizer = _rebuild_vectorizer(settings, arrays["terms"], arrays["idf"], compact)
+
+    vectors: Dict[str, object] = {
+        "vectorizer": vectorizer,
+        "matrix": arrays["matrix"],
+        "mode": meta["mode"],
+        "compact": compact,
+        "source": meta.get("source"),
+    }
+    for key in _DENSE_KEYS:
+        if key in arrays:
+            vectors[key] = np.ascontiguousarray(arrays[key])
+    if "neighbour_indices" in arrays:
+        vectors["neighbours"] = {"indices": arrays["neighbour_indices"], "scores": arrays["neighbour_scores"]}
+    return vectors
+
+
+__all__ = ["save_index", "load_index", "read_index_arrays", "INDEX_FORMAT_VERSION"]
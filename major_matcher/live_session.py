@@ -0,0 +1,338 @@
+"""Session-scoped incremental scoring for live questionnaire previews.
+
+A session keeps the raw term counts of its profile and the unnormalized
+score state. Each edit re-derives the counts from cached per-value entries,
+and only the columns whose counts changed are applied to the score array, so
+ticking a checkbox costs a few sparse column updates instead of a new profile
+vector and a full similarity pass.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from . import config
+from .experiments import resolve_weights
+from .recommender import _ensure_resources, _format_results
+from .rules import apply_rules
+from .similarity import score_majors, vectorize_user_profile
+from .subject_normalization import normalize_subject
+from .term_cache import TermEntry, profile_values
+from .text_clean import clean_text
+from .user_profile import normalize_entry, parse_grade
+
+UserData = Dict[str, object]
+
+_CSC_LOCK = threading.Lock()
+
+
+class UnknownSessionError(KeyError):
+    """Raised for a session id that does not exist or has expired."""
+
+
+def _column_matrix(vectors: Dict[str, object]):
+    """CSC copy of the majors matrix for per-term column access, built once per index."""
+
+    csc = vectors.get("matrix_csc")
+    if csc is None:
+        with _CSC_LOCK:
+            csc = vectors.get("matrix_csc")
+            if csc is None:
+                csc = vectors["matrix"].tocsc()
+                vectors["matrix_csc"] = csc
+    return csc
+
+
+class IncrementalScores:
+    """Unnormalized similarity state that accepts raw term-count deltas.
+
+    Sparse mode keeps ``matrix @ w`` and ``|w|^2`` for the TF-IDF weights
+    ``w``; LSA mode keeps the unnormalized projection ``w @ projection``.
+    Both are divided by the current norm only when scores are read.
+    """
+
+    def __init__(self, vectors: Dict[str, object]) -> None:
+        self.mode = vectors.get("mode")
+        if self.mode not in ("sparse", "lsa"):
+            raise ValueError(f"Incremental scoring does not support {self.mode!r} indexes.")
+        self.vectors = vectors
+        self.idf = np.asarray(vectors["vectorizer"].idf_, dtype=np.float64)
+        self.reset({})
+
+    def reset(self, counts: Dict[int, float]) -> None:
+        if self.mode == "lsa":
+            self.raw = np.zeros(self.vectors["projection"].shape[1], dtype=np.float64)
+        else:
+            self.raw = np.zeros(self.vectors["matrix"].shape[0], dtype=np.float64)
+            self.norm2 = 0.0
+        self.update({}, counts)
+
+    def update(self, old: Dict[int, float], new: Dict[int, float]) -> None:
+        """Apply the difference between two raw count dicts."""
+
+        changed = [column for column in set(old) | set(new) if old.get(column, 0.0) != new.get(column, 0.0)]
+        if not changed:
+            return
+        columns = np.array(changed, dtype=np.int64)
+        before = np.array([old.get(column, 0.0) for column in changed]) * self.idf[columns]
+        after = np.array([new.get(column, 0.0) for column in changed]) * self.idf[columns]
+        if self.mode == "lsa":
+            self.raw += (after - before) @ self.vectors["projection"][columns].astype(np.float64)
+            return
+        self.raw += _column_matrix(self.vectors)[:, columns] @ (after - before)
+        self.norm2 += float(after @ after - before @ before)
+
+    def scores(self) -> np.ndarray:
+        if self.mode == "lsa":
+            norm = np.sqrt(self.raw @ self.raw)
+            if norm == 0:
+                return np.zeros(self.vectors["embeddings"].shape[0])
+            return self.vectors["embeddings"] @ (self.raw / norm).astype(self.vectors["embeddings"].dtype)
+        if self.norm2 <= 0:
+            return np.zeros_like(self.raw)
+        return self.raw / np.sqrt(self.norm2)
+
+
+def check_edit(edit: object) -> None:
+    """Raise ``TypeError``/``ValueError`` for an edit ``LiveSession.apply`` would reject."""
+
+    if not isinstance(edit, dict):
+        raise TypeError(f"Edit must be an object, got {type(edit).__name__}")
+    op = edit.get("op")
+    field = edit.get("field")
+    if op in ("add", "remove") and field in ("skills", "hobbies"):
+        return
+    if op == "set" and field in ("career_aspiration", "stream"):
+        return
+    if op == "grade" and edit.get("subject"):
+        return
+    raise ValueError(f"Unsupported edit: {edit!r}")
+
+
+def _top_ranked(scores: np.ndarray, names: List[str], top_n: int) -> List[Dict[str, object]]:
+    """First ``top_n`` entries of ``rank_scores`` without sorting every major."""
+
+    n = min(top_n, len(scores))
+    if n == 0:
+        return []
+    kth = np.partition(scores, len(scores) - n)[len(scores) - n]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[: n - len(above)]
+    rows = np.concatenate([above, ties])
+    rows = rows[np.lexsort((rows, -scores[rows]))]
+    return [{"major_name": names[row], "score": float(scores[row]), "index": int(row)} for row in rows]
+
+
+class LiveSession:
+    """Profile plus incremental score state of one questionnaire in progress."""
+
+    def __init__(self, user_data: UserData, catalog: Optional[str] = None, variant: Optional[str] = None) -> None:
+        self.majors_df, _context, self.vectors = _ensure_resources(catalog)
+        self.weights = resolve_weights(variant)
+        self.names = self.majors_df["major_name"].tolist()
+        self.profile: UserData = {
+            "grades": dict(user_data.get("grades") or {}),
+            "overall_grade": user_data.get("overall_grade"),
+            "career_aspiration": str(user_data.get("career_aspiration", "") or ""),
+            "skills": list(user_data.get("skills", []) or []),
+            "hobbies": list(user_data.get("hobbies", []) or []),
+            "stream": user_data.get("stream"),
+        }
+        self.lock = threading.Lock()
+        self.last_used = 0.0
+        self.edits_since_sync = 0
+
+        self.term_cache = self.vectors.get("term_cache")
+        self.incremental = self.term_cache is not None and self.vectors.get("mode") in ("sparse", "lsa")
+        self._entries: Dict[str, TermEntry] = {}
+        self._records: Dict[int, tuple] = {}
+        self.counts: Dict[int, float] = {}
+        if self.incremental:
+            self.state = IncrementalScores(self.vectors)
+        self._resync()
+
+    def _entry(self, value: str) -> TermEntry:
+        cached = self.term_cache.entries.get(value)
+        if cached is not None:
+            return cached
+        cached = self._entries.get(value)
+        if cached is None:
+            cached = self.term_cache.entry(value)
+            self._entries[value] = cached
+        return cached
+
+    def _profile_counts(self) -> Dict[int, float]:
+        values = profile_values(self.profile)
+        counts = self.term_cache.sequence_counts(values, entry=self._entry)
+        # Free-text analyses are only kept for values still in the profile.
+        current = set(values)
+        for value in [value for value in self._entries if value not in current]:
+            del self._entries[value]
+        return counts
+
+    def _resync(self) -> None:
+        if self.incremental:
+            self.counts = self._profile_counts()
+            self.state.reset(self.counts)
+        self.edits_since_sync = 0
+
+    def _text_changed(self) -> None:
+        if not self.incremental:
+            return
+        self.edits_since_sync += 1
+        if self.edits_since_sync >= config.LIVE_SESSION_RESYNC_EDITS:
+            self._resync()
+            return
+        counts = self._profile_counts()
+        self.state.update(self.counts, counts)
+        self.counts = counts
+
+    def apply(self, edit: Dict[str, object]) -> None:
+        """Apply one edit.
+
+        Supported edits: ``{"op": "add" | "remove", "field": "skills" | "hobbies",
+        "value": ...}``, ``{"op": "set", "field": "career_aspiration" | "stream",
+        "value": ...}`` and ``{"op": "grade", "subject": ... | "overall", "value": ...}``.
+        """
+
+        check_edit(edit)
+        op = edit.get("op")
+        field = edit.get("field")
+        if op in ("add", "remove"):
+            value = normalize_entry(str(edit.get("value") or ""), field)
+            entries = self.profile[field]
+            if value is None or (op == "add") == (value in entries):
+                return
+            if op == "add":
+                entries.append(value)
+            else:
+                entries.remove(value)
+            if field == "skills":
+                self._records.clear()
+            self._text_changed()
+        elif op == "set" and field == "career_aspiration":
+            self.profile["career_aspiration"] = clean_text(str(edit.get("value") or "")).strip()
+            self._records.clear()
+            self._text_changed()
+        elif op == "set":
+            self.profile["stream"] = str(edit.get("value") or "").strip().lower() or None
+            self._text_changed()
+        else:
+            grade = parse_grade(edit.get("value"))
+            if edit["subject"] == "overall":
+                self.profile["overall_grade"] = grade
+            else:
+                self.profile["grades"][normalize_subject(str(edit["subject"]))] = grade
+
+    def scores(self) -> np.ndarray:
+        if self.incremental:
+            return self.state.scores()
+        user_vector = vectorize_user_profile(self.profile, self.vectors["vectorizer"], self.term_cache)
+        return score_majors(user_vector, self.vectors)
+
+    def results(self) -> List[Dict[str, object]]:
+        """Current recommendations in the ``recommend`` format."""
+
+        if self.vectors["matrix"] is None:
+            return []
+        top_n = int(self.weights["RULES_TOP_N"])
+        ranked = _top_ranked(self.scores(), self.names, top_n)
+        adjusted = apply_rules(
+            ranked, self.profile, self.majors_df, top_n=top_n, weights=self.weights, record_cache=self._records
+        )
+        return _format_results(adjusted, self.profile, self.majors_df)
+
+
+class SessionStore:
+    """Bounded, idle-expiring map of session id to ``LiveSession``."""
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        idle_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_sessions = config.LIVE_SESSION_MAX if max_sessions is None else max_sessions
+        self.idle_seconds = config.LIVE_SESSION_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self._clock = clock
+        self._sessions: "OrderedDict[str, LiveSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _expire_locked(self, now: float) -> None:
+        # Sessions are kept in last-used order, so expired ones are at the front.
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_used < self.idle_seconds:
+                break
+            del self._sessions[session_id]
+
+    def create(self, user_data: UserData, catalog: Optional[str] = None, variant: Optional[str] = None) -> str:
+        session = LiveSession(user_data, catalog=catalog, variant=variant)
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            now = self._clock()
+            session.last_used = now
+            self._expire_locked(now)
+            self._sessions[session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def get(self, session_id: str) -> LiveSession:
+        with self._lock:
+            now = self._clock()
+            self._expire_locked(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise UnknownSessionError(session_id)
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def update(self, session_id: str, edits: List[Dict[str, object]]) -> List[Dict[str, object]]:
+        """Apply ``edits`` in order and return the refreshed recommendations.
+
+        The whole batch is checked first, so a rejected edit leaves the
+        session unchanged.
+        """
+
+        for edit in edits:
+            check_edit(edit)
+        session = self.get(session_id)
+        with session.lock:
+            for edit in edits:
+                session.apply(edit)
+            return session.results()
+
+    def close(self, session_id: str) -> None:
+        with self._lock:
+            if self._sessions.pop(session_id, None) is None:
+                raise UnknownSessionError(session_id)
+
+
+_STORE = SessionStore()
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store."""
+
+    return _STORE
+
+
+__all__ = [
+    "IncrementalScores",
+    "LiveSession",
+    "SessionStore",
+    "UnknownSessionError",
+    "check_edit",
+    "get_session_store",
+]
@@ -0,0 +1,67 @@
+"""Memory accounting helpers for loaded indexes."""
+
+from __future__ import annotations
+
+import sys
+from typing import Dict, Optional, Set
+
+import numpy as np
+from scipy import sparse
+
+from .vocabulary import CompactVocabulary
+
+
+def deep_sizeof(obj, _seen: Optional[Set[int]] = None) -> int:
+    """Approximate the bytes reachable from ``obj`` (containers, arrays, objects)."""
+
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) if obj.base is None else obj.nbytes
+    if sparse.issparse(obj):
+        obj = obj.tocsr() if not hasattr(obj, "indptr") else obj
+        return obj.data.nbytes + obj.indices.nbytes + obj.indptr.nbytes
+    if isinstance(obj, CompactVocabulary):
+        return sys.getsizeof(obj) + obj.nbytes
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def index_memory_report(vectors: Dict[str, object]) -> Dict[str, int]:
+    """Bytes used by each component of a ``vectorize_majors`` index."""
+
+    report: Dict[str, int] = {}
+    matrix = vectors.get("matrix")
+    if matrix is not None:
+        report["matrix.data"] = matrix.data.nbytes
+        report["matrix.indices"] = matrix.indices.nbytes
+        report["matrix.indptr"] = matrix.indptr.nbytes
+
+    vectorizer = vectors.get("vectorizer")
+    seen: Set[int] = set()
+    for attr in ("vocabulary_", "stop_words_", "idf_"):
+        value = getattr(vectorizer, attr, None)
+        if value is not None:
+            report[f"vectorizer.{attr}"] = deep_sizeof(value, seen)
+    if vectorizer is not None:
+        report["vectorizer.other"] = deep_sizeof(vectorizer, seen)
+
+    for key, value in vectors.items():
+        if key in ("matrix", "vectorizer") or value is None or isinstance(value, (str, bool)):
+            continue
+        report[key] = deep_sizeof(value, seen)
+    report["total"] = sum(report.values())
+    return report
+
+
+__all__ = ["deep_sizeof", "index_memory_report"]
@@ -0,0 +1,196 @@
+"""``tracemalloc``-based memory accounting for index builds and requests.
+
+Each stage reports two numbers: ``peak`` is the highest traced allocation
+above the stage's starting point, and ``retained`` is what is still
+allocated when the stage ends. Together with the object sizes from
+``memory.index_memory_report``, this shows which structure grows with the
+catalog: the majors DataFrame, the vocabulary, the matrix, or per-request
+temporaries.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .data_loader import load_context, load_majors_data
+from .experiments import resolve_weights
+from .memory import deep_sizeof, index_memory_report
+from .rules import apply_rule_variants, compute_rule_features
+from .recommender import _format_results
+from .similarity import rank_scores, score_majors, vectorize_majors, vectorize_user_profile
+from .term_cache import build_term_cache
+
+StageReport = Dict[str, int]
+
+
+class MemoryTracer:
+    """Sequential named stages measured with ``tracemalloc``.
+
+    Tracing starts with the tracer if it is not already running and is
+    stopped again by ``close`` in that case. Stages must not be nested,
+    because each one resets the peak counter. ``high_water`` is the highest
+    allocation seen in any stage, relative to when the tracer was created.
+    """
+
+    def __init__(self, frames: int = 1) -> None:
+        self.stages: Dict[str, StageReport] = {}
+        self.top_sites: Dict[str, List[str]] = {}
+        self._owned = not tracemalloc.is_tracing()
+        if self._owned:
+            tracemalloc.start(frames)
+        self.origin = tracemalloc.get_traced_memory()[0]
+        self.high_water = 0
+
+    def retained(self) -> int:
+        """Bytes allocated since the tracer was created and still alive."""
+
+        return tracemalloc.get_traced_memory()[0] - self.origin
+
+    @contextmanager
+    def stage(self, name: str, top: int = 0) -> Iterator[None]:
+        before = tracemalloc.take_snapshot() if top else None
+        start, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - started
+        current, peak = tracemalloc.get_traced_memory()
+        self.stages[name] = {
+            "peak": max(peak - start, 0),
+            "retained": current - start,
+            "ms": int(round(elapsed * 1000)),
+        }
+        self.high_water = max(self.high_water, peak - self.origin)
+        if before is not None:
+            diff = tracemalloc.take_snapshot().compare_to(before, "lineno")
+            self.top_sites[name] = [str(stat) for stat in diff[:top]]
+
+    def close(self) -> None:
+        if self._owned and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def profile_catalog_build(
+    majors_path: Optional[str | Path] = None,
+    context_path: Optional[str | Path] = None,
+    tracer: Optional[MemoryTracer] = None,
+    top: int = 0,
+) -> Dict[str, object]:
+    """Build a catalog stage by stage and report memory per stage and per component.
+
+    Returns ``{"stages", "components", "top_sites", "resources"}``;
+    ``resources`` is the built ``(majors_df, context, vectors)`` so requests
+    can be profiled against it.
+    """
+
+    tracer = tracer or MemoryTracer()
+    with tracer.stage("build.read", top):
+        majors_df = load_majors_data(majors_path)
+        context = load_context(context_path)
+    with tracer.stage("build.index", top):
+        vectors = vectorize_majors(majors_df)
+    with tracer.stage("build.term_cache", top):
+        vectors["term_cache"] = build_term_cache(vectors, context)
+
+    components = {"majors_df": int(majors_df.memory_usage(deep=True).sum()), "context": deep_sizeof(context)}
+    components.update({f"index.{key}": size for key, size in index_memory_report(vectors).items() if key != "total"})
+    components["total"] = sum(components.values())
+    return {
+        "stages": dict(tracer.stages),
+        "components": components,
+        "top_sites": dict(tracer.top_sites),
+        "resources": (majors_df, context, vectors),
+    }
+
+
+def profile_request(
+    user_data: Dict[str, object],
+    majors_df,
+    vectors: Dict[str, object],
+    tracer: Optional[MemoryTracer] = None,
+    variant: Optional[str] = None,
+) -> Dict[str, StageReport]:
+    """Run one recommendation through its stages and report memory for each.
+
+    The stages mirror ``recommend``. ``request.total`` covers the whole
+    request, and its ``retained`` value is what outlives the request in
+    caches.
+    """
+
+    tracer = tracer or MemoryTracer()
+    weights = resolve_weights(variant)
+    start = tracer.retained()
+    high_water = tracer.high_water
+    tracer.high_water = start
+    stages = (
+        "request.vectorize",
+        "request.similarity",
+        "request.rank",
+        "request.features",
+        "request.rules",
+        "request.format",
+    )
+
+    term_cache = vectors.get("term_cache")
+    with tracer.stage(stages[0]):
+        user_vector = vectorize_user_profile(user_data, vectors["vectorizer"], term_cache)
+    with tracer.stage(stages[1]):
+        scores = score_majors(user_vector, vectors)
+    with tracer.stage(stages[2]):
+        ranked = rank_scores(scores, majors_df)
+    with tracer.stage(stages[3]):
+        features = compute_rule_features(ranked, user_data, majors_df, top_n=int(weights["RULES_TOP_N"]))
+    with tracer.stage(stages[4]):
+        adjusted = apply_rule_variants(features, {"served": weights})["served"]
+    with tracer.stage(stages[5]):
+        _format_results(adjusted, user_data, majors_df)
+    del user_vector, scores, ranked, features, adjusted
+
+    report = {name: tracer.stages[name] for name in stages}
+    report["request.total"] = {
+        "peak": tracer.high_water - start,
+        "retained": tracer.retained() - start,
+        "ms": sum(tracer.stages[name]["ms"] for name in stages),
+    }
+    tracer.high_water = max(high_water, tracer.high_water)
+    return report
+
+
+def memory_report(
+    majors_path: Optional[str | Path] = None,
+    context_path: Optional[str | Path] = None,
+    profiles: Optional[List[Dict[str, object]]] = None,
+    top: int = 0,
+) -> Dict[str, object]:
+    """Profile a catalog build plus ``profiles`` (normalized) run as requests.
+
+    Per-request stage reports are aggregated to the maximum over requests.
+    ``peak_bytes`` is the traced high-water mark of the whole run and
+    ``retained_bytes`` what is still allocated at the end (the loaded
+    catalog plus any per-request caches).
+    """
+
+    tracer = MemoryTracer()
+    try:
+        report = profile_catalog_build(majors_path, context_path, tracer, top)
+        majors_df, _context, vectors = report.pop("resources")
+        requests: Dict[str, StageReport] = {}
+        for profile in profiles or []:
+            for name, stage in profile_request(profile, majors_df, vectors, tracer).items():
+                merged = requests.setdefault(name, {"peak": 0, "retained": 0, "ms": 0})
+                for key, value in stage.items():
+                    merged[key] = max(merged[key], value)
+        report["requests"] = requests
+        report["majors"] = len(majors_df)
+        report["peak_bytes"] = tracer.high_water
+        report["retained_bytes"] = tracer.retained()
+        return report
+    finally:
+        tracer.close()
+
+
+__all__ = ["MemoryTracer", "memory_report", "profile_catalog_build", "profile_request"]
@@ -0,0 +1,44 @@
+"""In-process counters and gauges for the backend."""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict
+
+
+class Metrics:
+    """Thread-safe named counters and gauges."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {"counters": dict(self._counters), "gauges": dict(self._gauges)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+
+
+_METRICS = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Return the process-wide metrics instance."""
+
+    return _METRICS
+
+
+__all__ = ["Metrics", "get_metrics"]
@@ -0,0 +1,59 @@
+"""Precomputed major-to-major nearest neighbours."""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from . import config
+
+
+def build_neighbour_table(
+    majors_matrix,
+    top_n: Optional[int] = None,
+    block_cells: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Return the ``top_n`` most similar other majors for every major.
+
+    Rows of the TF-IDF matrix are L2-normalized, so a sparse product gives
+    cosine similarities. It is computed for a block of rows at a time, sized so
+    the dense block holds at most ``block_cells`` values, which keeps memory
+    bounded for catalogs that would not fit as a dense n x n matrix.
+
+    Returns ``{"indices": int32 (n, k), "scores": float32 (n, k)}`` with each
+    row sorted by descending similarity.
+    """
+
+    top_n = config.NEIGHBOUR_TOP_N if top_n is None else top_n
+    block_cells = config.NEIGHBOUR_BLOCK_CELLS if block_cells is None else block_cells
+    n_majors = majors_matrix.shape[0]
+    k = max(min(top_n, n_majors - 1), 0)
+    indices = np.zeros((n_majors, k), dtype=np.int32)
+    scores = np.zeros((n_majors, k), dtype=np.float32)
+    if k == 0:
+        return {"indices": indices, "scores": scores}
+
+    majors_matrix = majors_matrix.tocsr()
+    transposed = majors_matrix.T.tocsc()
+    block_rows = max(1, block_cells // n_majors)
+    for start in range(0, n_majors, block_rows):
+        stop = min(start + block_rows, n_majors)
+        block = (majors_matrix[start:stop] @ transposed).toarray()
+        block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        candidates = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(block, candidates, axis=1)
+        order = np.lexsort((candidates, -candidate_scores), axis=1)
+        indices[start:stop] = np.take_along_axis(candidates, order, axis=1)
+        scores[start:stop] = np.take_along_axis(candidate_scores, order, axis=1)
+    return {"indices": indices, "scores": scores}
+
+
+def neighbours_of(table: Dict[str, np.ndarray], row: int, k: int):
+    """Return ``(indices, scores)`` of the first ``k`` neighbours of ``row``."""
+
+    k = max(0, min(k, table["indices"].shape[1]))
+    return table["indices"][row, :k], table["scores"][row, :k]
+
+
+__all__ = ["build_neighbour_table", "neighbours_of"]
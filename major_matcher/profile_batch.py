@@ -0,0 +1,366 @@
+"""Columnar normalization of many questionnaire payloads at once.
+
+``normalize_user_data`` handles one dict at a time. For every profile it runs
+``normalize_subject`` on each grade key, ``parse_grade`` on each grade and
+``clean_text`` on each skill, hobby and aspiration. ``normalize_batch`` does
+the same work column by column:
+
+- Grade keys, grade values and text values are factorized across the batch.
+  Each distinct value is mapped, parsed or cleaned once.
+- Numeric grades are parsed with one ``pd.to_numeric``. Only the few distinct
+  strings it rejects go through ``parse_grade``.
+- The result is a ``ProfileBatch``: a dense grade matrix and ragged arrays of
+  ids into one table of distinct cleaned values.
+
+``ProfileBatch.profile(i)`` equals ``normalize_user_data`` of the i-th payload,
+except for grades that parse to NaN (``"NaN"``, ``float("nan")``): the grade
+matrix uses NaN for "no grade", so the batch returns ``None`` where
+``normalize_user_data`` keeps ``nan`` (and leaves it out of ``grades_text``).
+Both are treated as missing when scoring.
+``ProfileBatch.user_matrix`` builds every user TF-IDF row in a few sparse
+products, ready for ``score_majors_batch``.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .subject_normalization import normalize_subject
+from .text_clean import clean_text
+from .user_profile import parse_grade, profile_text
+
+_TEXT_FIELDS = ("stream", "career_aspiration", "skills", "custom_skills", "hobbies", "custom_hobbies")
+
+# (rows, positions in the payload's grades, raw keys, raw values) of every grade.
+GradeEntries = Tuple[List[int], List[int], List[object], List[object]]
+
+
+def _parse_grade_values(values: Sequence[object]) -> np.ndarray:
+    """``parse_grade`` of each value as float64, with NaN for ``None`` (and for NaN itself)."""
+
+    series = pd.Series(values, dtype=object)
+    parsed = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    # Numbers embedded in text ("95%", "about 80") and other odd values.
+    for pos in np.flatnonzero(np.isnan(parsed)).tolist():
+        value = parse_grade(values[pos])
+        parsed[pos] = np.nan if value is None else value
+    return parsed
+
+
+def _text_column(values: Sequence[object]) -> pd.Series:
+    """``str(value).strip()`` of every value; ``None`` becomes ``"None"`` as in ``normalize_user_data``."""
+
+    return pd.Series([value if isinstance(value, str) else str(value) for value in values], dtype=object).str.strip()
+
+
+def _grade_entries(grade_dicts: Sequence[object]) -> GradeEntries:
+    rows: List[int] = []
+    positions: List[int] = []
+    keys: List[object] = []
+    values: List[object] = []
+    for row, grades in enumerate(grade_dicts):
+        if isinstance(grades, dict) and grades:
+            rows.extend([row] * len(grades))
+            positions.extend(range(len(grades)))
+            keys.extend(grades.keys())
+            values.extend(grades.values())
+    return rows, positions, keys, values
+
+
+def _payload_columns(payloads) -> Tuple[int, Dict[str, List[object]], GradeEntries]:
+    """Row count, text and list columns, and the grade entries of ``payloads``.
+
+    ``payloads`` is a sequence of payload dicts, a DataFrame with one column
+    per payload field, or anything with ``to_pandas()`` such as an Arrow table.
+    A DataFrame may hold grades as a ``grades`` column of dicts, or flattened
+    into ``grades.<subject>`` columns as ``pd.json_normalize`` writes them.
+    """
+
+    if hasattr(payloads, "to_pandas") and not isinstance(payloads, pd.DataFrame):
+        payloads = payloads.to_pandas()
+
+    if not isinstance(payloads, pd.DataFrame):
+        payloads = list(payloads)
+        columns = {field: [payload.get(field, "") for payload in payloads] for field in _TEXT_FIELDS}
+        return len(payloads), columns, _grade_entries([payload.get("grades", {}) for payload in payloads])
+
+    frame = payloads
+    columns = {
+        field: frame[field].where(frame[field].notna(), "").tolist() if field in frame.columns else [""] * len(frame)
+        for field in _TEXT_FIELDS
+    }
+    if "grades" in frame.columns:
+        return len(frame), columns, _grade_entries(frame["grades"].tolist())
+
+    flattened = [column for column in frame.columns if isinstance(column, str) and column.startswith("grades.")]
+    rows, positions, keys, values = [], [], [], []
+    for position, column in enumerate(flattened):
+        present = frame[column].notna().to_numpy()
+        found = np.flatnonzero(present)
+        rows.append(found)
+        positions.append(np.full(len(found), position))
+        keys.append(np.full(len(found), column[len("grades.") :], dtype=object))
+        values.append(frame[column].to_numpy(dtype=object)[present])
+    if not flattened:
+        return len(frame), columns, ([], [], [], [])
+    # Row-major order, as if each row's grades had been a dict.
+    order = np.argsort(np.concatenate(rows), kind="stable")
+    return len(frame), columns, tuple(np.concatenate(part)[order].tolist() for part in (rows, positions, keys, values))
+
+
+class ProfileBatch:
+    """Normalized profiles as columns.
+
+    Attributes:
+        subjects: canonical subject of each grade column.
+        grades: (profiles, subjects) float64 matrix; NaN where a grade is
+            missing or not a number.
+        grade_order: position of each subject in its payload, ``-1`` when the
+            payload has no such key; keeps ``grades`` dicts in input order.
+        overall: overall grade per profile, NaN when missing.
+        values: distinct cleaned skill, hobby, aspiration and stream texts.
+        skill_ids, skill_ptr: ``values`` ids of all skills, profile ``i``
+            owning ``skill_ids[skill_ptr[i]:skill_ptr[i + 1]]``.
+        hobby_ids, hobby_ptr: the same for hobbies.
+        career_ids, stream_ids: ``values`` id per profile, ``-1`` for none.
+        career_texts: the raw aspirations, stripped.
+    """
+
+    def __init__(
+        self,
+        subjects: List[object],
+        grades: np.ndarray,
+        grade_order: np.ndarray,
+        overall: np.ndarray,
+        values: List[str],
+        skill_ids: np.ndarray,
+        skill_ptr: np.ndarray,
+        hobby_ids: np.ndarray,
+        hobby_ptr: np.ndarray,
+        career_ids: np.ndarray,
+        stream_ids: np.ndarray,
+        career_texts: List[str],
+    ) -> None:
+        self.subjects = subjects
+        self.grades = grades
+        self.grade_order = grade_order
+        self.overall = overall
+        self.values = values
+        self.skill_ids = skill_ids
+        self.skill_ptr = skill_ptr
+        self.hobby_ids = hobby_ids
+        self.hobby_ptr = hobby_ptr
+        self.career_ids = career_ids
+        self.stream_ids = stream_ids
+        self.career_texts = career_texts
+
+    def __len__(self) -> int:
+        return len(self.overall)
+
+    def _value(self, value_id: int) -> str:
+        return self.values[value_id] if value_id >= 0 else ""
+
+    def profile(self, row: int) -> Dict[str, object]:
+        """The ``normalize_user_data`` dict of one profile; NaN grades come back as ``None``."""
+
+        present = np.flatnonzero(self.grade_order[row] >= 0)
+        present = present[np.argsort(self.grade_order[row, present], kind="stable")]
+        grades: Dict[object, Optional[float]] = {}
+        for column, value in zip(present.tolist(), self.grades[row, present].tolist()):
+            grades[self.subjects[column]] = None if value != value else value
+        overall = float(self.overall[row])
+        skills = self.skill_ids[self.skill_ptr[row] : self.skill_ptr[row + 1]].tolist()
+        hobbies = self.hobby_ids[self.hobby_ptr[row] : self.hobby_ptr[row + 1]].tolist()
+        return {
+            "grades": grades,
+            "grades_text": "; ".join(f"{k}: {v}" for k, v in grades.items() if v is not None),
+            "overall_grade": None if overall != overall else overall,
+            "career_aspiration": self._value(int(self.career_ids[row])),
+            "career_aspiration_text": self.career_texts[row],
+            "skills": [self.values[value_id] for value_id in skills],
+            "hobbies": [self.values[value_id] for value_id in hobbies],
+            "stream": self._value(int(self.stream_ids[row])) or None,
+        }
+
+    def profiles(self) -> List[Dict[str, object]]:
+        return [self.profile(row) for row in range(len(self))]
+
+    def sequences(self) -> Tuple[np.ndarray, np.ndarray]:
+        """``(rows, value ids)`` of every profile's texts, in the order they are vectorized."""
+
+        n = len(self)
+        every = np.arange(n)
+        rows = np.concatenate(
+            [every, np.repeat(every, np.diff(self.skill_ptr)), np.repeat(every, np.diff(self.hobby_ptr)), every]
+        )
+        ids = np.concatenate([self.career_ids, self.skill_ids, self.hobby_ids, self.stream_ids]).astype(np.int64)
+        # Within a row: aspiration, skills, hobbies, stream; entries keep their order.
+        slots = np.repeat([0, 1, 2, 3], [n, len(self.skill_ids), len(self.hobby_ids), n])
+        order = np.lexsort((np.arange(len(ids)), slots, rows))
+        rows, ids = rows[order], ids[order]
+        present = ids >= 0
+        return rows[present], ids[present]
+
+    def user_matrix(self, vectors: Dict[str, object]) -> sparse.csr_matrix:
+        """TF-IDF rows of every profile, equal to stacking ``vectorize_user_profile``.
+
+        With a term cache, each distinct value is analyzed once. The counts are
+        then ``occurrences @ value_counts`` plus the bigrams that span two
+        neighbouring values, and IDF weighting and row normalization finish
+        them. Without one, the vectorizer transforms all profile texts in one
+        call.
+        """
+
+        term_cache = vectors.get("term_cache")
+        if term_cache is None:
+            return vectors["vectorizer"].transform([profile_text(profile) for profile in self.profiles()])
+
+        entries = [term_cache.entry(value) for value in self.values]
+        n_values = len(entries)
+        value_counts = sparse.csr_matrix(
+            (
+                np.concatenate([entry[1] for entry in entries] or [np.empty(0)]),
+                np.concatenate([entry[0] for entry in entries] or [np.empty(0, dtype=np.int32)]),
+                np.concatenate([[0], np.cumsum([len(entry[0]) for entry in entries], dtype=np.int64)]),
+            ),
+            shape=(n_values, term_cache.n_features),
+        )
+        analyzed = np.array([entry[2] is not None for entry in entries], dtype=bool)
+
+        rows, ids = self.sequences()
+        keep = analyzed[ids] if len(ids) else np.zeros(0, dtype=bool)
+        rows, ids = rows[keep], ids[keep]
+        occurrences = sparse.csr_matrix((np.ones(len(ids)), (rows, ids)), shape=(len(self), n_values))
+        counts = (occurrences @ value_counts).tocoo()
+
+        # Bigrams across neighbouring values: one vocabulary lookup per distinct pair.
+        same_row = rows[1:] == rows[:-1]
+        unique_pairs, inverse = np.unique(ids[:-1][same_row] * n_values + ids[1:][same_row], return_inverse=True)
+        pair_columns = [
+            term_cache.bigram_column(entries[code // n_values][3], entries[code % n_values][2])
+            for code in unique_pairs.tolist()
+        ]
+        bridge_columns = np.array([-1 if column is None else column for column in pair_columns], dtype=np.int64)
+        bridge_columns = bridge_columns[inverse]
+        bridged = bridge_columns >= 0
+
+        matrix = sparse.csr_matrix(
+            (
+                np.concatenate([counts.data, np.ones(int(bridged.sum()))]),
+                (
+                    np.concatenate([counts.row, rows[1:][same_row][bridged]]),
+                    np.concatenate([counts.col, bridge_columns[bridged]]),
+                ),
+            ),
+            shape=(len(self), term_cache.n_features),
+        )
+        matrix.sum_duplicates()
+        matrix.data *= term_cache.idf[matrix.indices]
+        row_norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        row_norms[row_norms == 0] = 1.0
+        matrix.data /= np.repeat(row_norms, np.diff(matrix.indptr))
+        return matrix.astype(term_cache.dtype)
+
+
+def _factorize_texts(raw: Sequence[object], clean: Callable[[str], str]) -> Tuple[np.ndarray, List[str]]:
+    """Codes of ``raw`` into its distinct values, and ``clean`` of each distinct value."""
+
+    codes, uniques = pd.factorize(pd.Series(raw, dtype=object), use_na_sentinel=False)
+    return codes, [clean(value) for value in uniques.tolist()]
+
+
+def _list_items(selected: Sequence[object], custom: Sequence[object]) -> Tuple[np.ndarray, List[str]]:
+    """Rows and stripped items of each profile's selected, then custom, entries."""
+
+    rows: List[int] = []
+    items: List[str] = []
+    for row, sources in enumerate(zip(selected, custom)):
+        for source in sources:
+            if isinstance(source, np.ndarray):
+                source = source.tolist()
+            if isinstance(source, list):
+                kept = [item.strip() for item in source if isinstance(item, str) and item.strip()]
+                rows.extend([row] * len(kept))
+                items.extend(kept)
+    return np.array(rows, dtype=np.int64), items
+
+
+def normalize_batch(payloads) -> ProfileBatch:
+    """Normalize many questionnaire payloads; see the module docstring."""
+
+    n, columns, (rows, positions, keys, values) = _payload_columns(payloads)
+
+    # Grades: map each distinct key once, parse each distinct value once.
+    key_codes, raw_keys = pd.factorize(pd.Series(keys, dtype=object), use_na_sentinel=False)
+    subject_of: Dict[object, int] = {}
+    key_columns = np.array(
+        [-1 if key == "overall" else subject_of.setdefault(normalize_subject(key), len(subject_of)) for key in raw_keys],
+        dtype=np.int64,
+    )
+    subjects = list(subject_of)
+    value_codes, value_uniques = pd.factorize(pd.Series(values, dtype=object))
+    parsed = np.append(_parse_grade_values(value_uniques.tolist()), np.nan)[value_codes]
+
+    overall = np.full(n, np.nan)
+    grades = np.full((n, len(subjects)), np.nan)
+    grade_order = np.full((n, len(subjects)), -1, dtype=np.int32)
+    if rows:
+        rows = np.array(rows, dtype=np.int64)
+        positions = np.array(positions, dtype=np.int64)
+        entry_columns = key_columns[key_codes]
+        is_overall = entry_columns < 0
+        overall[rows[is_overall]] = parsed[is_overall]
+        rows, positions, entry_columns, parsed = (
+            part[~is_overall] for part in (rows, positions, entry_columns, parsed)
+        )
+        # Later keys that map to the same subject overwrite the value but keep the first position.
+        order = np.lexsort((positions, entry_columns, rows))
+        rows, positions, entry_columns, parsed = rows[order], positions[order], entry_columns[order], parsed[order]
+        cell = rows * len(subjects) + entry_columns
+        first = np.r_[True, cell[1:] != cell[:-1]]
+        last = np.r_[cell[1:] != cell[:-1], True]
+        grade_order[rows[first], entry_columns[first]] = positions[first]
+        grades[rows[last], entry_columns[last]] = parsed[last]
+
+    # Texts: clean each distinct string once and share one table of values.
+    value_ids: Dict[str, int] = {}
+
+    def intern(raw: Sequence[str], clean: Callable[[str], str]) -> np.ndarray:
+        codes, cleaned = _factorize_texts(raw, clean)
+        table = [value_ids.setdefault(text, len(value_ids)) if text else -1 for text in cleaned]
+        return np.array(table, dtype=np.int32)[codes] if len(codes) else np.zeros(0, dtype=np.int32)
+
+    career_texts = _text_column(columns["career_aspiration"]).tolist()
+    career_ids = intern(career_texts, lambda text: clean_text(text).strip())
+    stream_ids = intern(_text_column(columns["stream"]).str.lower().tolist(), lambda text: text)
+
+    ragged = []
+    for selected, custom in (("skills", "custom_skills"), ("hobbies", "custom_hobbies")):
+        item_rows, items = _list_items(columns[selected], columns[custom])
+        ids = intern(items, clean_text)
+        kept = ids >= 0
+        ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(item_rows[kept], minlength=n), out=ptr[1:])
+        ragged.append((ids[kept], ptr))
+
+    return ProfileBatch(
+        subjects=subjects,
+        grades=grades,
+        grade_order=grade_order,
+        overall=overall,
+        values=list(value_ids),
+        skill_ids=ragged[0][0],
+        skill_ptr=ragged[0][1],
+        hobby_ids=ragged[1][0],
+        hobby_ptr=ragged[1][1],
+        career_ids=career_ids,
+        stream_ids=stream_ids,
+        career_texts=career_texts,
+    )
+
+
+__all__ = ["ProfileBatch", "normalize_batch"]
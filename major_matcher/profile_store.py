@@ -0,0 +1,545 @@
+"""SQLite store of user profiles and their recommendations.
+
+The store fits its own sparse TF-IDF index on a majors catalog. For each
+profile it keeps the normalized profile, its TF-IDF vector in that index,
+the ``PROFILE_STORE_CANDIDATE_DEPTH`` most similar majors and the served
+top-k. ``sync_catalog`` diffs a new version of the catalog against the stored
+snapshot by major id. Added majors, and majors whose text changed, are
+vectorized with the fitted vectorizer. Every changed major is then scored
+against the stored profiles in one sparse product per batch. Rules are
+re-applied only for profiles whose top ``RULES_TOP_N`` candidates moved or
+include a changed major. Only profiles whose stored state changed are
+written.
+
+A candidate list is always an exact prefix of the profile's similarity
+ranking. When a change leaves one too short, only that profile is re-scored
+against the whole catalog. The vocabulary and IDF weights stay those of the
+last full fit, so terms new to the catalog are ignored until ``rebuild``
+refits the index and re-scores every profile.
+
+A sync writes the new catalog and every profile update in one SQLite
+transaction. The new index file is staged under a name that carries the
+catalog version and moved into place after the commit; a store opened after
+a crash between the two finishes the move. A failed sync leaves the stored
+catalog, index and profiles as they were.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from . import config
+from .data_loader import normalize_major_record, resolve_majors_path
+from .experiments import resolve_weights
+from .index_io import load_index, save_index
+from .rules import apply_rule_variants, build_reason, compute_rule_features
+from .similarity import _row_to_text, score_majors_batch, vectorize_majors
+from .user_profile import profile_text
+
+Candidates = List[Tuple[str, float]]
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS majors ("
+    " position INTEGER PRIMARY KEY, major_key TEXT NOT NULL UNIQUE, record TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS profiles ("
+    " profile_id TEXT PRIMARY KEY, profile TEXT NOT NULL, vector BLOB NOT NULL,"
+    " candidates TEXT NOT NULL, results TEXT NOT NULL, updated_at REAL NOT NULL)",
+)
+
+
+def _major_key(record: Dict[str, object]) -> str:
+    key = record.get("major_id")
+    return str(key if key not in (None, "") else record.get("major_name", ""))
+
+
+def _record_json(record: Dict[str, object]) -> str:
+    return json.dumps(record, sort_keys=True, default=str)
+
+
+def read_catalog_records(majors_path: str | Path | None = None) -> List[Dict[str, object]]:
+    """Normalized major records of a majors file; major ids must be unique."""
+
+    path = resolve_majors_path(majors_path)
+    if path is None:
+        raise FileNotFoundError(f"Majors file not found: {majors_path or config.MAJORS_PATH}")
+    records = [normalize_major_record(record) for record in json.loads(path.read_text(encoding="utf-8"))]
+    keys = [_major_key(record) for record in records]
+    if len(set(keys)) != len(keys):
+        raise ValueError(f"Major ids in {path} are not unique.")
+    return records
+
+
+def _encode_vector(row) -> bytes:
+    """One CSR row as little-endian int32 columns followed by float64 weights."""
+
+    return row.indices.astype("<i4").tobytes() + row.data.astype("<f8").tobytes()
+
+
+def _decode_vectors(blobs: Sequence[bytes], n_features: int):
+    indptr = np.zeros(len(blobs) + 1, dtype=np.int64)
+    indices, data = [np.empty(0, dtype="<i4")], [np.empty(0, dtype="<f8")]
+    for i, blob in enumerate(blobs):
+        n = len(blob) // 12
+        indices.append(np.frombuffer(blob, dtype="<i4", count=n))
+        data.append(np.frombuffer(blob, dtype="<f8", count=n, offset=4 * n))
+        indptr[i + 1] = indptr[i] + n
+    return sparse.csr_matrix(
+        (np.concatenate(data), np.concatenate(indices), indptr), shape=(len(blobs), n_features)
+    )
+
+
+class ConnectionPool:
+    """A fixed set of SQLite connections (WAL mode) shared between threads."""
+
+    def __init__(self, path: Path, size: int) -> None:
+        self.size = max(1, size)
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(self.size):
+            connection = sqlite3.connect(str(path), timeout=30.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._idle.put(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        for _ in range(self.size):
+            self._idle.get().close()
+
+
+class ProfileStore:
+    """Profiles and their served recommendations for one weight ``variant``.
+
+    Call ``sync_catalog`` once to fit the index, then ``put_profiles``; later
+    ``sync_catalog`` calls apply catalog changes incrementally and return a
+    change report. The fitted index is kept next to the database as
+    ``<name>.index.npz``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        variant: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        depth: Optional[int] = None,
+    ) -> None:
+        self.path = Path(path) if path else config.PROFILE_STORE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.path.with_name(f"{self.path.name}.index.npz")
+        self.variant = variant
+        self.weights = resolve_weights(variant)
+        self.top_n = int(self.weights["RULES_TOP_N"])
+        self.depth = max(config.PROFILE_STORE_CANDIDATE_DEPTH if depth is None else depth, self.top_n)
+        self.batch_size = config.PROFILE_STORE_BATCH_SIZE if batch_size is None else batch_size
+        self._pool = ConnectionPool(self.path, config.PROFILE_STORE_POOL_SIZE if pool_size is None else pool_size)
+        self._lock = threading.Lock()
+        self._vectors: Optional[Dict[str, object]] = None
+        self.catalog_version: Optional[str] = None
+        with self._pool.connection() as connection, connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            connection.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('variant', ?)", (json.dumps(variant),)
+            )
+            stored = json.loads(connection.execute("SELECT value FROM meta WHERE key = 'variant'").fetchone()[0])
+        if stored != variant:
+            raise ValueError(f"{self.path} holds results for variant {stored!r}, not {variant!r}.")
+        self._load_state()
+
+    # Catalog state -------------------------------------------------------
+
+    def _set_catalog(self, records: List[Dict[str, object]], vectors: Optional[Dict[str, object]]) -> None:
+        self._records = records
+        self._keys = [_major_key(record) for record in records]
+        self._positions = {key: position for position, key in enumerate(self._keys)}
+        self._names = [str(record.get("major_name", "")) for record in records]
+        self._vectors = vectors
+
+    def _load_state(self) -> None:
+        with self._pool.connection() as connection:
+            rows = connection.execute("SELECT record FROM majors ORDER BY position").fetchall()
+            version = connection.execute("SELECT value FROM meta WHERE key = 'catalog_version'").fetchone()
+        records = [json.loads(record) for (record,) in rows]
+        self.catalog_version = version[0] if version else None
+        self._settle_index()
+        vectors = load_index(self.index_path) if records and self.index_path.exists() else None
+        self._set_catalog(records, vectors)
+
+    def _staged_index(self, version: str) -> Path:
+        return self.index_path.with_name(f"{self.index_path.name}.{version}.tmp")
+
+    def _settle_index(self) -> None:
+        """Move in the staged index of the committed catalog; drop any other staged index."""
+
+        for staged in self.index_path.parent.glob(f"{self.index_path.name}.*.tmp"):
+            if self.catalog_version is not None and staged == self._staged_index(self.catalog_version):
+                staged.replace(self.index_path)
+            else:
+                staged.unlink(missing_ok=True)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """One write transaction for a whole sync, rolled back on any error."""
+
+        with self._pool.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+
+    def _sync(self, apply, records: List[Dict[str, object]], started: float) -> Dict[str, object]:
+        """Run ``apply`` in one transaction; restore the stored state if it fails."""
+
+        try:
+            with self._transaction() as connection:
+                report = apply(records, started, connection)
+        except BaseException:
+            self._load_state()
+            raise
+        self.catalog_version = report["catalog_version"]
+        self._settle_index()
+        return report
+
+    def _persist_catalog(self, version: str, connection: sqlite3.Connection) -> None:
+        """Stage the index file and write the catalog rows inside ``connection``'s transaction."""
+
+        save_index(self._vectors, self._staged_index(version))
+        connection.execute("DELETE FROM majors")
+        connection.executemany(
+            "INSERT INTO majors (position, major_key, record) VALUES (?, ?, ?)",
+            [
+                (position, key, _record_json(record))
+                for position, (key, record) in enumerate(zip(self._keys, self._records))
+            ],
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('catalog_version', ?)", (version,)
+        )
+
+    def _require_catalog(self) -> Dict[str, object]:
+        if self._vectors is None:
+            raise ValueError("No catalog loaded; call sync_catalog first.")
+        return self._vectors
+
+    # Scoring ---------------------------------------------------------------
+
+    def _candidates(self, scores: np.ndarray) -> Candidates:
+        order = np.argsort(-scores, kind="stable")[: self.depth]
+        return [(self._keys[position], float(scores[position])) for position in order.tolist()]
+
+    def _results(self, profile: Dict[str, object], candidates: Candidates) -> List[Dict[str, object]]:
+        ranked = [
+            {"major_name": self._names[self._positions[key]], "score": score, "index": self._positions[key]}
+            for key, score in candidates[: self.top_n]
+        ]
+        features = compute_rule_features(ranked, profile, self._records, top_n=self.top_n)
+        adjusted = apply_rule_variants(features, {"served": self.weights})["served"]
+        return [
+            {
+                "major_id": self._keys[entry["index"]],
+                "major_name": entry["major_name"],
+                "score": float(entry["score"]),
+                "reason": build_reason(entry, profile, self._records),
+            }
+            for entry in adjusted[: config.RETURN_TOP_K]
+        ]
+
+    def _score_profiles(self, profiles: Sequence[Dict[str, object]]):
+        """Vectors, candidates and results of ``profiles`` against the whole catalog."""
+
+        vectors = self._require_catalog()
+        user_matrix = vectors["vectorizer"].transform([profile_text(profile) for profile in profiles])
+        scores = score_majors_batch(user_matrix, vectors)
+        scored = []
+        for i, profile in enumerate(profiles):
+            candidates = self._candidates(scores[i])
+            scored.append((user_matrix[i], candidates, self._results(profile, candidates)))
+        return scored
+
+    def recommend(self, profile: Dict[str, object]) -> List[Dict[str, object]]:
+        """Results for a normalized profile against the current catalog, without storing it."""
+
+        with self._lock:
+            return self._score_profiles([profile])[0][2]
+
+    # Profiles --------------------------------------------------------------
+
+    def put_profiles(self, profiles: Mapping[str, Dict[str, object]]) -> int:
+        """Score and store normalized profiles by id, replacing existing ones."""
+
+        items = list(profiles.items())
+        with self._lock:
+            self._require_catalog()
+            for start in range(0, len(items), self.batch_size):
+                chunk = items[start : start + self.batch_size]
+                scored = self._score_profiles([profile for _profile_id, profile in chunk])
+                now = time.time()
+                self._write(
+                    [
+                        _profile_row(profile_id, json.dumps(profile), row, candidates, results, now)
+                        for (profile_id, profile), (row, candidates, results) in zip(chunk, scored)
+                    ]
+                )
+        return len(items)
+
+    def get_results(self, profile_id: str) -> Optional[List[Dict[str, object]]]:
+        with self._pool.connection() as connection:
+            row = connection.execute("SELECT results FROM profiles WHERE profile_id = ?", (profile_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        with self._pool.connection() as connection:
+            return connection.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    @contextmanager
+    def _writer(self, connection: Optional[sqlite3.Connection]) -> Iterator[sqlite3.Connection]:
+        """``connection`` when inside a sync transaction, else a pooled one committing on exit."""
+
+        if connection is not None:
+            yield connection
+            return
+        with self._pool.connection() as pooled, pooled:
+            yield pooled
+
+    def _write(self, rows: List[tuple], connection: Optional[sqlite3.Connection] = None) -> None:
+        if not rows:
+            return
+        with self._writer(connection) as connection:
+            connection.executemany(
+                "INSERT INTO profiles (profile_id, profile, vector, candidates, results, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(profile_id) DO UPDATE SET"
+                " profile = excluded.profile, vector = excluded.vector, candidates = excluded.candidates,"
+                " results = excluded.results, updated_at = excluded.updated_at",
+                rows,
+            )
+
+    def _update(self, rows: List[tuple], connection: sqlite3.Connection) -> None:
+        if not rows:
+            return
+        connection.executemany(
+            "UPDATE profiles SET candidates = ?, results = ?, updated_at = ? WHERE profile_id = ?", rows
+        )
+
+    def _batches(self, connection: sqlite3.Connection) -> Iterator[List[tuple]]:
+        last = ""
+        while True:
+            batch = connection.execute(
+                "SELECT profile_id, profile, vector, candidates, results FROM profiles"
+                " WHERE profile_id > ? ORDER BY profile_id LIMIT ?",
+                (last, self.batch_size),
+            ).fetchall()
+            if not batch:
+                return
+            yield batch
+            last = batch[-1][0]
+
+    # Catalog changes ---------------------------------------------------------
+
+    def sync_catalog(self, majors_path: str | Path | None = None) -> Dict[str, object]:
+        """Bring the store up to date with a majors file and report what changed.
+
+        The first call fits the index. Later calls apply only the differences
+        to the stored catalog.
+        """
+
+        started = time.perf_counter()
+        records = read_catalog_records(majors_path)
+        with self._lock:
+            apply = self._rebuild if self._vectors is None else self._apply_changes
+            return self._sync(apply, records, started)
+
+    def rebuild(self, majors_path: str | Path | None = None) -> Dict[str, object]:
+        """Refit the index on a majors file and re-score every profile."""
+
+        started = time.perf_counter()
+        records = read_catalog_records(majors_path)
+        with self._lock:
+            return self._sync(self._rebuild, records, started)
+
+    def _report(self, version: str, started: float, majors: Dict[str, List[str]], **counts) -> Dict[str, object]:
+        changes = counts.pop("changes")
+        return {
+            "catalog_version": version,
+            "majors": majors,
+            **counts,
+            "top_k_changed": len(changes),
+            "changes": changes,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def _rebuild(
+        self, records: List[Dict[str, object]], started: float, connection: sqlite3.Connection
+    ) -> Dict[str, object]:
+        if not records:
+            raise ValueError("Cannot build a profile store index from an empty catalog.")
+        previous = set(self._keys)
+        vectors = vectorize_majors(pd.DataFrame(records), mode="sparse")
+        vectors.pop("neighbours", None)
+        self._set_catalog(records, vectors)
+        version = _catalog_hash(records)
+
+        total, changes = 0, []
+        for batch in self._batches(connection):
+            profiles = [json.loads(profile) for _profile_id, profile, _vector, _candidates, _results in batch]
+            scored = self._score_profiles(profiles)
+            now = time.time()
+            rows = []
+            for (profile_id, profile, _vector, _old, old_results), (row, candidates, results) in zip(batch, scored):
+                rows.append(_profile_row(profile_id, profile, row, candidates, results, now))
+                _record_change(changes, profile_id, json.loads(old_results), results)
+            self._write(rows, connection)
+            total += len(batch)
+        self._persist_catalog(version, connection)
+        added = [key for key in self._keys if key not in previous]
+        majors = {"added": added, "removed": [], "changed": [], "text_changed": []}
+        return self._report(
+            version, started, majors, full=True, profiles=total, rules_rescored=total,
+            fully_rescored=total, written=total, changes=changes,
+        )
+
+    def _apply_changes(
+        self, records: List[Dict[str, object]], started: float, connection: sqlite3.Connection
+    ) -> Dict[str, object]:
+        old_records = dict(zip(self._keys, self._records))
+        old_positions = self._positions
+        old_matrix = self._vectors["matrix"]
+        vectorizer = self._vectors["vectorizer"]
+
+        keys = [_major_key(record) for record in records]
+        key_set = set(keys)
+        added = [key for key in keys if key not in old_records]
+        removed = [key for key in self._keys if key not in key_set]
+        changed, text_changed = [], []
+        for key, record in zip(keys, records):
+            old = old_records.get(key)
+            if old is not None and _record_json(old) != _record_json(record):
+                changed.append(key)
+                if _row_to_text(old) != _row_to_text(record):
+                    text_changed.append(key)
+        majors = {"added": added, "removed": removed, "changed": changed, "text_changed": text_changed}
+        version = _catalog_hash(records)
+        if not (added or removed or changed) and keys == self._keys:
+            (count,) = connection.execute("SELECT COUNT(*) FROM profiles").fetchone()
+            return self._report(
+                version, started, majors, full=False, profiles=count, rules_rescored=0,
+                fully_rescored=0, written=0, changes=[],
+            )
+
+        # Reuse the rows of majors whose text is unchanged; vectorize the rest.
+        fresh_keys = set(added) | set(text_changed)
+        reused = [position for position, key in enumerate(keys) if key not in fresh_keys]
+        fresh = [position for position, key in enumerate(keys) if key in fresh_keys]
+        blocks = [old_matrix[[old_positions[keys[position]] for position in reused]]]
+        if fresh:
+            blocks.append(vectorizer.transform([_row_to_text(records[position]) for position in fresh]))
+        stacked = sparse.vstack(blocks, format="csr")
+        matrix = stacked[np.argsort(np.array(reused + fresh, dtype=np.int64))]
+        self._set_catalog(records, dict(self._vectors, matrix=matrix))
+
+        dirty = added + changed
+        dirty_set, changed_set = set(dirty), set(changed)
+        stale = dirty_set | set(removed)
+        dirty_matrix = matrix[[self._positions[key] for key in dirty]]
+        n_unchanged = len(keys) - len(dirty)
+        # Ties are ranked by catalog position; if surviving majors were reordered,
+        # a kept candidate tied with the cutoff may no longer rank first.
+        reordered = [key for key in keys if key in old_records] != [key for key in old_records if key in key_set]
+        n_features = matrix.shape[1]
+
+        total, rules_rescored, fully_rescored, written, changes = 0, 0, 0, 0, []
+        for batch in self._batches(connection):
+            user_matrix = _decode_vectors([row[2] for row in batch], n_features)
+            dirty_scores = (user_matrix @ dirty_matrix.T).toarray() if dirty else np.zeros((len(batch), 0))
+            new_candidates: Dict[int, Candidates] = {}
+            full = []
+            for i, (_profile_id, _profile, _vector, candidates_json, _results) in enumerate(batch):
+                kept = [(key, score) for key, score in json.loads(candidates_json) if key not in stale]
+                merged = kept + [(key, float(score)) for key, score in zip(dirty, dirty_scores[i].tolist())]
+                merged.sort(key=lambda item: (-item[1], self._positions[item[0]]))
+                if len(kept) < n_unchanged:
+                    # Unchanged majors beyond the kept list score at most its last score.
+                    cutoff = kept[-1][1] if kept else np.inf
+                    merged = [
+                        item for item in merged
+                        if item[1] > cutoff or (item[0] not in dirty_set and not reordered)
+                    ]
+                if len(merged) >= self.top_n or len(kept) == n_unchanged:
+                    new_candidates[i] = merged[: self.depth]
+                else:
+                    full.append(i)
+            if full:
+                full_scores = score_majors_batch(user_matrix[full], self._vectors)
+                for row, i in enumerate(full):
+                    new_candidates[i] = self._candidates(full_scores[row])
+                fully_rescored += len(full)
+
+            now = time.time()
+            updates = []
+            for i, (profile_id, profile_json, _vector, candidates_json, results_json) in enumerate(batch):
+                candidates = new_candidates[i]
+                old_candidates = [(key, score) for key, score in json.loads(candidates_json)]
+                old_results = json.loads(results_json)
+                results = old_results
+                top = candidates[: self.top_n]
+                if top != old_candidates[: self.top_n] or any(key in changed_set for key, _score in top):
+                    results = self._results(json.loads(profile_json), candidates)
+                    rules_rescored += 1
+                if candidates != old_candidates or results != old_results:
+                    updates.append((json.dumps(candidates), json.dumps(results), now, profile_id))
+                    _record_change(changes, profile_id, old_results, results)
+            self._update(updates, connection)
+            written += len(updates)
+            total += len(batch)
+
+        self._persist_catalog(version, connection)
+        return self._report(
+            version, started, majors, full=False, profiles=total, rules_rescored=rules_rescored,
+            fully_rescored=fully_rescored, written=written, changes=changes,
+        )
+
+    def close(self) -> None:
+        self._pool.close()
+
+
+def _catalog_hash(records: List[Dict[str, object]]) -> str:
+    digest = hashlib.sha1()
+    for record in records:
+        digest.update(_record_json(record).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def _profile_row(profile_id: str, profile_json: str, vector, candidates: Candidates, results, now: float) -> tuple:
+    return profile_id, profile_json, _encode_vector(vector), json.dumps(candidates), json.dumps(results), now
+
+
+def _record_change(changes: List[Dict[str, object]], profile_id: str, before, after) -> None:
+    before_ids = [item["major_id"] for item in before]
+    after_ids = [item["major_id"] for item in after]
+    if before_ids != after_ids:
+        changes.append({"profile_id": profile_id, "before": before_ids, "after": after_ids})
+
+
+__all__ = ["ConnectionPool", "ProfileStore", "read_catalog_records"]
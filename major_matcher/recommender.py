@@ -2,64 +2,248 @@
 
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from . import config
-from .data_loader import load_context, load_majors_data
-from .rules import apply_rules, build_reason
-from .similarity import compute_similarity_scores, vectorize_majors, vectorize_user_profile
+from .catalog import get_registry
+from .diversity import diversify
+from .experiments import resolve_weights
+from .explain import explain_results
+from .fragments import RenderedRecommendation, major_fragments, render_recommendation
+from .neighbours import neighbours_of
+from .rules import apply_rule_variants, build_reason, compute_rule_features
+from .similarity import rank_scores, score_majors, vectorize_user_profile
 
 UserData = Dict[str, object]
 
 
-def _ensure_resources():
-    majors_df, context, vectors = _cached_resources()
+def _ensure_resources(catalog: Optional[str] = None):
+    majors_df, context, vectors = get_registry().get(catalog)
     if majors_df.empty:
         raise ValueError("Majors data could not be loaded. Ensure data/majors.json exists.")
     return majors_df, context, vectors
 
 
-@lru_cache(maxsize=1)
-def _cached_resources():
-    majors_df = load_majors_data()
-    context = load_context()
-    vectors = vectorize_majors(majors_df)
-    return majors_df, context, vectors
+def _user_features(
+    user_data: UserData,
+    majors_df,
+    vectors,
+    weights: List[Dict[str, float]],
+    timings: Optional[Dict[str, float]] = None,
+):
+    started = time.perf_counter()
+    user_vector = vectorize_user_profile(user_data, vectors["vectorizer"], vectors.get("term_cache"))
+    ranked = rank_scores(score_majors(user_vector, vectors), majors_df)
+    scored = time.perf_counter()
+    top_n = max(int(w["RULES_TOP_N"]) for w in weights)
+    features = compute_rule_features(ranked, user_data, majors_df, top_n=top_n)
+    if timings is not None:
+        timings["similarity"] = (scored - started) * 1000
+        timings["features"] = (time.perf_counter() - scored) * 1000
+    return user_vector, features
+
+
+def _rule_features(
+    user_data: UserData,
+    majors_df,
+    vectors,
+    weights: List[Dict[str, float]],
+    timings: Optional[Dict[str, float]] = None,
+):
+    return _user_features(user_data, majors_df, vectors, weights, timings)[1]
+
+
+def _similarity_only(user_data: UserData, majors_df, vectors, timings: Dict[str, float]) -> List[Dict[str, object]]:
+    started = time.perf_counter()
+    user_vector = vectorize_user_profile(user_data, vectors["vectorizer"], vectors.get("term_cache"))
+    ranked = rank_scores(score_majors(user_vector, vectors), majors_df)
+    timings["similarity"] = (time.perf_counter() - started) * 1000
+    return ranked[: config.RETURN_TOP_K]
+
+
+def _top_ids(majors_df, entries) -> List[object]:
+    if "major_id" not in majors_df.columns:
+        return []
+    return [majors_df["major_id"].iat[entry["index"]] for entry in entries[: config.RETURN_TOP_K]]
+
+
+def _format_results(adjusted, user_data: UserData, majors_df) -> List[Dict[str, object]]:
+    results: List[Dict[str, object]] = []
+    for entry in adjusted[: config.RETURN_TOP_K]:
+        reason = build_reason(entry, user_data, majors_df)
+        results.append(
+            {
+                "major_name": entry["major_name"],
+                "score": float(entry["score"]),
+                "reason": reason,
+            }
+        )
+    return results
+
+
+def _render_results(adjusted, majors_df, vectors, explanations=None) -> List[RenderedRecommendation]:
+    fragments = major_fragments(vectors, majors_df)
+    results = []
+    for i, entry in enumerate(adjusted[: config.RETURN_TOP_K]):
+        idx = entry["index"]
+        reason = fragments.reason(idx, entry.get("skill_overlap", 0), entry.get("career_hits", 0))
+        explanation = explanations[i] if explanations is not None else None
+        results.append(
+            render_recommendation(fragments.names[idx], entry["major_name"], entry["score"], reason, explanation)
+        )
+    return results
 
 
-def recommend(user_data: UserData) -> List[Dict[str, object]]:
+def recommend(
+    user_data: UserData,
+    catalog: Optional[str] = None,
+    variant: Optional[str] = None,
+    degraded: bool = False,
+    diversity: Optional[str] = None,
+    explain: bool = False,
+) -> List[Dict[str, object]]:
     """Return ordered recommendations for the supplied user profile.
 
     Args:
         user_data: Dict with keys "grades" (dict or str), "career_aspiration",
             "skills" (list[str]), and "hobbies" (list[str]).
+        catalog: Name of the majors catalog to score against; defaults to
+            ``config.DEFAULT_CATALOG``.
+        variant: Name of a rule-weight profile from ``config.WEIGHT_PROFILES``;
+            ``None`` uses the plain config values.
+        degraded: Skip the rule pass and reasons and rank by similarity only;
+            used to shed work when the backend is overloaded.
+        diversity: One of ``config.DIVERSITY_MODES`` to re-rank the top-k for
+            variety; ``None`` uses ``config.DIVERSITY_MODE``.
+        explain: Add an ``"explanation"`` with the top TF-IDF term
+            contributions and each rule's multiplier (see
+            ``explain.explain_results``). Off, no explanation work is done.
 
     Returns:
-        List of recommendation dicts: {"major_name": str, "score": float, "reason": str}
+        List of recommendation dicts: {"major_name": str, "score": float, "reason": str},
+        plus "explanation" (dict) when ``explain`` is set.
     """
 
-    majors_df, _context, vectors = _ensure_resources()
+    results, _shadows = recommend_with_shadows(
+        user_data, variant=variant, catalog=catalog, degraded=degraded, diversity=diversity, explain=explain
+    )
+    return results
 
-    user_vector = vectorize_user_profile(user_data, vectors["vectorizer"])
-    ranked = compute_similarity_scores(user_vector, vectors["matrix"], majors_df)
-    if not ranked:
-        return []
 
-    adjusted = apply_rules(ranked, user_data, majors_df, top_n=config.RULES_TOP_N)
+def recommend_with_shadows(
+    user_data: UserData,
+    variant: Optional[str] = None,
+    shadow_variants: Sequence[str] = (),
+    catalog: Optional[str] = None,
+    degraded: bool = False,
+    trace: Optional[Dict[str, object]] = None,
+    rendered: bool = False,
+    diversity: Optional[str] = None,
+    explain: bool = False,
+) -> Tuple[List[Dict[str, object]], Dict[str, List[Dict[str, object]]]]:
+    """Score ``variant`` and any shadow variants in a single pass.
+
+    Similarity and rule features are computed once; every weight profile is
+    then applied in one broadcast. Only the served variant gets reasons, the
+    shadows return their ranked ``{"major_name", "score"}`` lists for logging.
+    ``degraded`` returns similarity-only results with empty reasons and no
+    shadows. A ``trace`` dict is filled with the catalog version, per-stage
+    timings in milliseconds and the served top-k major ids, for request logs.
+    With ``rendered`` the served results are ``RenderedRecommendation`` JSON
+    fragments instead of dicts (see ``fragments.render_response``).
+    ``diversity`` re-ranks every variant's list (see ``diversity.diversify``).
+    ``explain`` adds an ``"explanation"`` to each served result, dict or
+    rendered fragment.
+    """
 
-    results: List[Dict[str, object]] = []
-    for entry in adjusted[: config.RETURN_TOP_K]:
-        reason = build_reason(entry, user_data, majors_df)
-        results.append(
+    majors_df, _context, vectors = _ensure_resources(catalog)
+    timings: Dict[str, float] = {}
+    if trace is not None:
+        trace["catalog_version"] = vectors.get("catalog_version")
+        trace["timings_ms"] = timings
+        trace["top_ids"] = []
+    if vectors["matrix"] is None:
+        return [], {name: [] for name in shadow_variants}
+    if degraded:
+        ranked = _similarity_only(user_data, majors_df, vectors, timings)
+        if trace is not None:
+            trace["top_ids"] = _top_ids(majors_df, ranked)
+        if rendered:
+            names = major_fragments(vectors, majors_df).names
+            return [
+                render_recommendation(names[entry["index"]], entry["major_name"], entry["score"], b'""')
+                for entry in ranked
+            ], {}
+        results = [
+            {"major_name": entry["major_name"], "score": float(entry["score"]), "reason": ""} for entry in ranked
+        ]
+        return results, {}
+
+    served = variant if variant is not None else "__config__"
+    profiles = {served: resolve_weights(variant)}
+    for name in shadow_variants:
+        if name not in profiles:
+            profiles[name] = resolve_weights(name)
+
+    user_vector, features = _user_features(user_data, majors_df, vectors, list(profiles.values()), timings)
+    started = time.perf_counter()
+    adjusted = {
+        name: diversify(ranked, vectors, majors_df, diversity)
+        for name, ranked in apply_rule_variants(features, profiles).items()
+    }
+    ruled = time.perf_counter()
+    explanations = None
+    if explain:
+        explanations = explain_results(adjusted[served], features, profiles[served], user_vector, vectors)
+    if rendered:
+        results = _render_results(adjusted[served], majors_df, vectors, explanations)
+    else:
+        results = _format_results(adjusted[served], user_data, majors_df)
+        for result, explanation in zip(results, explanations or ()):
+            result["explanation"] = explanation
+    timings["rules"] = (ruled - started) * 1000
+    timings["reasons"] = (time.perf_counter() - ruled) * 1000
+    if trace is not None:
+        trace["top_ids"] = _top_ids(majors_df, adjusted[served])
+    shadows = {
+        name: [
+            {"major_name": entry["major_name"], "score": float(entry["score"])}
+            for entry in adjusted[name][: config.RETURN_TOP_K]
+        ]
+        for name in shadow_variants
+    }
+    return results, shadows
+
+
+class UnknownMajorError(KeyError):
+    """Raised when a major id is not present in the selected catalog."""
+
+
+def related_majors(major_id: str, k: int = 5, catalog: Optional[str] = None) -> List[Dict[str, object]]:
+    """Return up to ``k`` majors most similar to ``major_id`` from the neighbour table."""
+
+    majors_df, _context, vectors = _ensure_resources(catalog)
+    row = vectors.get("major_ids", {}).get(str(major_id))
+    if row is None:
+        raise UnknownMajorError(major_id)
+    table = vectors.get("neighbours")
+    if table is None:
+        return []
+
+    indices, scores = neighbours_of(table, row, k)
+    related: List[Dict[str, object]] = []
+    for idx, score in zip(indices.tolist(), scores.tolist()):
+        major = majors_df.iloc[idx]
+        related.append(
             {
-                "major_name": entry["major_name"],
-                "score": float(entry["score"]),
-                "reason": reason,
+                "major_id": major.get("major_id"),
+                "major_name": major.get("major_name"),
+                "university_name": major.get("university_name"),
+                "score": float(score),
             }
         )
-
-    return results
+    return related
 
 
-__all__ = ["recommend"]
+__all__ = ["recommend", "recommend_with_shadows", "related_majors", "UnknownMajorError"]
@@ -0,0 +1,160 @@
+"""Sampled JSON-lines request logging off the request path.
+
+Handlers hand a record to ``RequestLogger.log``, which only enqueues it; a
+background thread serializes and writes the records. When the queue is full
+the record is dropped and counted instead of blocking the request. Records
+that cannot be written (the log file cannot be opened, the disk is full) are
+counted as ``<name>.write_errors`` and the writer keeps going.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, TextIO
+
+from . import config
+from .metrics import Metrics, get_metrics
+
+
+class RequestLogger:
+    """Bounded queue of log records drained by a writer thread."""
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        path: Optional[str] = None,
+        sample_rate: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        metrics: Optional[Metrics] = None,
+        rng: Callable[[], float] = random.random,
+        name: str = "request_log",
+    ) -> None:
+        self.name = name
+        self.sample_rate = config.REQUEST_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.path = config.REQUEST_LOG_PATH if path is None and stream is None else path
+        self.stream = stream
+        self.metrics = metrics or get_metrics()
+        self.dropped = 0
+        self._rng = rng
+        self._queue: "queue.Queue[Optional[Dict[str, object]]]" = queue.Queue(
+            maxsize=config.REQUEST_LOG_QUEUE_SIZE if queue_size is None else queue_size
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def sampled(self) -> bool:
+        """Decide whether the current request is logged; check before building a record."""
+
+        return self.sample_rate >= 1.0 or (self.sample_rate > 0.0 and self._rng() < self.sample_rate)
+
+    def log(self, record: Dict[str, object]) -> bool:
+        """Enqueue ``record`` without blocking; returns ``False`` if it was dropped."""
+
+        self._ensure_started()
+        record = dict(record)
+        record.setdefault("ts", round(time.time(), 3))
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self.metrics.incr(f"{self.name}.dropped")
+            return False
+        return True
+
+    def flush(self) -> None:
+        """Block until every queued record has been handled, or the writer thread is gone."""
+
+        thread = self._thread
+        if thread is None:
+            return
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks and thread.is_alive():
+                self._queue.all_tasks_done.wait(0.1)
+
+    def close(self) -> None:
+        """Write the remaining records and stop the writer thread."""
+
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _open(self) -> TextIO:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        return open(self.path, "a", encoding="utf-8")
+
+    def _run(self) -> None:
+        owned: Optional[TextIO] = None
+        try:
+            while True:
+                record = self._queue.get()
+                batch = [record]
+                # Write everything already queued before flushing once.
+                while record is not None:
+                    try:
+                        record = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    batch.append(record)
+                items = [item for item in batch if item is not None]
+                try:
+                    if items:
+                        stream = self.stream
+                        if stream is None and self.path:
+                            # Opened on demand so a failed open is retried with the next batch.
+                            owned = owned or self._open()
+                            stream = owned
+                        stream = stream or sys.stderr
+                        lines = [json.dumps(item, separators=(",", ":"), default=str) for item in items]
+                        stream.write("\n".join(lines) + "\n")
+                        stream.flush()
+                        self.metrics.incr(f"{self.name}.written", len(lines))
+                except (OSError, ValueError, TypeError):
+                    self.metrics.incr(f"{self.name}.write_errors", len(items))
+                    if owned is not None:
+                        try:
+                            owned.close()
+                        except OSError:
+                            pass
+                        owned = None
+                finally:
+                    for _item in batch:
+                        self._queue.task_done()
+                if batch[-1] is None:
+                    return
+        finally:
+            if owned is not None:
+                owned.close()
+
+
+_LOGGER: Optional[RequestLogger] = None
+_LOGGER_LOCK = threading.Lock()
+
+
+def get_request_logger() -> RequestLogger:
+    """Return the process-wide request logger."""
+
+    global _LOGGER
+    if _LOGGER is None:
+        with _LOGGER_LOCK:
+            if _LOGGER is None:
+                _LOGGER = RequestLogger()
+    return _LOGGER
+
+
+__all__ = ["RequestLogger", "get_request_logger"]
@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Set
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple, Union
 
-import pandas as pd
+import numpy as np
 
 from . import config
+from .experiments import base_weights
 from .text_clean import tokenize
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# A majors DataFrame, or the list of normalized major records the slim runtime uses.
+Majors = Union["pd.DataFrame", Sequence[Dict[str, object]]]
+
+
+def _major_row(majors: Majors, idx: int):
+    return majors.iloc[idx] if hasattr(majors, "iloc") else majors[idx]
+
 
 def _count_overlaps(user_terms: List[str], target_terms: List[str]) -> int:
     user_lower = {term.lower() for term in user_terms if term}
@@ -40,13 +51,63 @@ def _career_overlap_score(user_text: str, options: List[str]) -> int:
     return len(user_tokens & option_tokens)
 
 
-def apply_rules(
+def _grade_fails(min_grade, subject_requirements, grade_value, user_grades) -> Tuple[int, int]:
+    overall_fail = 0
+    if min_grade is not None and min_grade == min_grade and grade_value is not None:
+        try:
+            if float(grade_value) < float(min_grade):
+                overall_fail = 1
+        except (TypeError, ValueError):
+            pass
+
+    subject_fails = 0
+    for subject, required_grade in (subject_requirements or {}).items():
+        user_grade = user_grades.get(subject)
+        if user_grade is None:
+            continue
+        try:
+            if float(user_grade) < float(required_grade):
+                subject_fails += 1
+        except (TypeError, ValueError):
+            continue
+    return overall_fail, subject_fails
+
+
+def _major_record(row, career_text: str, user_skills: List[str]) -> Tuple[object, dict, int, int]:
+    """Grade requirements plus the grade-independent match counts of one major."""
+
+    career_hits = _career_overlap_score(
+        career_text, row.get("example_career_paths", []) + row.get("industry_keywords", [])
+    )
+
+    overlap_sources = []
+    for field in ["curriculum_keywords", "learning_style", "required_hs_subjects"]:
+        value = row.get(field, [])
+        if isinstance(value, list):
+            overlap_sources.extend([str(item) for item in value])
+    overlap_count = _count_overlaps(user_skills, overlap_sources)
+    requirements = row.get("min_grade_requirements", {}) or {}
+    return row.get("min_overall_percentage"), requirements, career_hits, overlap_count
+
+
+def compute_rule_features(
     ranked_majors: List[Dict[str, object]],
     user_profile: Dict[str, object],
-    majors_df: pd.DataFrame,
+    majors_df: Majors,
     top_n: int = config.RULES_TOP_N,
-):
-    """Apply simple domain rules to the top ranked majors."""
+    record_cache: Optional[Dict[int, tuple]] = None,
+) -> Dict[str, np.ndarray]:
+    """Extract the weight-independent inputs of every rule for the top majors.
+
+    Returns parallel arrays over ``ranked_majors[:top_n]``: ``index``, base
+    ``score``, ``overall_fail`` (0/1), ``subject_fails``, ``career_hits`` and
+    ``skill_overlap``. Any set of rule weights can then be applied with
+    ``rule_multipliers`` without touching the majors data again.
+
+    ``record_cache`` maps a major row to its requirements and match counts for
+    the current aspiration and skills; callers that score the same profile
+    repeatedly pass one and clear it when either of those changes.
+    """
 
     trimmed = ranked_majors[:top_n]
     grade_value = user_profile.get("overall_grade")
@@ -54,79 +115,159 @@ def apply_rules(
     career_text = str(user_profile.get("career_aspiration", ""))
     user_skills = user_profile.get("skills", []) or []
 
-    adjusted = []
+    rows = []
     for entry in trimmed:
         idx = entry["index"]
-        score = entry["score"]
-        row = majors_df.iloc[idx]
-
-        min_grade = row.get("min_overall_percentage")
-        if min_grade is not None and not pd.isna(min_grade) and grade_value is not None:
-            try:
-                if float(grade_value) < float(min_grade):
-                    score *= config.GRADE_PENALTY_FACTOR
-            except (TypeError, ValueError):
-                pass
-
-        subject_requirements = row.get("min_grade_requirements", {}) or {}
-        for subject, required_grade in subject_requirements.items():
-            user_grade = user_grades.get(subject)
-            if user_grade is None:
-                continue
-            try:
-                if float(user_grade) < float(required_grade):
-                    score *= config.SUBJECT_GRADE_PENALTY
-            except (TypeError, ValueError):
-                continue
-
-        career_hits = _career_overlap_score(
-            career_text, row.get("example_career_paths", []) + row.get("industry_keywords", [])
-        )
-        if career_hits:
-            score *= min(config.CAREER_BOOST_FACTOR * (1 + 0.05 * (career_hits - 1)), 1.4)
-
-        overlap_sources = []
-        for field in ["curriculum_keywords", "learning_style", "required_hs_subjects"]:
-            value = row.get(field, [])
-            if isinstance(value, list):
-                overlap_sources.extend([str(item) for item in value])
-        overlap_count = _count_overlaps(user_skills, overlap_sources)
-        if overlap_count >= config.SKILL_OVERLAP_THRESHOLD:
-            score *= config.SKILL_BOOST_FACTOR
-
-        adjusted.append(
-            {
-                "major_name": entry["major_name"],
-                "score": score,
-                "index": idx,
-                "skill_overlap": overlap_count,
-                "career_hits": career_hits,
-            }
-        )
+        record = record_cache.get(idx) if record_cache is not None else None
+        if record is None:
+            record = _major_record(_major_row(majors_df, idx), career_text, user_skills)
+            if record_cache is not None:
+                record_cache[idx] = record
+        min_grade, requirements, career_hits, overlap_count = record
+        rows.append(_grade_fails(min_grade, requirements, grade_value, user_grades) + (career_hits, overlap_count))
+    columns = np.array(rows, dtype=np.int64).reshape(len(rows), 4)
+    return {
+        "index": np.array([entry["index"] for entry in trimmed], dtype=np.int64),
+        "major_name": [entry["major_name"] for entry in trimmed],
+        "score": np.array([entry["score"] for entry in trimmed], dtype=np.float64),
+        "overall_fail": columns[:, 0],
+        "subject_fails": columns[:, 1],
+        "career_hits": columns[:, 2],
+        "skill_overlap": columns[:, 3],
+    }
 
-    adjusted.sort(key=lambda item: item["score"], reverse=True)
-    return adjusted
 
+def _weight_array(weights: List[Dict[str, float]], key: str, ndim: int) -> np.ndarray:
+    values = np.array([float(w[key]) for w in weights], dtype=np.float64)
+    return values.reshape((len(weights),) + (1,) * ndim)
 
-def build_reason(entry: Dict[str, object], user_profile: Dict[str, object], majors_df: pd.DataFrame) -> str:
-    """Craft a short explanation for why a major was suggested."""
 
-    idx = entry.get("index")
-    row = majors_df.iloc[idx] if idx is not None and not majors_df.empty else {}
-    matched_skills = entry.get("skill_overlap", 0)
-    career_hits = entry.get("career_hits", 0)
+def rule_factor_parts(features: Dict[str, np.ndarray], weights: List[Dict[str, float]]) -> Dict[str, np.ndarray]:
+    """The multiplier of each rule, shape (variants, *features.shape), keyed by rule name.
+
+    Their product, in this order, is ``rule_factors``.
+    """
+
+    overall_fail = np.asarray(features["overall_fail"])[None, ...]
+    subject_fails = np.asarray(features["subject_fails"])[None, ...]
+    career_hits = np.asarray(features["career_hits"])[None, ...]
+    skill_overlap = np.asarray(features["skill_overlap"])[None, ...]
+    ndim = overall_fail.ndim - 1
+
+    def weight(key: str) -> np.ndarray:
+        return _weight_array(weights, key, ndim)
+
+    career_boost = np.minimum(
+        weight("CAREER_BOOST_FACTOR") * (1 + 0.05 * (career_hits - 1)),
+        weight("CAREER_BOOST_CAP"),
+    )
+    skill_hit = skill_overlap >= weight("SKILL_OVERLAP_THRESHOLD")
+    return {
+        "grade_penalty": np.where(overall_fail > 0, weight("GRADE_PENALTY_FACTOR"), 1.0),
+        "subject_penalty": weight("SUBJECT_GRADE_PENALTY") ** subject_fails,
+        "career_boost": np.where(career_hits > 0, career_boost, 1.0),
+        "skill_boost": np.where(skill_hit, weight("SKILL_BOOST_FACTOR"), 1.0),
+    }
+
+
+def rule_factors(features: Dict[str, np.ndarray], weights: List[Dict[str, float]]) -> np.ndarray:
+    """Combined rule multiplier of every weight set, shape (variants, *features.shape).
+
+    All variants are evaluated in one broadcast over the feature arrays, which
+    may have any shape (one profile, or stacked profiles). ``RULES_TOP_N`` is
+    not applied here; see ``rule_multipliers``.
+    """
+
+    parts = rule_factor_parts(features, weights)
+    multipliers = parts["grade_penalty"] * parts["subject_penalty"]
+    multipliers = multipliers * parts["career_boost"]
+    return multipliers * parts["skill_boost"]
+
+
+def rule_multipliers(features: Dict[str, np.ndarray], weights: List[Dict[str, float]]) -> np.ndarray:
+    """Like ``rule_factors``, with ``nan`` for majors beyond a variant's ``RULES_TOP_N``.
+
+    The last feature axis is the rank position; masked majors are not ranked.
+    """
+
+    multipliers = rule_factors(features, weights)
+    positions = np.arange(multipliers.shape[-1])
+    top_n = _weight_array(weights, "RULES_TOP_N", multipliers.ndim - 1)
+    return np.where(positions < top_n, multipliers, np.nan)
+
+
+def rank_adjusted(features: Dict[str, np.ndarray], multipliers: np.ndarray) -> List[Dict[str, object]]:
+    """Build the sorted ``apply_rules`` output for one row of ``rule_multipliers``."""
+
+    keep = np.flatnonzero(~np.isnan(multipliers))
+    scores = features["score"][keep] * multipliers[keep]
+    order = keep[np.argsort(-scores, kind="stable")]
+    adjusted_scores = features["score"] * np.nan_to_num(multipliers)
+    return [
+        {
+            "major_name": features["major_name"][pos],
+            "score": float(adjusted_scores[pos]),
+            "index": int(features["index"][pos]),
+            "skill_overlap": int(features["skill_overlap"][pos]),
+            "career_hits": int(features["career_hits"][pos]),
+        }
+        for pos in order
+    ]
+
+
+def apply_rule_variants(
+    features: Dict[str, np.ndarray],
+    variants: Dict[str, Dict[str, float]],
+) -> Dict[str, List[Dict[str, object]]]:
+    """Apply several named weight sets to the same features in one pass."""
+
+    names = list(variants)
+    multipliers = rule_multipliers(features, [variants[name] for name in names])
+    return {name: rank_adjusted(features, multipliers[i]) for i, name in enumerate(names)}
+
+
+def apply_rules(
+    ranked_majors: List[Dict[str, object]],
+    user_profile: Dict[str, object],
+    majors_df: Majors,
+    top_n: int = config.RULES_TOP_N,
+    weights: Optional[Dict[str, float]] = None,
+    record_cache: Optional[Dict[int, tuple]] = None,
+):
+    """Apply simple domain rules to the top ranked majors.
+
+    ``weights`` defaults to the current ``config`` values; ``top_n`` always
+    limits how many majors are considered. ``record_cache`` is passed on to
+    ``compute_rule_features``.
+    """
+
+    weights = dict(weights or base_weights(), RULES_TOP_N=top_n)
+    features = compute_rule_features(
+        ranked_majors, user_profile, majors_df, top_n=top_n, record_cache=record_cache
+    )
+    return rank_adjusted(features, rule_multipliers(features, [weights])[0])
+
+
+def subjects_highlight(subjects: object) -> Optional[str]:
+    """The ``Key subjects: ...`` part of a reason, or ``None`` without subjects."""
+
+    if isinstance(subjects, (list, tuple)) and subjects:
+        return f"Key subjects: {', '.join(s.title() for s in subjects)}"
+    return None
+
+
+def reason_text(skill_overlap: int, career_hits: int, subjects: Optional[str]) -> str:
+    """Join the reason highlights; ``subjects`` comes from ``subjects_highlight``."""
 
     highlights = []
-    if matched_skills:
+    if skill_overlap:
         highlights.append(
-            f"Matched {matched_skills} of your skills with the major's curriculum"
+            f"Matched {skill_overlap} of your skills with the major's curriculum"
         )
     if career_hits:
         highlights.append("Career aspiration closely aligns with example paths")
-    if isinstance(row, pd.Series):
-        subjects = row.get("required_hs_subjects", [])
-        if subjects:
-            highlights.append(f"Key subjects: {', '.join(s.title() for s in subjects)}")
+    if subjects:
+        highlights.append(subjects)
 
     if not highlights:
         highlights.append("Strong textual similarity to your interests and profile")
@@ -134,6 +275,18 @@ def build_reason(entry: Dict[str, object], user_profile: Dict[str, object], majo
     return "; ".join(highlights)
 
 
+def build_reason(entry: Dict[str, object], user_profile: Dict[str, object], majors_df: Majors) -> str:
+    """Craft a short explanation for why a major was suggested."""
+
+    idx = entry.get("index")
+    row = _major_row(majors_df, idx) if idx is not None and len(majors_df) else {}
+    return reason_text(
+        entry.get("skill_overlap", 0),
+        entry.get("career_hits", 0),
+        subjects_highlight(row.get("required_hs_subjects", [])),
+    )
+
+
 def generate_recommendation_report(
     top_major: Dict[str, object],
     user_profile: Dict[str, object],
@@ -171,4 +324,16 @@ def generate_recommendation_report(
     }
 
 
-__all__ = ["apply_rules", "generate_recommendation_report", "build_reason"]
+__all__ = [
+    "apply_rules",
+    "apply_rule_variants",
+    "compute_rule_features",
+    "rule_factor_parts",
+    "rule_factors",
+    "rule_multipliers",
+    "rank_adjusted",
+    "generate_recommendation_report",
+    "build_reason",
+    "reason_text",
+    "subjects_highlight",
+]
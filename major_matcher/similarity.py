@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from . import config
+from .neighbours import build_neighbour_table
+from .term_cache import TermCache, profile_values
 from .text_clean import clean_text, combine_and_clean
+from .user_profile import profile_text
+from .vocabulary import CompactVocabulary
 
 
 def _row_to_text(row: pd.Series) -> str:
@@ -33,36 +41,271 @@ def _row_to_text(row: pd.Series) -> str:
     return combine_and_clean(parts)
 
 
-def vectorize_majors(majors_df: pd.DataFrame) -> Dict[str, object]:
-    """Create TF-IDF vectors for the majors corpus."""
+def _field_to_text(row, field: str) -> str:
+    value = row.get(field, "")
+    if isinstance(value, list):
+        return combine_and_clean([str(item) for item in value])
+    if isinstance(value, str):
+        return combine_and_clean([value])
+    return ""
+
+
+class StackedFieldVectorizer:
+    """One TF-IDF vectorizer per majors field, outputs stacked side by side.
+
+    ``transform`` maps the same user text through every field vocabulary, so a
+    single sparse product against the stacked majors matrix yields the
+    per-field cosine similarities, each L2-normalized within its block.
+    """
+
+    def __init__(self, vectorizers: Dict[str, TfidfVectorizer]) -> None:
+        self.vectorizers = vectorizers
+        self.field_slices: Dict[str, Tuple[int, int]] = {}
+        start = 0
+        for field, vectorizer in vectorizers.items():
+            stop = start + len(vectorizer.vocabulary_)
+            self.field_slices[field] = (start, stop)
+            start = stop
+        self.n_features = start
+
+    def transform(self, texts: List[str]):
+        blocks = [vectorizer.transform(texts) for vectorizer in self.vectorizers.values()]
+        return sparse.hstack(blocks, format="csr")
+
+
+def _fit_field_index(majors_df: pd.DataFrame, make_vectorizer, compact: bool):
+    vectorizers: Dict[str, TfidfVectorizer] = {}
+    blocks = []
+    for field in config.FIELD_WEIGHTS:
+        corpus = [_field_to_text({field: value}, field) for value in majors_df.get(field, [""] * len(majors_df))]
+        vectorizer = make_vectorizer(len(corpus))
+        try:
+            block = vectorizer.fit_transform(corpus)
+        except ValueError:
+            # Empty vocabulary, e.g. a field missing from the catalog.
+            continue
+        if compact:
+            block = _compact_matrix(block)
+            _compact_vectorizer(vectorizer)
+        vectorizers[field] = vectorizer
+        blocks.append(block)
+    if not blocks:
+        raise ValueError("No majors field produced any terms.")
+    stacked = sparse.hstack(blocks, format="csr")
+    if compact:
+        stacked = _compact_matrix(stacked)
+    return StackedFieldVectorizer(vectorizers), stacked
+
+
+def field_weight_columns(vectors: Dict[str, object]) -> Tuple[np.ndarray, float]:
+    """Per-column weights from ``config.FIELD_WEIGHTS`` and their total.
+
+    Cached on the index and recomputed only when the configured weights change.
+    """
+
+    key = tuple(sorted(config.FIELD_WEIGHTS.items()))
+    cached = vectors.get("field_weight_cache")
+    if cached is not None and cached[0] == key:
+        return cached[1], cached[2]
+
+    vectorizer: StackedFieldVectorizer = vectors["vectorizer"]
+    columns = np.zeros(vectorizer.n_features, dtype=np.float64)
+    total = 0.0
+    for field, (start, stop) in vectorizer.field_slices.items():
+        weight = float(config.FIELD_WEIGHTS.get(field, 0.0))
+        columns[start:stop] = weight
+        total += weight
+    total = total or 1.0
+    vectors["field_weight_cache"] = (key, columns, total)
+    return columns, total
+
+
+def _weight_user_rows(user_matrix, vectors: Dict[str, object]):
+    columns, total = field_weight_columns(vectors)
+    user_matrix = user_matrix.tocsr(copy=True)
+    user_matrix.data = user_matrix.data * (columns[user_matrix.indices] / total)
+    return user_matrix
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _normalize_sparse_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def _fit_lsa(majors_matrix) -> Optional[Dict[str, np.ndarray]]:
+    n_components = min(config.LSA_COMPONENTS, majors_matrix.shape[0] - 1, majors_matrix.shape[1] - 1)
+    if n_components < 1:
+        return None
+    svd = TruncatedSVD(n_components=n_components, random_state=config.LSA_RANDOM_STATE)
+    embeddings = _normalize_rows(svd.fit_transform(majors_matrix))
+    return {
+        # (n_features x d): user TF-IDF rows are projected with one small multiply.
+        "projection": np.ascontiguousarray(svd.components_.T, dtype=np.float32),
+        # (n_majors x d), L2-normalized so cosine similarity is a plain dot product.
+        "embeddings": np.ascontiguousarray(embeddings, dtype=np.float32),
+    }
+
+
+def _compact_vectorizer(vectorizer: TfidfVectorizer) -> TfidfVectorizer:
+    vectorizer.vocabulary_ = CompactVocabulary(vectorizer.vocabulary_)
+    # Pruned terms are kept only for introspection and can dwarf the vocabulary.
+    vectorizer.stop_words_ = None
+    return vectorizer
+
+
+def _compact_matrix(matrix):
+    matrix = matrix.astype(np.float32).tocsr()
+    matrix.indices = matrix.indices.astype(np.int32, copy=False)
+    matrix.indptr = matrix.indptr.astype(np.int32, copy=False)
+    return matrix
+
+
+def vectorize_majors(
+    majors_df: pd.DataFrame,
+    mode: Optional[str] = None,
+    compact: Optional[bool] = None,
+) -> Dict[str, object]:
+    """Create TF-IDF vectors for the majors corpus.
+
+    ``mode="lsa"`` additionally fits a truncated SVD and stores a dense,
+    contiguous float32 embedding per major plus the projection for user vectors.
+    ``mode="fields"`` fits one TF-IDF block per field in ``config.FIELD_WEIGHTS``
+    and stacks them horizontally; weights are applied when scoring.
+    ``compact=True`` builds a float32/int32 matrix over a document-frequency
+    pruned vocabulary held in a ``CompactVocabulary``. Both default to
+    ``config.INDEX_MODE`` / ``config.INDEX_COMPACT``.
+    """
+
+    mode = mode or config.INDEX_MODE
+    compact = config.INDEX_COMPACT if compact is None else compact
+    if mode not in ("sparse", "lsa", "fields"):
+        raise ValueError(f"Unknown index mode: {mode}")
 
     if majors_df.empty:
-        return {"vectorizer": TfidfVectorizer(stop_words="english", ngram_range=(1, 2)), "matrix": None}
+        return {
+            "vectorizer": TfidfVectorizer(stop_words="english", ngram_range=(1, 2)),
+            "matrix": None,
+            "mode": "sparse",
+        }
+
+    def make_vectorizer(n_docs: int) -> TfidfVectorizer:
+        if compact:
+            return TfidfVectorizer(
+                stop_words="english",
+                ngram_range=(1, 2),
+                min_df=min(config.COMPACT_MIN_DF, n_docs),
+                max_features=config.COMPACT_MAX_FEATURES,
+                dtype=np.float32,
+            )
+        return TfidfVectorizer(stop_words="english", ngram_range=(1, 2))
 
-    text_corpus = majors_df.apply(_row_to_text, axis=1).tolist()
-    vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2))
-    majors_matrix = vectorizer.fit_transform(text_corpus)
-    return {"vectorizer": vectorizer, "matrix": majors_matrix}
+    if mode == "fields":
+        vectorizer, majors_matrix = _fit_field_index(majors_df, make_vectorizer, compact)
+    else:
+        text_corpus = majors_df.apply(_row_to_text, axis=1).tolist()
+        vectorizer = make_vectorizer(len(text_corpus))
+        majors_matrix = vectorizer.fit_transform(text_corpus)
+        if compact:
+            majors_matrix = _compact_matrix(majors_matrix)
+            _compact_vectorizer(vectorizer)
+    vectors: Dict[str, object] = {
+        "vectorizer": vectorizer,
+        "matrix": majors_matrix,
+        "mode": "fields" if mode == "fields" else "sparse",
+        "compact": compact,
+    }
+    if "major_id" in majors_df.columns:
+        vectors["major_ids"] = {str(major_id): row for row, major_id in enumerate(majors_df["major_id"])}
+    if config.NEIGHBOUR_TOP_N:
+        # Field blocks are unit-length each; renormalize rows so neighbours use cosine.
+        neighbour_matrix = majors_matrix if mode != "fields" else _normalize_sparse_rows(majors_matrix)
+        vectors["neighbours"] = build_neighbour_table(neighbour_matrix)
+    if mode == "lsa":
+        lsa = _fit_lsa(majors_matrix)
+        if lsa is not None:
+            vectors.update(lsa, mode="lsa")
+    return vectors
 
 
-def vectorize_user_profile(user_profile: Dict[str, object], vectorizer: TfidfVectorizer):
-    """Vectorize the user profile using the fitted vectorizer."""
+def vectorize_user_profile(
+    user_profile: Dict[str, object],
+    vectorizer: TfidfVectorizer,
+    term_cache: Optional[TermCache] = None,
+):
+    """Vectorize the user profile using the fitted vectorizer.
 
-    skills = user_profile.get("skills", []) or []
-    hobbies = user_profile.get("hobbies", []) or []
-    aspiration = user_profile.get("career_aspiration", "")
-    stream = user_profile.get("stream") or ""
+    With a ``term_cache`` the vector is assembled from precomputed term counts
+    of the canonical skills, hobbies and stream; only unknown values and the
+    aspiration are analyzed, and the result matches ``vectorizer.transform``.
+    """
 
-    combined_text = combine_and_clean([
-        aspiration,
-        " ".join(skills),
-        " ".join(hobbies),
-        stream,
-    ])
+    if term_cache is not None:
+        return term_cache.to_vector(term_cache.sequence_counts(profile_values(user_profile)))
 
+    combined_text = profile_text(user_profile)
     return vectorizer.transform([combined_text]) if combined_text else vectorizer.transform([""])
 
 
+def project_user_vector(user_vector, projection: np.ndarray) -> np.ndarray:
+    """Project TF-IDF user rows into the LSA space and L2-normalize them."""
+
+    user_vector = user_vector.tocsr()
+    projected = np.zeros((user_vector.shape[0], projection.shape[1]), dtype=np.float32)
+    for row in range(user_vector.shape[0]):
+        start, end = user_vector.indptr[row], user_vector.indptr[row + 1]
+        # Only the rows of the projection for terms present in the profile are touched.
+        weights = user_vector.data[start:end].astype(np.float32)
+        projected[row] = weights @ projection[user_vector.indices[start:end]]
+    return _normalize_rows(projected)
+
+
+def score_majors(user_vector, vectors: Dict[str, object]) -> np.ndarray:
+    """Return one similarity score per major for a single user vector."""
+
+    mode = vectors.get("mode")
+    if mode == "lsa":
+        projected = project_user_vector(user_vector, vectors["projection"])
+        return vectors["embeddings"] @ projected[0]
+    if mode == "fields":
+        weighted = _weight_user_rows(user_vector, vectors)
+        return np.asarray((vectors["matrix"] @ weighted.T).todense()).ravel()
+    return cosine_similarity(user_vector, vectors["matrix"])[0]
+
+
+def score_majors_batch(user_matrix, vectors: Dict[str, object]) -> np.ndarray:
+    """Score many user rows at once, returning a dense (users x majors) array."""
+
+    mode = vectors.get("mode")
+    if mode == "lsa":
+        projected = project_user_vector(user_matrix, vectors["projection"])
+        return projected @ vectors["embeddings"].T
+    if mode == "fields":
+        user_matrix = _weight_user_rows(user_matrix, vectors)
+    return np.asarray((user_matrix @ vectors["matrix"].T).todense())
+
+
+def rank_scores(similarities: np.ndarray, majors_df: pd.DataFrame) -> List[Dict[str, object]]:
+    """Turn a score array into the ranked ``{"major_name", "score", "index"}`` list."""
+
+    if "major_name" in majors_df.columns:
+        names = majors_df["major_name"].tolist()
+    else:
+        names = [f"Major {idx}" for idx in range(len(majors_df))]
+    ranked = [
+        {"major_name": names[idx], "score": float(score), "index": idx}
+        for idx, score in enumerate(similarities)
+    ]
+    ranked.sort(key=lambda item: item["score"], reverse=True)
+    return ranked
+
+
 def compute_similarity_scores(user_vector, majors_matrix, majors_df: pd.DataFrame) -> List[Dict[str, object]]:
     """Compute cosine similarity and return sorted results."""
 
@@ -70,12 +313,17 @@ def compute_similarity_scores(user_vector, majors_matrix, majors_df: pd.DataFram
         return []
 
     similarities = cosine_similarity(user_vector, majors_matrix)[0]
-    ranked = []
-    for idx, score in enumerate(similarities):
-        major_name = majors_df.iloc[idx].get("major_name", f"Major {idx}")
-        ranked.append({"major_name": major_name, "score": float(score), "index": idx})
-    ranked.sort(key=lambda item: item["score"], reverse=True)
-    return ranked
+    return rank_scores(similarities, majors_df)
 
 
-__all__ = ["vectorize_majors", "vectorize_user_profile", "compute_similarity_scores"]
+__all__ = [
+    "vectorize_majors",
+    "vectorize_user_profile",
+    "compute_similarity_scores",
+    "project_user_vector",
+    "score_majors",
+    "score_majors_batch",
+    "field_weight_columns",
+    "StackedFieldVectorizer",
+    "rank_scores",
+]
@@ -0,0 +1,210 @@
+"""NumPy-only serving runtime for exported indexes.
+
+Scoring only needs what ``index_io.save_index`` writes: the vocabulary, the
+IDF weights, the analyzer settings and the majors matrix. ``SlimIndex``
+reads that artifact with ``numpy.load``. It reproduces
+``TfidfVectorizer.transform`` for word analyzers: lowercasing, the token
+pattern, stop-word removal, n-grams, sublinear tf, IDF and normalization. It
+then scores with cosine similarity against a column-major copy of the
+matrix. ``SlimRecommender`` adds the normalized majors records and the rule
+pass. Neither one imports scikit-learn, SciPy or pandas, so a worker starts
+faster and the serving image can leave them out.
+``tests/test_slim.py`` checks the results against ``recommend``.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import config
+from .data_loader import majors_digest, normalize_major_record, resolve_majors_path
+from .experiments import resolve_weights
+from .rules import apply_rule_variants, build_reason, compute_rule_features
+from .text_clean import provide_stop_words
+from .user_profile import profile_text
+from .vocabulary import CompactVocabulary
+
+# Must match ``index_io.INDEX_FORMAT_VERSION``, which imports scikit-learn.
+SLIM_INDEX_FORMAT_VERSION = 1
+
+
+def read_slim_arrays(path: str | Path) -> Dict[str, object]:
+    """Raw arrays and metadata of an exported index, read without SciPy."""
+
+    with np.load(Path(path), allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    meta = json.loads(str(arrays.pop("meta")))
+    if meta.get("format_version") != SLIM_INDEX_FORMAT_VERSION:
+        raise ValueError(f"Unsupported index format: {meta.get('format_version')}")
+    arrays["meta"] = meta
+    return arrays
+
+
+class SlimIndex:
+    """Analyzer, IDF and majors matrix of an exported ``sparse`` or ``lsa`` index."""
+
+    def __init__(self, arrays: Dict[str, object]) -> None:
+        meta = arrays["meta"]
+        if meta.get("fields"):
+            raise ValueError("The slim runtime does not support field-weighted indexes.")
+        settings = meta["analyzer"]
+        self.mode = meta["mode"]
+        self.source = meta.get("source")
+        self.lowercase = bool(settings["lowercase"])
+        self.token_pattern = re.compile(settings["token_pattern"])
+        self.ngram_range = tuple(settings["ngram_range"])
+        self.stop_words = frozenset(settings["stop_words"] or ())
+        self.norm = settings["norm"]
+        self.sublinear_tf = bool(settings["sublinear_tf"])
+
+        terms = arrays["terms"].tolist()
+        vocabulary = {term: column for column, term in enumerate(terms)}
+        self.vocabulary = CompactVocabulary(vocabulary) if meta.get("compact") else vocabulary
+        self.idf = np.asarray(arrays["idf"], dtype=np.float64) if settings["use_idf"] else None
+
+        n_majors, n_features = (int(size) for size in arrays["matrix_shape"])
+        self.n_majors = n_majors
+        data = np.asarray(arrays["matrix_data"], dtype=np.float64)
+        indices = np.asarray(arrays["matrix_indices"], dtype=np.int64)
+        rows = np.repeat(np.arange(n_majors, dtype=np.int64), np.diff(arrays["matrix_indptr"]))
+        # Column-major copy: a profile only touches the columns of its own terms.
+        order = np.argsort(indices, kind="stable")
+        self._column_rows = rows[order]
+        self._column_data = data[order]
+        self._column_ptr = np.zeros(n_features + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=n_features), out=self._column_ptr[1:])
+        row_norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=n_majors))
+        row_norms[row_norms == 0] = 1.0
+        self._row_norms = row_norms
+
+        self.projection = arrays.get("projection") if self.mode == "lsa" else None
+        self.embeddings = arrays.get("embeddings") if self.mode == "lsa" else None
+        if self.mode == "lsa" and (self.projection is None or self.embeddings is None):
+            raise ValueError("LSA index is missing its projection or embeddings.")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SlimIndex":
+        return cls(read_slim_arrays(path))
+
+    def analyze(self, text: str) -> List[str]:
+        """Terms of ``text`` as ``TfidfVectorizer.build_analyzer()`` produces them."""
+
+        if self.lowercase:
+            text = text.lower()
+        tokens = self.token_pattern.findall(text)
+        if self.stop_words:
+            tokens = [token for token in tokens if token not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            terms.extend(" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def transform(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted columns and TF-IDF weights of ``text``: one row of ``transform``."""
+
+        counts: Dict[int, int] = {}
+        for term in self.analyze(text):
+            column = self.vocabulary.get(term)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+        columns = np.array(sorted(counts), dtype=np.int64)
+        weights = np.array([counts[column] for column in columns.tolist()], dtype=np.float64)
+        if self.sublinear_tf:
+            weights = np.log(weights) + 1.0
+        if self.idf is not None:
+            weights *= self.idf[columns]
+        if self.norm == "l2":
+            norm = np.sqrt(np.dot(weights, weights))
+        elif self.norm == "l1":
+            norm = np.abs(weights).sum()
+        else:
+            norm = 0.0
+        if norm > 0:
+            weights /= norm
+        return columns, weights
+
+    def score(self, columns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Cosine similarity of one transformed profile to every major."""
+
+        if self.mode == "lsa":
+            projected = weights.astype(np.float32) @ self.projection[columns]
+            norm = np.linalg.norm(projected)
+            return self.embeddings @ (projected / (norm if norm else 1.0))
+
+        starts = self._column_ptr[columns]
+        lengths = self._column_ptr[columns + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(self.n_majors, dtype=np.float64)
+        first = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - first, lengths) + np.arange(total)
+        values = self._column_data[positions] * np.repeat(weights, lengths)
+        scores = np.bincount(self._column_rows[positions], weights=values, minlength=self.n_majors)
+        user_norm = np.sqrt(np.dot(weights, weights)) or 1.0
+        return scores / self._row_norms / user_norm
+
+
+class SlimRecommender:
+    """``recommend`` over a ``SlimIndex`` and the catalog's normalized major records."""
+
+    def __init__(self, index: SlimIndex, majors: List[Dict[str, object]]) -> None:
+        if index.n_majors != len(majors):
+            raise ValueError(f"Index has {index.n_majors} majors, the catalog {len(majors)}.")
+        self.index = index
+        self.majors = majors
+        self.names = [str(major.get("major_name", "")) for major in majors]
+        # Vectorizers are fitted with stop_words="english", the list rules tokenize with.
+        provide_stop_words(index.stop_words)
+
+    @classmethod
+    def load(
+        cls,
+        majors_path: str | Path | None = None,
+        index_path: str | Path | None = None,
+    ) -> "SlimRecommender":
+        """Load a catalog's majors file and the index ``scripts/build_index.py`` saved next to it."""
+
+        majors_path = Path(majors_path) if majors_path else config.MAJORS_PATH
+        index_path = Path(index_path) if index_path else majors_path.with_name(config.CATALOG_INDEX_FILENAME)
+        if not index_path.exists():
+            raise FileNotFoundError(f"No exported index at {index_path}; run scripts/build_index.py.")
+        source = resolve_majors_path(majors_path)
+        if source is None:
+            raise FileNotFoundError(f"No majors file at {majors_path}.")
+        index = SlimIndex.load(index_path)
+        if (index.source or {}).get("majors_sha256") != majors_digest(source):
+            raise ValueError(f"{index_path} was not built from {source}; run scripts/build_index.py.")
+        records = json.loads(source.read_text(encoding="utf-8"))
+        return cls(index, [normalize_major_record(record) for record in records])
+
+    def recommend(self, user_data: Dict[str, object], variant: Optional[str] = None) -> List[Dict[str, object]]:
+        """Same results as ``major_matcher.recommend`` for a normalized profile."""
+
+        weights = resolve_weights(variant)
+        top_n = int(weights["RULES_TOP_N"])
+        scores = self.index.score(*self.index.transform(profile_text(user_data)))
+        ranked = [
+            {"major_name": self.names[idx], "score": float(scores[idx]), "index": idx}
+            for idx in np.argsort(-scores, kind="stable")[:top_n].tolist()
+        ]
+        features = compute_rule_features(ranked, user_data, self.majors, top_n=top_n)
+        adjusted = apply_rule_variants(features, {"served": weights})["served"]
+        return [
+            {
+                "major_name": entry["major_name"],
+                "score": float(entry["score"]),
+                "reason": build_reason(entry, user_data, self.majors),
+            }
+            for entry in adjusted[: config.RETURN_TOP_K]
+        ]
+
+
+__all__ = ["SlimIndex", "SlimRecommender", "read_slim_arrays", "SLIM_INDEX_FORMAT_VERSION"]
@@ -0,0 +1,283 @@
+"""Incremental, low-memory loader for large majors catalogs.
+
+``load_majors_data`` parses the whole file with ``json.loads`` before building a
+DataFrame. This module instead scans the top-level JSON array one record at a
+time, normalizes each record as soon as it is decoded and appends it to
+columnar buffers, so peak memory stays close to the size of the final columns.
+Malformed records are reported with their position and skipped.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import normalize_major_record, resolve_majors_path
+
+RecordError = Dict[str, object]
+
+_STRUCTURAL = re.compile(r'[\[\]{}",]')
+_STRING_END = re.compile(r'["\\]')
+_NON_WHITESPACE = re.compile(r"\S")
+
+
+def _value_end(buf: str, pos: int) -> Optional[int]:
+    """Return the index just past the array element starting at ``pos``.
+
+    Only brackets and strings are tracked, so the element itself does not need
+    to be valid JSON. Returns ``None`` when the buffer ends before the element.
+    """
+
+    depth = 0
+    i = pos
+    while True:
+        match = _STRUCTURAL.search(buf, i)
+        if match is None:
+            return None
+        char = match.group()
+        i = match.end()
+        if char == '"':
+            while True:
+                end = _STRING_END.search(buf, i)
+                if end is None:
+                    return None
+                if end.group() == "\\":
+                    i = end.end() + 1
+                    continue
+                i = end.end()
+                break
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            if depth == 0:
+                return match.start()
+            depth -= 1
+            if depth == 0:
+                return i
+        elif depth == 0:
+            return match.start()
+
+
+def iter_major_records(
+    json_path: str | Path,
+    chunk_chars: int = 1 << 20,
+) -> Iterator[Tuple[int, int, int, Optional[Dict[str, object]], Optional[str]]]:
+    """Yield ``(index, offset, line, record, error)`` for each array element.
+
+    ``offset`` is the character offset of the element in the file and ``line``
+    its 1-based line number. Exactly one of ``record`` and ``error`` is set.
+    A file whose top-level value is not an array yields a single error with
+    index ``-1``.
+    """
+
+    with open(json_path, encoding="utf-8") as handle:
+        buf = ""
+        base = 0
+        line = 1
+        line_cursor = 0
+        pos = 0
+
+        def read_more() -> bool:
+            nonlocal buf
+            chunk = handle.read(chunk_chars)
+            if not chunk:
+                return False
+            buf += chunk
+            return True
+
+        def skip_whitespace() -> bool:
+            nonlocal pos
+            while True:
+                match = _NON_WHITESPACE.search(buf, pos)
+                if match is not None:
+                    pos = match.start()
+                    return True
+                pos = len(buf)
+                if not read_more():
+                    return False
+
+        def line_at(target: int) -> int:
+            nonlocal line, line_cursor
+            line += buf.count("\n", line_cursor, target)
+            line_cursor = target
+            return line
+
+        if not skip_whitespace() or buf[pos] != "[":
+            yield -1, base + pos, line_at(pos), None, "top-level value is not a JSON array"
+            return
+        pos += 1
+
+        index = 0
+        while True:
+            if not skip_whitespace():
+                yield index, base + pos, line_at(pos), None, "unexpected end of file"
+                return
+            if buf[pos] == "]" and index == 0:
+                return
+
+            end = _value_end(buf, pos)
+            while end is None and read_more():
+                end = _value_end(buf, pos)
+            if end is None:
+                end = len(buf)
+
+            start_offset, start_line = base + pos, line_at(pos)
+            raw = buf[pos:end]
+            try:
+                record = json.loads(raw)
+            except json.JSONDecodeError as exc:
+                yield index, start_offset, start_line, None, f"invalid JSON: {exc.msg}"
+            else:
+                if isinstance(record, dict):
+                    yield index, start_offset, start_line, record, None
+                else:
+                    yield index, start_offset, start_line, None, "record is not a JSON object"
+            index += 1
+            pos = end
+
+            if not skip_whitespace():
+                yield index, base + pos, line_at(pos), None, "unexpected end of file"
+                return
+            separator = buf[pos]
+            pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                yield index, base + pos - 1, line_at(pos - 1), None, f"expected ',' but found {separator!r}"
+                return
+
+            if pos >= chunk_chars:
+                line_at(pos)
+                buf = buf[pos:]
+                base += pos
+                line_cursor -= pos
+                pos = 0
+
+
+class _ColumnWriter:
+    """Append normalized records straight into per-column buffers."""
+
+    def __init__(self) -> None:
+        self.columns: Dict[str, list] = {}
+        self.overall = array("d")
+        self.rows = 0
+
+    def append(self, record: Dict[str, object]) -> None:
+        for key, value in record.items():
+            if key == "min_overall_percentage":
+                continue
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * self.rows
+            column.append(value)
+        self.rows += 1
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.append(None)
+        self.overall.append(record["min_overall_percentage"])
+
+    def finish(self) -> Dict[str, object]:
+        columns: Dict[str, object] = dict(self.columns)
+        columns["min_overall_percentage"] = np.frombuffer(self.overall, dtype=np.float64)
+        return columns
+
+
+def _normalize_chunk(records: List[Dict[str, object]]) -> List[Tuple[Optional[Dict[str, object]], Optional[str]]]:
+    normalized = []
+    for record in records:
+        try:
+            normalized.append((normalize_major_record(record), None))
+        except Exception as exc:  # pragma: no cover - defensive, reported per record
+            normalized.append((None, f"normalization failed: {exc}"))
+    return normalized
+
+
+def load_majors_columns(
+    json_path: str | Path | None = None,
+    workers: int = 1,
+    chunk_records: int = 2000,
+    chunk_chars: int = 1 << 20,
+) -> Tuple[Dict[str, object], List[RecordError]]:
+    """Stream a majors file into columnar arrays.
+
+    Returns ``(columns, errors)`` where ``columns`` maps field names to lists
+    (``min_overall_percentage`` is a float64 array) and ``errors`` lists the
+    skipped records as ``{"index", "offset", "line", "error"}`` dicts. With
+    ``workers > 1`` records are normalized in chunks on a process pool while
+    parsing continues; at most ``2 * workers`` chunks are in flight.
+    """
+
+    writer = _ColumnWriter()
+    errors: List[RecordError] = []
+    path = resolve_majors_path(json_path)
+    if path is None:
+        return writer.finish(), errors
+
+    def drain(positions, results) -> None:
+        for (index, offset, line), (record, error) in zip(positions, results):
+            if error is not None:
+                errors.append({"index": index, "offset": offset, "line": line, "error": error})
+            else:
+                writer.append(record)
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    in_flight: deque = deque()
+    batch: List[Dict[str, object]] = []
+    positions: List[Tuple[int, int, int]] = []
+
+    def submit() -> None:
+        nonlocal batch, positions
+        if not batch:
+            return
+        if executor is None:
+            drain(positions, _normalize_chunk(batch))
+        else:
+            while len(in_flight) >= 2 * workers:
+                done_positions, future = in_flight.popleft()
+                drain(done_positions, future.result())
+            in_flight.append((positions, executor.submit(_normalize_chunk, batch)))
+        batch, positions = [], []
+
+    try:
+        for index, offset, line, record, error in iter_major_records(path, chunk_chars=chunk_chars):
+            if error is not None:
+                errors.append({"index": index, "offset": offset, "line": line, "error": error})
+                continue
+            batch.append(record)
+            positions.append((index, offset, line))
+            if len(batch) >= chunk_records:
+                submit()
+        submit()
+        while in_flight:
+            done_positions, future = in_flight.popleft()
+            drain(done_positions, future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    errors.sort(key=lambda item: item["index"])
+    return writer.finish(), errors
+
+
+def load_majors_stream(
+    json_path: str | Path | None = None,
+    workers: int = 1,
+    chunk_records: int = 2000,
+) -> Tuple[pd.DataFrame, List[RecordError]]:
+    """Streaming counterpart of ``load_majors_data`` returning ``(frame, errors)``."""
+
+    columns, errors = load_majors_columns(json_path, workers=workers, chunk_records=chunk_records)
+    if not len(columns["min_overall_percentage"]):
+        return pd.DataFrame(), errors
+    return pd.DataFrame(columns), errors
+
+
+__all__ = ["iter_major_records", "load_majors_columns", "load_majors_stream"]
@@ -0,0 +1,167 @@
+"""Synthetic data generators for benchmarks and capacity tests."""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import config
+from .data_loader import load_context
+
+_LIST_FIELDS = ("curriculum_keywords", "example_career_paths", "industry_keywords")
+
+
+def _pseudo_word(number: int) -> str:
+    """Spell ``number`` in letters so it survives ``clean_text`` as one token."""
+
+    letters = []
+    number += 26 * 26
+    while number:
+        number, rem = divmod(number, 26)
+        letters.append("abcdefghijklmnopqrstuvwxyz"[rem])
+    return "zq" + "".join(reversed(letters))
+
+
+def synthetic_majors(
+    n_majors: int,
+    seed: int = 0,
+    base_path: Optional[str | Path] = None,
+    new_terms_per_major: int = 3,
+) -> List[Dict[str, object]]:
+    """Grow the real catalog to ``n_majors`` plausible records.
+
+    Each record starts from a real major, swaps in keywords sampled from the
+    whole catalog and adds a few made-up terms, so the vocabulary keeps growing
+    with the catalog roughly the way a real one would.
+    """
+
+    rng = random.Random(seed)
+    path = Path(base_path) if base_path else config.MAJORS_PATH
+    base_records = json.loads(path.read_text(encoding="utf-8"))
+    pools = {field: [item for record in base_records for item in record.get(field, [])] for field in _LIST_FIELDS}
+    vocabulary_size = max(n_majors * new_terms_per_major // 2, 1)
+
+    records = []
+    for index in range(n_majors):
+        record = dict(base_records[index % len(base_records)])
+        record["major_id"] = f"{record.get('major_id', 'MAJOR')}-{index}"
+        invented = [_pseudo_word(rng.randrange(vocabulary_size)) for _ in range(new_terms_per_major)]
+        if index >= len(base_records):
+            record["major_name"] = f"{record.get('major_name', 'Major')} {invented[0]}"
+        for field in _LIST_FIELDS:
+            own = list(record.get(field, []))
+            borrowed = rng.sample(pools[field], k=min(3, len(pools[field])))
+            record[field] = own[: max(len(own) - 2, 1)] + borrowed
+        record["curriculum_keywords"] = record["curriculum_keywords"] + invented
+        records.append(record)
+    return records
+
+
+def write_synthetic_catalog(path: str | Path, n_majors: int, seed: int = 0) -> Path:
+    """Write ``synthetic_majors(n_majors)`` to ``path`` as a majors JSON file."""
+
+    path = Path(path)
+    path.write_text(json.dumps(synthetic_majors(n_majors, seed=seed), ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+# Subjects of the grade inputs on the science and literary questionnaires.
+STREAM_SUBJECTS: Dict[str, Tuple[str, ...]] = {
+    "science": (
+        "maths", "english", "physics", "chemistry", "biology", "islam",
+        "arabic", "social", "arts", "music", "physical_education",
+    ),
+    "literary": ("maths", "english", "islam", "arabic", "social", "arts", "music", "physical_education"),
+}
+
+# Share of students per letter band; context.txt defines the bands but not the shares.
+BAND_WEIGHTS = {"A": 0.25, "B": 0.3, "C": 0.25, "D": 0.15, "F": 0.05}
+_DEFAULT_BANDS = {"A": (90.0, 100.0), "B": (80.0, 89.0), "C": (70.0, 79.0), "D": (50.0, 69.0), "F": (30.0, 49.0)}
+_BAND_PATTERN = re.compile(r"\b([A-F]):\s*(\d+)\s*-\s*(\d+)%")
+# Share of payloads that set "explain"; the questionnaire pages never send it.
+EXPLAIN_SHARE = 0.0
+
+
+def _listed(entries: Sequence[str]) -> List[str]:
+    # Each context.txt section starts with its prompt ("... (e.g., ...).") rather than an entry.
+    return [entry for entry in entries if "e.g." not in entry and not entry.endswith(".")]
+
+
+def grade_bands(grade_scale: str) -> Dict[str, Tuple[float, float]]:
+    """Letter bands parsed from the context's grading text, with defaults for the rest."""
+
+    bands = dict(_DEFAULT_BANDS)
+    for letter, low, high in _BAND_PATTERN.findall(grade_scale or ""):
+        bands[letter] = (float(low), float(high))
+    return bands
+
+
+def synthetic_profiles(
+    count: int,
+    seed: int = 0,
+    context: Optional[Dict[str, object]] = None,
+    explain_share: float = EXPLAIN_SHARE,
+) -> List[Dict[str, object]]:
+    """Return ``count`` questionnaire payloads shaped like the pages' POST body.
+
+    Skills, hobbies and career aspirations are drawn from the lists in
+    ``context.txt``. A student's level is drawn from its letter bands
+    (weighted by ``BAND_WEIGHTS``), and subject grades scatter around it, with
+    about one in ten left blank. About ``explain_share`` of the payloads also
+    set ``"explain": true``; that draw has its own generator, so the profiles
+    themselves do not depend on the share.
+    """
+
+    rng = random.Random(seed)
+    context = load_context() if context is None else context
+    skills = _listed(context.get("skills", []))
+    hobbies = _listed(context.get("hobbies", []))
+    careers = _listed(context.get("career_aspirations", []))
+    bands = grade_bands(str(context.get("grade_scale", "")))
+    letters = list(BAND_WEIGHTS)
+
+    def sample(values: List[str], low: int, high: int) -> List[str]:
+        return rng.sample(values, min(len(values), rng.randint(low, high))) if values else []
+
+    profiles = []
+    for _ in range(count):
+        stream = rng.choice(sorted(STREAM_SUBJECTS))
+        low, high = bands[rng.choices(letters, weights=[BAND_WEIGHTS[letter] for letter in letters])[0]]
+        level = rng.uniform(low, high)
+        grades = {
+            subject: "" if rng.random() < 0.1 else str(round(min(100.0, max(0.0, rng.gauss(level, 6.0)))))
+            for subject in STREAM_SUBJECTS[stream]
+        }
+        grades["overall"] = str(round(level))
+        chosen_careers = sample(careers, 1, 2) if rng.random() < 0.9 else []
+        profiles.append(
+            {
+                "stream": stream,
+                "grades": grades,
+                "career_aspiration": " or ".join(career.split(" / ")[0] for career in chosen_careers),
+                "skills": sample(skills, 1, 5),
+                "custom_skills": [],
+                "hobbies": sample(hobbies, 1, 4),
+                "custom_hobbies": [],
+            }
+        )
+    if explain_share > 0:
+        explainer = random.Random(f"explain-{seed}")
+        for profile in profiles:
+            if explainer.random() < explain_share:
+                profile["explain"] = True
+    return profiles
+
+
+__all__ = [
+    "BAND_WEIGHTS",
+    "EXPLAIN_SHARE",
+    "STREAM_SUBJECTS",
+    "grade_bands",
+    "synthetic_majors",
+    "synthetic_profiles",
+    "write_synthetic_catalog",
+]
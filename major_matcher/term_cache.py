@@ -0,0 +1,146 @@
+"""Precomputed term counts for canonical profile values.
+
+Skills, hobbies and streams mostly come from fixed lists (the questionnaire
+checkboxes and ``context.txt``). Their raw term counts are computed once when
+the index is built; a user vector is then the sum of those rows plus the
+bigrams that span two neighbouring values, plus an on-the-fly analysis of the
+free-text parts, followed by IDF weighting and L2 normalization. The result
+matches ``vectorizer.transform`` on the concatenated profile text.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from . import config
+from .data_loader import load_questionnaire_options
+from .text_clean import clean_text
+
+# (columns, counts, first token, last token) of one profile value.
+TermEntry = Tuple[np.ndarray, np.ndarray, Optional[str], Optional[str]]
+
+_EMPTY: TermEntry = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64), None, None)
+
+
+class TermCache:
+    """Raw term counts for known profile values, keyed by their profile text."""
+
+    def __init__(self, vectorizer, values: Iterable[str] = ()) -> None:
+        if vectorizer.analyzer != "word" or tuple(vectorizer.ngram_range) != (1, 2):
+            raise ValueError("TermCache supports word unigram+bigram vectorizers only.")
+        self._preprocess = vectorizer.build_preprocessor()
+        self._tokenize = vectorizer.build_tokenizer()
+        self._stop_words = vectorizer.get_stop_words() or frozenset()
+        self._vocabulary = vectorizer.vocabulary_
+        self.idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+        self.dtype = vectorizer.dtype
+        self.n_features = len(self.idf)
+        self.entries: Dict[str, TermEntry] = {}
+        for value in values:
+            if value and value not in self.entries:
+                self.entries[value] = self._analyze(value)
+
+    def _analyze(self, value: str) -> TermEntry:
+        text = clean_text(value)
+        tokens = [tok for tok in self._tokenize(self._preprocess(text)) if tok not in self._stop_words]
+        if not tokens:
+            return _EMPTY
+        counts: Dict[int, float] = {}
+        terms = tokens + [f"{left} {right}" for left, right in zip(tokens, tokens[1:])]
+        for term in terms:
+            column = self._vocabulary.get(term)
+            if column is not None:
+                counts[column] = counts.get(column, 0.0) + 1.0
+        columns = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        return columns, values, tokens[0], tokens[-1]
+
+    def entry(self, value: str) -> TermEntry:
+        """Cached counts for a known value; free text is analyzed on the fly."""
+
+        cached = self.entries.get(value)
+        return cached if cached is not None else self._analyze(value)
+
+    def bigram_column(self, left: Optional[str], right: Optional[str]) -> Optional[int]:
+        if left is None or right is None:
+            return None
+        return self._vocabulary.get(f"{left} {right}")
+
+    def sequence_counts(
+        self,
+        values: List[str],
+        entry: Optional[Callable[[str], TermEntry]] = None,
+    ) -> Dict[int, float]:
+        """Raw term counts of the concatenation of ``values``.
+
+        ``entry`` replaces ``self.entry`` to look values up, e.g. through a
+        caller-side cache of free-text analyses.
+        """
+
+        entry = entry or self.entry
+        counts: Dict[int, float] = {}
+        previous_last: Optional[str] = None
+        for value in values:
+            columns, values_, first, last = entry(value) if value else _EMPTY
+            if first is None:
+                continue
+            for column, count in zip(columns.tolist(), values_.tolist()):
+                counts[column] = counts.get(column, 0.0) + count
+            bridge = self.bigram_column(previous_last, first)
+            if bridge is not None:
+                counts[bridge] = counts.get(bridge, 0.0) + 1.0
+            previous_last = last
+        return counts
+
+    def to_vector(self, counts: Dict[int, float]):
+        """Apply IDF and L2 normalization to raw counts, returning a 1-row CSR matrix."""
+
+        columns = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        order = np.argsort(columns)
+        columns = columns[order]
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))[order] * self.idf[columns]
+        norm = np.sqrt(np.dot(weights, weights))
+        if norm > 0:
+            weights /= norm
+        indptr = np.array([0, len(columns)], dtype=np.int32)
+        return sparse.csr_matrix(
+            (weights.astype(self.dtype), columns, indptr), shape=(1, self.n_features)
+        )
+
+
+def profile_values(user_profile: Dict[str, object]) -> List[str]:
+    """Profile parts in the order ``vectorize_user_profile`` concatenates them."""
+
+    return [
+        str(user_profile.get("career_aspiration", "") or ""),
+        *(user_profile.get("skills", []) or []),
+        *(user_profile.get("hobbies", []) or []),
+        str(user_profile.get("stream") or ""),
+    ]
+
+
+def canonical_values(context: Dict[str, object], extra: Iterable[str] = ()) -> List[str]:
+    """Profile texts worth precomputing: context skills/hobbies plus ``extra``."""
+
+    values = []
+    for item in [*context.get("skills", []), *context.get("hobbies", []), *extra]:
+        cleaned = clean_text(item)
+        if cleaned:
+            values.append(cleaned)
+    return values
+
+
+def build_term_cache(vectors: Dict[str, object], context: Dict[str, object]) -> Optional[TermCache]:
+    """Precompute counts for context/questionnaire skills, hobbies and streams."""
+
+    if vectors.get("matrix") is None or vectors.get("mode") == "fields":
+        return None
+    options = load_questionnaire_options()
+    extra = [*options["skills"], *options["hobbies"], *config.CANONICAL_STREAMS]
+    return TermCache(vectors["vectorizer"], canonical_values(context, extra))
+
+
+__all__ = ["TermCache", "build_term_cache", "profile_values", "canonical_values"]
@@ -3,9 +3,7 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable, List, Set
-
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from typing import FrozenSet, Iterable, List, Optional
 
 ACRONYM_MAP = {
     "ai": "artificial intelligence",
@@ -38,6 +36,31 @@ PUNCT_PATTERN = re.compile(r"[^a-z\s]")
 SEPARATOR_PATTERN = re.compile(r"[\/_-]+")
 WHITESPACE_PATTERN = re.compile(r"\s+")
 
+_STOP_WORDS: Optional[FrozenSet[str]] = None
+
+
+def english_stop_words() -> FrozenSet[str]:
+    """scikit-learn's English stop words, imported on first use."""
+
+    global _STOP_WORDS
+    if _STOP_WORDS is None:
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+        _STOP_WORDS = frozenset(ENGLISH_STOP_WORDS)
+    return _STOP_WORDS
+
+
+def provide_stop_words(words: Iterable[str]) -> None:
+    """Supply the English stop-word list so ``tokenize`` need not import scikit-learn.
+
+    Used by the slim runtime with the list stored in an exported index; a list
+    that is already loaded is kept.
+    """
+
+    global _STOP_WORDS
+    if _STOP_WORDS is None:
+        _STOP_WORDS = frozenset(words)
+
 
 def _expand_acronyms(text: str) -> str:
     def replacer(match: re.Match[str]) -> str:
@@ -66,7 +89,7 @@ def tokenize(text: str, *, drop_stopwords: bool = True) -> List[str]:
     cleaned = clean_text(text)
     tokens = cleaned.split()
     if drop_stopwords:
-        stopwords: Set[str] = set(ENGLISH_STOP_WORDS)
+        stopwords = english_stop_words()
         tokens = [tok for tok in tokens if tok not in stopwords]
     return tokens
 
@@ -76,4 +99,11 @@ def combine_and_clean(parts: Iterable[str]) -> str:
     return " ".join(part for part in cleaned_parts if part)
 
 
-__all__ = ["clean_text", "tokenize", "combine_and_clean", "ACRONYM_MAP"]
+__all__ = [
+    "clean_text",
+    "tokenize",
+    "combine_and_clean",
+    "english_stop_words",
+    "provide_stop_words",
+    "ACRONYM_MAP",
+]
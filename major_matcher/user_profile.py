@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 import re
-from functools import lru_cache
+import threading
 from typing import Dict, List, Optional
 
 from .data_loader import load_context
 from .subject_normalization import normalize_subject
-from .text_clean import clean_text
+from .text_clean import clean_text, combine_and_clean
 
 
 def _combine_entries(selected: List[str] | None, custom: List[str] | None) -> List[str]:
@@ -19,30 +19,45 @@ def _combine_entries(selected: List[str] | None, custom: List[str] | None) -> Li
     return combined
 
 
-@lru_cache(maxsize=1)
+_CONTEXT_TERMS: Optional[Dict[str, set]] = None
+_CONTEXT_TERMS_LOCK = threading.Lock()
+
+
 def _context_terms() -> Dict[str, set]:
-    context = load_context()
-    return {
-        "skills": {item.lower() for item in context.get("skills", [])},
-        "hobbies": {item.lower() for item in context.get("hobbies", [])},
-    }
+    global _CONTEXT_TERMS
+    if _CONTEXT_TERMS is None:
+        with _CONTEXT_TERMS_LOCK:
+            if _CONTEXT_TERMS is None:
+                context = load_context()
+                _CONTEXT_TERMS = {
+                    "skills": {item.lower() for item in context.get("skills", [])},
+                    "hobbies": {item.lower() for item in context.get("hobbies", [])},
+                }
+    return _CONTEXT_TERMS
+
+
+def normalize_entry(entry: str, kind: str) -> Optional[str]:
+    """Clean one skill or hobby, mapping it onto the context spelling when known."""
+
+    cleaned = clean_text(entry)
+    if not cleaned:
+        return None
+    canon = _context_terms().get(kind, set())
+    if cleaned in canon:
+        return next(item for item in canon if item == cleaned)
+    return cleaned
 
 
 def _normalize_entries(entries: List[str], kind: str) -> List[str]:
-    canon = _context_terms().get(kind, set())
     normalized: List[str] = []
     for entry in entries:
-        cleaned = clean_text(entry)
-        if not cleaned:
-            continue
-        if cleaned in canon:
-            normalized.append(next(item for item in canon if item == cleaned))
-        else:
+        cleaned = normalize_entry(entry, kind)
+        if cleaned:
             normalized.append(cleaned)
     return normalized
 
 
-def _parse_grade(value) -> Optional[float]:
+def parse_grade(value) -> Optional[float]:
     if value in (None, ""):
         return None
     try:
@@ -65,12 +80,12 @@ def normalize_user_data(form_data: Dict[str, object]) -> Dict[str, object]:
     overall = None
 
     if isinstance(grades_input, dict):
-        overall = _parse_grade(grades_input.get("overall"))
+        overall = parse_grade(grades_input.get("overall"))
         for key, value in grades_input.items():
             if key == "overall":
                 continue
             normalized_key = normalize_subject(key)
-            parsed = _parse_grade(value)
+            parsed = parse_grade(value)
             normalized_grades[normalized_key] = parsed
 
     skills = _normalize_entries(
@@ -98,4 +113,39 @@ def normalize_user_data(form_data: Dict[str, object]) -> Dict[str, object]:
     }
 
 
-__all__ = ["normalize_user_data"]
+def to_form_data(user_data: Dict[str, object]) -> Dict[str, object]:
+    """Turn a normalized profile back into a questionnaire payload.
+
+    ``normalize_user_data`` of the result reproduces ``user_data``; captured
+    traffic is stored in this form so it can be replayed against the API.
+    """
+
+    grades = {subject: "" if value is None else value for subject, value in (user_data.get("grades") or {}).items()}
+    if user_data.get("overall_grade") is not None:
+        grades["overall"] = user_data["overall_grade"]
+    return {
+        "stream": user_data.get("stream") or "",
+        "grades": grades,
+        "career_aspiration": user_data.get("career_aspiration_text", user_data.get("career_aspiration", "")),
+        "skills": list(user_data.get("skills", [])),
+        "hobbies": list(user_data.get("hobbies", [])),
+    }
+
+
+def profile_text(user_profile: Dict[str, object]) -> str:
+    """The cleaned text a profile is vectorized from."""
+
+    skills = user_profile.get("skills", []) or []
+    hobbies = user_profile.get("hobbies", []) or []
+    aspiration = user_profile.get("career_aspiration", "")
+    stream = user_profile.get("stream") or ""
+
+    return combine_and_clean([
+        aspiration,
+        " ".join(skills),
+        " ".join(hobbies),
+        stream,
+    ])
+
+
+__all__ = ["normalize_user_data", "normalize_entry", "parse_grade", "profile_text", "to_form_data"]
@@ -0,0 +1,75 @@
+"""Compact, array-backed replacement for ``TfidfVectorizer.vocabulary_``."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+
+class CompactVocabulary(Mapping):
+    """Read-only term -> column mapping stored in three flat arrays.
+
+    Terms are UTF-8 encoded, sorted and concatenated into one byte blob with
+    int64 offsets; lookups binary-search the blob. Compared to a ``dict`` of
+    ``str`` objects this needs a few bytes per term instead of ~150, and it
+    quacks like the mapping scikit-learn expects in ``vocabulary_``.
+    """
+
+    def __init__(self, vocabulary: Dict[str, int]) -> None:
+        encoded = sorted((term.encode("utf-8"), column) for term, column in vocabulary.items())
+        self._blob = b"".join(term for term, _column in encoded)
+        lengths = np.fromiter((len(term) for term, _column in encoded), dtype=np.int64, count=len(encoded))
+        self._offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self._offsets[1:])
+        self._columns = np.fromiter((column for _term, column in encoded), dtype=np.int32, count=len(encoded))
+
+    def _term_at(self, position: int) -> bytes:
+        return self._blob[self._offsets[position] : self._offsets[position + 1]]
+
+    def _find(self, term: str) -> int:
+        key = term.encode("utf-8")
+        low, high = 0, len(self._columns)
+        while low < high:
+            mid = (low + high) // 2
+            if self._term_at(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < len(self._columns) and self._term_at(low) == key:
+            return low
+        return -1
+
+    def __getitem__(self, term: str) -> int:
+        position = self._find(term) if isinstance(term, str) else -1
+        if position < 0:
+            raise KeyError(term)
+        return int(self._columns[position])
+
+    def __contains__(self, term: object) -> bool:
+        return isinstance(term, str) and self._find(term) >= 0
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(len(self._columns)):
+            yield self._term_at(position).decode("utf-8")
+
+    def lookup(self, terms: List[str]) -> np.ndarray:
+        """Return the column of each term, ``-1`` for unknown terms."""
+
+        result = np.full(len(terms), -1, dtype=np.int32)
+        for i, term in enumerate(terms):
+            position = self._find(term)
+            if position >= 0:
+                result[i] = self._columns[position]
+        return result
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._blob) + self._offsets.nbytes + self._columns.nbytes
+
+
+__all__ = ["CompactVocabulary"]
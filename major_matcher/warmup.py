@@ -0,0 +1,127 @@
+"""Start-up warm-up and readiness state for the backend.
+
+Warm-up builds (or loads) the configured catalog indexes through the
+single-flight registry and runs a few synthetic profiles through
+``recommend`` so the first real request does not pay for lazy
+initialization. Every phase is timed and logged.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from . import config
+from .catalog import get_registry
+from .recommender import recommend
+from .user_profile import normalize_user_data
+
+logger = logging.getLogger(__name__)
+
+WARMUP_PROFILES: List[Dict[str, object]] = [
+    {
+        "stream": "science",
+        "grades": {"overall": "92", "maths": "95", "physics": "90"},
+        "career_aspiration": "software engineer",
+        "skills": ["Problem Solving", "Critical Thinking"],
+        "hobbies": ["Coding/Programming"],
+    },
+    {
+        "stream": "literary",
+        "grades": {"overall": "70", "english": "85"},
+        "career_aspiration": "journalist",
+        "skills": ["Communication", "Creativity"],
+        "hobbies": ["Reading", "Debating"],
+    },
+    {"grades": {}, "career_aspiration": "", "skills": [], "hobbies": []},
+]
+
+
+class Readiness:
+    """Thread-safe warm-up state: ``starting`` -> ``warming`` -> ``ready`` | ``failed``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.state = "starting"
+        self.error: Optional[str] = None
+        self.phases: Dict[str, float] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def set_state(self, state: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.state = state
+            self.error = error
+
+    def record(self, phase: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.phases[phase] = round(elapsed_ms, 1)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {"status": self.state, "error": self.error, "phases_ms": dict(self.phases)}
+
+
+_READINESS = Readiness()
+
+
+def get_readiness() -> Readiness:
+    """Return the process-wide readiness state."""
+
+    return _READINESS
+
+
+@contextmanager
+def _phase(readiness: Readiness, name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    yield
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    readiness.record(name, elapsed_ms)
+    logger.info("Warm-up phase %s took %.1f ms", name, elapsed_ms)
+
+
+def warm_up(
+    catalogs: Optional[Sequence[str]] = None,
+    profiles: Optional[Sequence[Dict[str, object]]] = None,
+    readiness: Optional[Readiness] = None,
+) -> Readiness:
+    """Build the catalogs, exercise the request path and mark ``readiness`` ready."""
+
+    readiness = readiness or get_readiness()
+    catalogs = list(config.WARMUP_CATALOGS if catalogs is None else catalogs)
+    profiles = WARMUP_PROFILES if profiles is None else profiles
+    readiness.set_state("warming")
+    started = time.perf_counter()
+    try:
+        with _phase(readiness, "normalize"):
+            normalized = [normalize_user_data(profile) for profile in profiles]
+        for name in catalogs:
+            with _phase(readiness, f"catalog:{name}"):
+                get_registry().get(name)
+            with _phase(readiness, f"profiles:{name}"):
+                for profile in normalized:
+                    recommend(profile, catalog=name)
+    except Exception as exc:
+        logger.exception("Warm-up failed")
+        readiness.set_state("failed", str(exc))
+        return readiness
+    readiness.record("total", (time.perf_counter() - started) * 1000)
+    readiness.set_state("ready")
+    logger.info("Warm-up finished in %.1f ms", readiness.phases["total"])
+    return readiness
+
+
+def start_warm_up(**kwargs) -> threading.Thread:
+    """Run ``warm_up`` on a daemon thread so the server can answer probes meanwhile."""
+
+    thread = threading.Thread(target=warm_up, kwargs=kwargs, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+__all__ = ["Readiness", "WARMUP_PROFILES", "get_readiness", "start_warm_up", "warm_up"]
@@ -0,0 +1,313 @@
+"""What-if grade analysis on top of a cached base recommendation.
+
+Similarity and the career/skill features do not depend on grades, so they are
+computed once per profile (keyed without its grades) and cached. A what-if
+request only re-evaluates the grade penalties against the per-major
+requirement thresholds of the candidate majors.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import config
+from .experiments import resolve_weights
+from .recommender import UnknownMajorError, _ensure_resources, _rule_features
+from .rules import build_reason, rule_factors
+from .subject_normalization import normalize_subject
+
+UserData = Dict[str, object]
+
+# Profile fields the similarity and career/skill features depend on.
+_BASE_FIELDS = ("career_aspiration", "skills", "hobbies", "stream")
+
+
+def _grade(value) -> Optional[float]:
+    try:
+        grade = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(grade) else grade
+
+
+class WhatIfBase:
+    """Grade-independent state of one profile: candidates and their thresholds."""
+
+    def __init__(self, user_data: UserData, catalog: Optional[str], variant: Optional[str]) -> None:
+        majors_df, _context, vectors = _ensure_resources(catalog)
+        self.majors_df = majors_df
+        self.major_ids = vectors.get("major_ids", {})
+        self.weights = resolve_weights(variant)
+        self.features = _rule_features(user_data, majors_df, vectors, [self.weights])
+
+        rows = majors_df.iloc[self.features["index"]]
+        self.min_overall = np.array(
+            [np.nan if _grade(value) is None else _grade(value) for value in rows["min_overall_percentage"]],
+            dtype=np.float64,
+        )
+        requirements = [row or {} for row in rows["min_grade_requirements"]]
+        self.subjects: List[str] = sorted({subject for row in requirements for subject in row})
+        self.subject_min = np.full((len(rows), len(self.subjects)), np.nan)
+        for i, row in enumerate(requirements):
+            for j, subject in enumerate(self.subjects):
+                required = _grade(row.get(subject))
+                if required is not None:
+                    self.subject_min[i, j] = required
+
+    def grade_features(self, overall: np.ndarray, grades: np.ndarray) -> Dict[str, np.ndarray]:
+        """Rule features for grade scenarios: ``overall`` (C,), ``grades`` (C, subjects).
+
+        ``nan`` means the grade is unknown, which never fails a requirement.
+        """
+
+        with np.errstate(invalid="ignore"):
+            overall_fail = overall[:, None] < self.min_overall[None, :]
+            subject_fails = (grades[:, None, :] < self.subject_min[None, :, :]).sum(axis=-1)
+        shape = overall_fail.shape
+        return {
+            "overall_fail": overall_fail.astype(np.int64),
+            "subject_fails": subject_fails,
+            "career_hits": np.broadcast_to(self.features["career_hits"], shape),
+            "skill_overlap": np.broadcast_to(self.features["skill_overlap"], shape),
+        }
+
+    def adjusted_scores(self, overall: np.ndarray, grades: np.ndarray) -> np.ndarray:
+        """Rule-adjusted scores (C, candidates); majors beyond RULES_TOP_N get ``-inf``."""
+
+        factors = rule_factors(self.grade_features(overall, grades), [self.weights])[0]
+        adjusted = self.features["score"][None, :] * factors
+        shown = np.arange(adjusted.shape[-1]) < int(self.weights["RULES_TOP_N"])
+        return np.where(shown, adjusted, -np.inf)
+
+    def grade_vector(self, user_data: UserData) -> Tuple[float, np.ndarray]:
+        grades = user_data.get("grades") or {}
+        overall = _grade(user_data.get("overall_grade"))
+        subject_grades = [_grade(grades.get(subject)) for subject in self.subjects]
+        return (
+            np.nan if overall is None else overall,
+            np.array([np.nan if g is None else g for g in subject_grades], dtype=np.float64),
+        )
+
+
+_CACHE: "OrderedDict[str, WhatIfBase]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_key(user_data: UserData, catalog: Optional[str], version: Optional[str], variant: Optional[str]) -> str:
+    fields = {field: user_data.get(field) for field in _BASE_FIELDS}
+    return json.dumps([catalog, version, variant, fields], sort_keys=True, default=str)
+
+
+def prepare_what_if(user_data: UserData, catalog: Optional[str] = None, variant: Optional[str] = None) -> WhatIfBase:
+    """Return the cached grade-independent state for ``user_data``.
+
+    The key includes the catalog version, so a replaced or edited catalog is
+    scored afresh.
+    """
+
+    _majors_df, _context, vectors = _ensure_resources(catalog)
+    key = _cache_key(user_data, catalog, vectors.get("catalog_version"), variant)
+    with _CACHE_LOCK:
+        base = _CACHE.get(key)
+        if base is not None:
+            _CACHE.move_to_end(key)
+            return base
+    base = WhatIfBase(user_data, catalog, variant)
+    with _CACHE_LOCK:
+        _CACHE[key] = base
+        while len(_CACHE) > config.WHAT_IF_CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return base
+
+
+def _delta(key: str, value) -> float:
+    try:
+        delta = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Grade delta for {key} is not a number: {value!r}") from None
+    if not math.isfinite(delta):
+        raise ValueError(f"Grade delta for {key} is not finite: {value!r}")
+    return delta
+
+
+def _clamp(grade: float) -> float:
+    return min(max(grade, 0.0), 100.0)
+
+
+def apply_grade_deltas(user_data: UserData, deltas: Dict[str, float]) -> UserData:
+    """Return a copy of ``user_data`` with grade ``deltas`` added.
+
+    The key ``"overall"`` changes the overall grade; other keys are subjects
+    and are normalized like the questionnaire input. Changed grades are
+    clamped to 0-100. Raises ``ValueError`` for anything but a mapping of
+    finite numbers.
+    """
+
+    if not isinstance(deltas, dict):
+        raise ValueError("Grade deltas must be an object of subject -> points.")
+    grades = dict(user_data.get("grades") or {})
+    overall = user_data.get("overall_grade")
+    for key, value in deltas.items():
+        key = str(key)
+        delta = _delta(key, value)
+        if key == "overall":
+            if _grade(overall) is None:
+                raise ValueError("No base overall grade to change.")
+            overall = _clamp(_grade(overall) + delta)
+            continue
+        subject = normalize_subject(key)
+        if _grade(grades.get(subject)) is None:
+            raise ValueError(f"No base grade for subject: {key}")
+        grades[subject] = _clamp(_grade(grades[subject]) + delta)
+    return dict(user_data, grades=grades, overall_grade=overall)
+
+
+def _ranking(base: WhatIfBase, adjusted: np.ndarray, user_data: UserData, k: int) -> List[Dict[str, object]]:
+    order = np.argsort(-adjusted, kind="stable")
+    results = []
+    for pos in order[:k]:
+        if not np.isfinite(adjusted[pos]):
+            break
+        idx = int(base.features["index"][pos])
+        entry = {
+            "index": idx,
+            "skill_overlap": int(base.features["skill_overlap"][pos]),
+            "career_hits": int(base.features["career_hits"][pos]),
+        }
+        results.append(
+            {
+                "major_id": base.majors_df.iloc[idx].get("major_id"),
+                "major_name": base.features["major_name"][pos],
+                "score": float(adjusted[pos]),
+                "reason": build_reason(entry, user_data, base.majors_df),
+            }
+        )
+    return results
+
+
+def _target_ranks(adjusted: np.ndarray, target: int) -> np.ndarray:
+    """Rank of ``target`` in every scenario row, with the stable tie order."""
+
+    target_scores = adjusted[:, target : target + 1]
+    ahead = adjusted > target_scores
+    ahead[:, :target] |= adjusted[:, :target] == target_scores
+    return ahead.sum(axis=1)
+
+
+def minimal_grade_changes(base: WhatIfBase, user_data: UserData, major_id: str, k: int) -> Dict[str, object]:
+    """Smallest grade raises (in total points) that put ``major_id`` in the top ``k``.
+
+    Only the target's failing requirements are candidates: each is raised
+    exactly to its threshold. All subsets of failing subjects (or the cheapest
+    prefixes beyond ``WHAT_IF_EXHAUSTIVE_SUBJECTS``) are scored in one batch,
+    including their effect on competing majors.
+    """
+
+    row = base.major_ids.get(str(major_id))
+    if row is None:
+        raise UnknownMajorError(major_id)
+    positions = np.flatnonzero(base.features["index"] == row)
+    if not len(positions) or positions[0] >= int(base.weights["RULES_TOP_N"]):
+        return {"major_id": major_id, "reachable": False, "changes": {}, "points": None}
+    target = int(positions[0])
+
+    overall, grades = base.grade_vector(user_data)
+    options: List[Tuple[Optional[int], float]] = []  # (subject column or None for overall, threshold)
+    if overall < base.min_overall[target]:
+        options.append((None, float(base.min_overall[target])))
+    failing = [
+        (j, float(base.subject_min[target, j]))
+        for j in range(len(base.subjects))
+        if grades[j] < base.subject_min[target, j]
+    ]
+    failing.sort(key=lambda item: item[1] - grades[item[0]])
+    if len(failing) <= config.WHAT_IF_EXHAUSTIVE_SUBJECTS:
+        subsets: Sequence[Tuple] = [
+            combo for size in range(len(failing) + 1) for combo in itertools.combinations(failing, size)
+        ]
+    else:
+        subsets = [tuple(failing[:size]) for size in range(len(failing) + 1)]
+    scenarios = [
+        tuple(subset) + extra
+        for subset in subsets
+        for extra in ([()] + ([(options[0],)] if options else []))
+    ]
+
+    overall_rows = np.full(len(scenarios), overall)
+    grade_rows = np.tile(grades, (len(scenarios), 1))
+    costs = np.zeros(len(scenarios))
+    for i, scenario in enumerate(scenarios):
+        for column, threshold in scenario:
+            if column is None:
+                costs[i] += threshold - overall
+                overall_rows[i] = threshold
+            else:
+                costs[i] += threshold - grades[column]
+                grade_rows[i, column] = threshold
+
+    ranks = _target_ranks(base.adjusted_scores(overall_rows, grade_rows), target)
+    feasible = np.flatnonzero(ranks < k)
+    if not len(feasible):
+        return {"major_id": major_id, "reachable": False, "changes": {}, "points": None}
+    sizes = np.array([len(scenario) for scenario in scenarios])
+    best = feasible[np.lexsort((sizes[feasible], costs[feasible]))[0]]
+    changes = {
+        ("overall" if column is None else base.subjects[column]): threshold
+        for column, threshold in scenarios[best]
+    }
+    return {"major_id": major_id, "reachable": True, "changes": changes, "points": float(costs[best])}
+
+
+def what_if(
+    user_data: UserData,
+    grade_deltas: Optional[Dict[str, float]] = None,
+    catalog: Optional[str] = None,
+    variant: Optional[str] = None,
+    target_major: Optional[str] = None,
+    k: Optional[int] = None,
+) -> Dict[str, object]:
+    """Recommendations for ``user_data`` with ``grade_deltas`` applied.
+
+    Returns ``{"baseline": [...], "recommendations": [...]}`` and, with
+    ``target_major``, a ``"target"`` entry from ``minimal_grade_changes``
+    computed against the changed grades.
+    """
+
+    k = config.RETURN_TOP_K if k is None else k
+    base = prepare_what_if(user_data, catalog, variant)
+    changed = apply_grade_deltas(user_data, grade_deltas or {})
+
+    scenarios = [base.grade_vector(user_data), base.grade_vector(changed)]
+    overall = np.array([scenario[0] for scenario in scenarios])
+    grades = np.array([scenario[1] for scenario in scenarios]).reshape(2, len(base.subjects))
+    adjusted = base.adjusted_scores(overall, grades)
+
+    result: Dict[str, object] = {
+        "baseline": _ranking(base, adjusted[0], user_data, k),
+        "recommendations": _ranking(base, adjusted[1], changed, k),
+    }
+    if target_major is not None:
+        result["target"] = minimal_grade_changes(base, changed, target_major, k)
+    return result
+
+
+def clear_what_if_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+__all__ = [
+    "WhatIfBase",
+    "apply_grade_deltas",
+    "clear_what_if_cache",
+    "minimal_grade_changes",
+    "prepare_what_if",
+    "what_if",
+]
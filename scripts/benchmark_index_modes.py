@@ -0,0 +1,84 @@
+"""Compare scoring latency and memory of the sparse and LSA index modes.
+
+Synthetic catalogs are grown from ``data/majors.json`` (see
+:mod:`major_matcher.synthetic`) so the vocabulary grows with the catalog.
+
+    python scripts/benchmark_index_modes.py --sizes 25 1000 10000 --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from statistics import median
+
+from major_matcher import load_majors_data, normalize_user_data
+from major_matcher.similarity import score_majors, vectorize_majors, vectorize_user_profile
+from major_matcher.synthetic import write_synthetic_catalog
+
+PROFILES = [
+    {"career_aspiration": "software developer", "skills": ["programming", "problem solving"], "hobbies": ["coding"]},
+    {"career_aspiration": "journalism and public relations", "skills": ["communication"], "hobbies": ["writing"]},
+    {"career_aspiration": "doctor", "skills": ["teamwork"], "hobbies": ["reading"], "stream": "science"},
+]
+
+
+def _index_bytes(vectors) -> int:
+    matrix = vectors["matrix"]
+    total = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    for key in ("projection", "embeddings"):
+        if vectors.get(key) is not None:
+            total += vectors[key].nbytes
+    return total
+
+
+def benchmark(size: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        majors_df = load_majors_data(write_synthetic_catalog(Path(tmp) / "majors.json", size))
+
+    users = [normalize_user_data(profile) for profile in PROFILES]
+    rows = []
+    for mode in ("sparse", "lsa"):
+        start = time.perf_counter()
+        vectors = vectorize_majors(majors_df, mode=mode)
+        build_s = time.perf_counter() - start
+
+        user_vectors = [vectorize_user_profile(user, vectors["vectorizer"]) for user in users]
+        timings = []
+        for i in range(repeat):
+            user_vector = user_vectors[i % len(user_vectors)]
+            start = time.perf_counter()
+            score_majors(user_vector, vectors)
+            timings.append(time.perf_counter() - start)
+        rows.append(
+            {
+                "size": size,
+                "mode": vectors["mode"],
+                "vocab": vectors["matrix"].shape[1],
+                "build_s": build_s,
+                "score_us": median(timings) * 1e6,
+                "index_kib": _index_bytes(vectors) / 1024,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'majors':>7} {'mode':>6} {'vocab':>8} {'build s':>8} {'score us':>9} {'index KiB':>10}")
+    for size in args.sizes:
+        for row in benchmark(size, args.repeat):
+            print(
+                f"{row['size']:>7} {row['mode']:>6} {row['vocab']:>8} {row['build_s']:>8.2f} "
+                f"{row['score_us']:>9.1f} {row['index_kib']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Build a catalog's index and save it next to its majors file.
+
+The catalog registry loads the saved index at start-up instead of fitting
+TF-IDF again, as long as the majors file content and the index settings are
+the ones it was built from.
+
+    python scripts/build_index.py                 # default catalog
+    python scripts/build_index.py --catalog oman-2026
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from major_matcher import config, get_registry, load_majors_data
+from major_matcher.catalog import index_source
+from major_matcher.index_io import save_index
+from major_matcher.similarity import vectorize_majors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalog", default=config.DEFAULT_CATALOG)
+    args = parser.parse_args()
+
+    registry = get_registry()
+    if args.catalog not in registry.names():
+        raise SystemExit(f"Unknown catalog: {args.catalog}")
+    majors_path = registry.spec(args.catalog)["majors_path"]
+
+    started = time.perf_counter()
+    vectors = vectorize_majors(load_majors_data(majors_path))
+    path = save_index(vectors, majors_path.with_name(config.CATALOG_INDEX_FILENAME), index_source(majors_path))
+    print(f"{path} written in {time.perf_counter() - started:.2f}s ({vectors['mode']} mode)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Aggregate recommendation demand for a cohort in one streaming pass.
+
+Profiles are questionnaire payloads, one JSON object per line (a capture file
+written by the backend also works). Only the running aggregate is kept in memory.
+
+    python scripts/cohort_report.py --profiles cohort.jsonl --workers 4 --json report.json
+    python scripts/cohort_report.py --synthetic 20000 --save-state part-1.json
+    python scripts/cohort_report.py --merge part-1.json part-2.json --json report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterator
+
+from major_matcher.cohort import CohortAggregator, aggregate_cohort
+from major_matcher.synthetic import synthetic_profiles
+
+
+def read_payloads(path: Path) -> Iterator[Dict[str, object]]:
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                yield record.get("payload", record)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--profiles", type=Path, help="JSON-lines file of questionnaire payloads")
+    source.add_argument("--synthetic", type=int, help="aggregate this many synthetic profiles")
+    source.add_argument("--merge", type=Path, nargs="+", help="merge saved aggregate states instead of scoring")
+    parser.add_argument("--catalog", default=None)
+    parser.add_argument("--variant", default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--top", type=int, default=15, help="majors to print")
+    parser.add_argument("--save-state", type=Path, help="write the mergeable aggregate state here")
+    parser.add_argument("--json", type=Path, help="write the full cohort summary here")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.merge:
+        aggregate = CohortAggregator.from_dict(json.loads(args.merge[0].read_text(encoding="utf-8")))
+        for path in args.merge[1:]:
+            aggregate.merge(CohortAggregator.from_dict(json.loads(path.read_text(encoding="utf-8"))))
+    else:
+        payloads = read_payloads(args.profiles) if args.profiles else iter(synthetic_profiles(args.synthetic))
+        aggregate = aggregate_cohort(payloads, catalog=args.catalog, variant=args.variant, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    summary = aggregate.summary()
+    print(f"{summary['profiles']} profiles in {elapsed:.1f}s")
+    print("segments: " + ", ".join(f"{segment}={count}" for segment, count in summary["segments"].items()))
+    for row in summary["majors"][: args.top]:
+        quantiles = " ".join(f"{name}={value:.3f}" for name, value in row["quantiles"].items())
+        print(f"{row['recommended']:>8} {row['share']:6.1%} top1={row['top1']:<6} {quantiles}  {row['major_name']} ({row.get('major_id', '-')})")
+    if args.save_state:
+        args.save_state.write_text(json.dumps(aggregate.to_dict()), encoding="utf-8")
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Print the bytes used by each index component, default vs. compact.
+
+    python scripts/index_memory_report.py                 # data/majors.json
+    python scripts/index_memory_report.py --synthetic 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from major_matcher import load_majors_data
+from major_matcher.memory import index_memory_report
+from major_matcher.similarity import vectorize_majors
+from major_matcher.synthetic import write_synthetic_catalog
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=0, help="grow a synthetic catalog to this many majors")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp:
+            majors_df = load_majors_data(write_synthetic_catalog(Path(tmp) / "majors.json", args.synthetic))
+    else:
+        majors_df = load_majors_data()
+
+    default_vectors = vectorize_majors(majors_df, compact=False)
+    compact_vectors = vectorize_majors(majors_df, compact=True)
+    default = index_memory_report(default_vectors)
+    compact = index_memory_report(compact_vectors)
+
+    print(f"majors: {len(majors_df)}")
+    print(f"vocabulary: {default_vectors['matrix'].shape[1]} -> {compact_vectors['matrix'].shape[1]} terms")
+    print(f"{'component':<24} {'default':>12} {'compact':>12}")
+    for key in list(dict.fromkeys([*default, *compact])):
+        print(f"{key:<24} {default.get(key, 0):>12,} {compact.get(key, 0):>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Replay captured or synthetic traffic against a running recommend API.
+
+Payloads come from a capture file written by the backend (``CAPTURE_PATH``,
+enabled with ``CAPTURE_SAMPLE_RATE``) or from ``synthetic_profiles``. Load is
+either open loop at a fixed arrival rate, or closed loop with a fixed number
+of concurrent clients. Open-loop latencies are measured from each request's
+scheduled start, so a stalled server is not hidden by late sends.
+
+    python scripts/load_test.py --synthetic 500 --concurrency 8 --duration 20
+    python scripts/load_test.py --capture build/capture.jsonl --rate 50 --json before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from major_matcher.synthetic import EXPLAIN_SHARE, synthetic_profiles
+
+
+def load_capture(path: Path) -> List[Tuple[str, bytes]]:
+    """``(query, body)`` pairs from a capture file; the catalog goes in the query string."""
+
+    requests = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        body = dict(record["payload"])
+        if record.get("variant"):
+            body["variant"] = record["variant"]
+        if record.get("explain"):
+            body["explain"] = True
+        query = f"?catalog={record['catalog']}" if record.get("catalog") else ""
+        requests.append((query, json.dumps(body).encode("utf-8")))
+    return requests
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def post(self, path: str, body: bytes) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        head = (
+            f"POST {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        )
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        version, status = status_line.split(b" ", 2)[:2]
+        headers: Dict[bytes, bytes] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _sep, value = line.partition(b":")
+            headers[name.strip().lower()] = value.strip()
+        if b"content-length" in headers:
+            await self.reader.readexactly(int(headers[b"content-length"]))
+            keep_alive = version == b"HTTP/1.1" and headers.get(b"connection", b"").lower() != b"close"
+        else:
+            await self.reader.read()
+            keep_alive = False
+        if not keep_alive:
+            self.close()
+        return int(status)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.failures: Counter = Counter()
+
+    async def send(self, connection: Connection, path: str, body: bytes, started: float, timeout: float) -> None:
+        try:
+            status = await asyncio.wait_for(connection.post(path, body), timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+            connection.close()
+            self.failures[type(exc).__name__] += 1
+            return
+        self.statuses[status] += 1
+        self.latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def closed_loop(target, requests, concurrency: int, duration: float, limit: Optional[int], timeout: float):
+    host, port, path = target
+    recorder = Recorder()
+    feed = itertools.cycle(requests)
+    sent = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    async def client() -> None:
+        connection = Connection(host, port)
+        while time.perf_counter() < deadline and (limit is None or next(sent) < limit):
+            query, body = next(feed)
+            await recorder.send(connection, path + query, body, time.perf_counter(), timeout)
+        connection.close()
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return recorder
+
+
+async def open_loop(target, requests, rate: float, duration: float, limit: Optional[int], timeout: float):
+    host, port, path = target
+    recorder = Recorder()
+    idle: List[Connection] = []
+    total = int(rate * duration) if limit is None else min(limit, int(rate * duration))
+    tasks = []
+
+    async def one(query: str, body: bytes, scheduled: float) -> None:
+        connection = idle.pop() if idle else Connection(host, port)
+        await recorder.send(connection, path + query, body, scheduled, timeout)
+        idle.append(connection)
+
+    start = time.perf_counter()
+    for i, (query, body) in zip(range(total), itertools.cycle(requests)):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(one(query, body, scheduled)))
+    await asyncio.gather(*tasks)
+    for connection in idle:
+        connection.close()
+    return recorder
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, object]:
+    completed = len(recorder.latencies)
+    attempted = completed + sum(recorder.failures.values())
+    errors = sum(count for status, count in recorder.statuses.items() if status >= 400)
+    errors += sum(recorder.failures.values())
+    latencies = np.asarray(recorder.latencies) if completed else np.zeros(1)
+    return {
+        "requests": attempted,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / attempted, 4) if attempted else 0.0,
+        "latency_ms": {
+            name: round(float(np.percentile(latencies, q)), 2)
+            for name, q in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))
+        },
+        "statuses": {str(status): count for status, count in sorted(recorder.statuses.items())},
+        "failures": dict(recorder.failures),
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    if args.capture:
+        requests = load_capture(args.capture)
+    else:
+        query = f"?catalog={args.catalog}" if args.catalog else ""
+        profiles = synthetic_profiles(args.synthetic, seed=args.seed, explain_share=args.explain_share)
+        requests = [(query, json.dumps(profile).encode("utf-8")) for profile in profiles]
+    if not requests:
+        raise SystemExit("No requests to replay.")
+    url = urlsplit(args.url)
+    target = (url.hostname, url.port or 80, url.path or "/")
+
+    started = time.perf_counter()
+    if args.rate:
+        coroutine = open_loop(target, requests, args.rate, args.duration, args.requests, args.timeout)
+    else:
+        coroutine = closed_loop(target, requests, args.concurrency, args.duration, args.requests, args.timeout)
+    recorder = asyncio.run(coroutine)
+    report = summarize(recorder, time.perf_counter() - started)
+    report["mode"] = f"open loop {args.rate}/s" if args.rate else f"closed loop x{args.concurrency}"
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000/api/recommend")
+    parser.add_argument("--capture", type=Path, help="capture JSONL to replay")
+    parser.add_argument("--synthetic", type=int, default=500, help="synthetic profiles when no capture is given")
+    parser.add_argument("--catalog", default=None, help="catalog for synthetic requests")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--explain-share",
+        type=float,
+        default=EXPLAIN_SHARE,
+        help="share of synthetic requests that set explain (the questionnaire pages send none)",
+    )
+    parser.add_argument("--rate", type=float, default=0.0, help="open loop: requests per second")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed loop: concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--requests", type=int, default=None, help="stop after this many requests")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    parser.add_argument("--json", type=Path, help="also write the report here for before/after diffs")
+    args = parser.parse_args()
+
+    report = run(args)
+    latency = report["latency_ms"]
+    print(
+        f"{report['mode']}: {report['requests']} requests in {report['elapsed_s']}s, "
+        f"{report['throughput_rps']} req/s, errors {report['error_rate']:.2%}"
+    )
+    print(f"latency ms  p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    print(f"statuses {report['statuses']}  failures {report['failures']}")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Trace memory per build stage, index component and request stage.
+
+    python scripts/memory_diagnostics.py                       # data/majors.json
+    python scripts/memory_diagnostics.py --synthetic 5000 --requests 20 --top 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from major_matcher.memory_diagnostics import memory_report
+from major_matcher.synthetic import synthetic_profiles, write_synthetic_catalog
+from major_matcher.user_profile import normalize_user_data
+
+
+def _print_stages(title: str, stages) -> None:
+    print(f"\n{title:<24} {'peak':>14} {'retained':>14} {'ms':>8}")
+    for name, stage in stages.items():
+        print(f"{name:<24} {stage['peak']:>14,} {stage['retained']:>14,} {stage['ms']:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=0, help="grow a synthetic catalog to this many majors")
+    parser.add_argument("--requests", type=int, default=10, help="synthetic requests to trace")
+    parser.add_argument("--top", type=int, default=0, help="show the largest allocation sites per build stage")
+    args = parser.parse_args()
+
+    profiles = [normalize_user_data(profile) for profile in synthetic_profiles(args.requests)]
+    with tempfile.TemporaryDirectory() as tmp:
+        majors_path = write_synthetic_catalog(Path(tmp) / "majors.json", args.synthetic) if args.synthetic else None
+        report = memory_report(majors_path, profiles=profiles, top=args.top)
+
+    print(f"majors: {report['majors']}")
+    print(f"peak: {report['peak_bytes']:,} bytes  retained: {report['retained_bytes']:,} bytes")
+    _print_stages("build stage", report["stages"])
+    _print_stages("request stage (max)", report["requests"])
+    print(f"\n{'component':<32} {'bytes':>14}")
+    for name, size in report["components"].items():
+        print(f"{name:<32} {size:>14,}")
+    for stage, sites in report["top_sites"].items():
+        print(f"\n{stage}:")
+        for site in sites:
+            print(f"  {site}")
+
+
+if __name__ == "__main__":
+    main()
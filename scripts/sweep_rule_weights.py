@@ -0,0 +1,91 @@
+"""Sweep rule weights against the labeled profiles in data/eval_profiles.json.
+
+Features are computed once, then every setting is scored as array math.
+
+    python scripts/sweep_rule_weights.py                      # default grid
+    python scripts/sweep_rule_weights.py --random 5000 --workers 4
+    python scripts/sweep_rule_weights.py --random 5000 --tile 200   # timing at scale
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from major_matcher import config, load_context, load_majors_data
+from major_matcher.evaluation import (
+    build_feature_tensors,
+    evaluate_weights,
+    load_labeled_profiles,
+    random_weights,
+    weight_grid,
+)
+from major_matcher.experiments import base_weights
+from major_matcher.similarity import vectorize_majors
+from major_matcher.term_cache import build_term_cache
+
+GRID = {
+    "RULES_TOP_N": [8, 10, 15],
+    "GRADE_PENALTY_FACTOR": [0.6, 0.75, 0.9],
+    "SUBJECT_GRADE_PENALTY": [0.5, 0.6, 0.75, 0.9],
+    "CAREER_BOOST_FACTOR": [1.0, 1.1, 1.15, 1.25, 1.4],
+    "SKILL_BOOST_FACTOR": [1.0, 1.05, 1.1, 1.2],
+    "SKILL_OVERLAP_THRESHOLD": [1, 2, 3],
+}
+
+RANGES = {
+    "RULES_TOP_N": (5, 15),
+    "GRADE_PENALTY_FACTOR": (0.5, 1.0),
+    "SUBJECT_GRADE_PENALTY": (0.4, 1.0),
+    "CAREER_BOOST_FACTOR": (1.0, 1.5),
+    "CAREER_BOOST_CAP": (1.2, 1.8),
+    "SKILL_BOOST_FACTOR": (1.0, 1.3),
+    "SKILL_OVERLAP_THRESHOLD": (1, 3),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", default=None, help="labeled profile JSON (default: data/eval_profiles.json)")
+    parser.add_argument("--random", type=int, default=0, help="sample this many settings instead of the grid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--tile", type=int, default=1, help="repeat the profile set (timing only)")
+    parser.add_argument("--metric", default=f"ndcg@{config.RETURN_TOP_K}")
+    parser.add_argument("--show", type=int, default=10)
+    args = parser.parse_args()
+
+    majors_df = load_majors_data()
+    vectors = vectorize_majors(majors_df)
+    vectors["term_cache"] = build_term_cache(vectors, load_context())
+    labeled = load_labeled_profiles(args.profiles)
+
+    settings = random_weights(args.random, RANGES, seed=args.seed) if args.random else weight_grid(GRID)
+    top_n = max(int(w["RULES_TOP_N"]) for w in settings)
+
+    started = time.perf_counter()
+    tensors = build_feature_tensors(labeled, majors_df, vectors, top_n=top_n)
+    if args.tile > 1:
+        tensors = {key: np.tile(value, (args.tile,) + (1,) * (value.ndim - 1)) for key, value in tensors.items()}
+    featurized = time.perf_counter()
+    results = evaluate_weights(tensors, settings, workers=args.workers)
+    finished = time.perf_counter()
+
+    print(
+        f"{len(settings)} settings x {tensors['score'].shape[0]} profiles: "
+        f"features {featurized - started:.2f}s, sweep {finished - featurized:.2f}s"
+    )
+    baseline = evaluate_weights(tensors, [base_weights()])
+    print("config: " + "  ".join(f"{name}={values[0]:.3f}" for name, values in baseline.items()))
+
+    best = np.argsort(-results[args.metric], kind="stable")[: args.show]
+    for rank, i in enumerate(best, start=1):
+        metrics = "  ".join(f"{name}={values[i]:.3f}" for name, values in results.items())
+        changed = {k: round(v, 3) for k, v in settings[i].items() if v != getattr(config, k)}
+        print(f"{rank:>3}. {metrics}  {changed}")
+
+
+if __name__ == "__main__":
+    main()
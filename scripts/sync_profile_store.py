@@ -0,0 +1,53 @@
+"""Bring the profile store up to date with a majors file and report what changed.
+
+    python scripts/sync_profile_store.py                                  # default catalog
+    python scripts/sync_profile_store.py --import-profiles students.json  # {"id": form data, ...}
+    python scripts/sync_profile_store.py --majors data/catalogs/oman-2026/majors.json --json report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from major_matcher import config, normalize_user_data
+from major_matcher.profile_store import ProfileStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", type=Path, default=config.PROFILE_STORE_PATH)
+    parser.add_argument("--majors", type=Path, default=config.MAJORS_PATH)
+    parser.add_argument("--variant", default=None)
+    parser.add_argument("--import-profiles", type=Path, help="JSON object of profile id -> form data to store")
+    parser.add_argument("--rebuild", action="store_true", help="refit the index and re-score every profile")
+    parser.add_argument("--json", type=Path, help="also write the full change report here")
+    args = parser.parse_args()
+
+    store = ProfileStore(args.store, variant=args.variant)
+    try:
+        report = store.rebuild(args.majors) if args.rebuild else store.sync_catalog(args.majors)
+        if args.import_profiles:
+            raw = json.loads(args.import_profiles.read_text(encoding="utf-8"))
+            imported = store.put_profiles({str(key): normalize_user_data(value) for key, value in raw.items()})
+            print(f"{imported} profiles stored")
+    finally:
+        store.close()
+
+    majors = report["majors"]
+    print(
+        f"catalog {report['catalog_version']}: {len(majors['added'])} added, {len(majors['removed'])} removed, "
+        f"{len(majors['changed'])} changed ({len(majors['text_changed'])} text)"
+    )
+    print(
+        f"{report['profiles']} profiles: rules re-applied {report['rules_rescored']}, "
+        f"fully re-scored {report['fully_rescored']}, written {report['written']}, "
+        f"top-k changed {report['top_k_changed']} in {report['elapsed_ms']} ms"
+    )
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
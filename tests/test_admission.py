@@ -0,0 +1,136 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.admission import AdmissionController, AdmissionRejected
+from major_matcher import config
+from major_matcher.metrics import Metrics
+from major_matcher.recommender import recommend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class AdmissionTests(unittest.TestCase):
+    def controller(self, **kwargs):
+        options = dict(
+            max_in_flight=1,
+            max_queue=2,
+            wait_budget=1.0,
+            degraded_mode=True,
+            degrade_queue_depth=1,
+            metrics=Metrics(),
+            clock=FakeClock(),
+        )
+        options.update(kwargs)
+        return AdmissionController(**options)
+
+    def test_admits_below_limit_without_degrading(self):
+        controller = self.controller()
+        with controller.admit() as admitted:
+            self.assertFalse(admitted.degraded)
+            self.assertEqual(controller.in_flight, 1)
+        self.assertEqual(controller.in_flight, 0)
+        self.assertEqual(controller.metrics.snapshot()["counters"]["admission.admitted"], 1)
+
+    def test_full_queue_is_rejected_with_429(self):
+        controller = self.controller(wait_budget=100.0)
+        controller.in_flight = 1
+        controller.queued = 2
+        with self.assertRaises(AdmissionRejected) as ctx:
+            with controller.admit():
+                pass
+        self.assertEqual(ctx.exception.status, 429)
+        self.assertEqual(ctx.exception.reason, "queue_full")
+        self.assertGreaterEqual(ctx.exception.retry_after, 1)
+        self.assertEqual(controller.metrics.snapshot()["counters"]["admission.shed.queue_full"], 1)
+
+    def test_estimated_wait_over_budget_is_rejected_with_503(self):
+        controller = self.controller(initial_service_time=3.0, max_queue=10)
+        controller.in_flight = 1
+        with self.assertRaises(AdmissionRejected) as ctx:
+            with controller.admit():
+                pass
+        self.assertEqual(ctx.exception.status, 503)
+        self.assertEqual(ctx.exception.reason, "overload")
+        self.assertEqual(ctx.exception.retry_after, 3)
+
+    def test_queued_request_times_out_at_deadline(self):
+        clock = FakeClock()
+        controller = self.controller(clock=clock, initial_service_time=0.5)
+        controller.in_flight = 1
+        original_wait = controller._cond.wait
+
+        def advance(timeout=None):
+            clock.now += timeout
+            return original_wait(0)
+
+        controller._cond.wait = advance
+        with self.assertRaises(AdmissionRejected) as ctx:
+            with controller.admit():
+                pass
+        self.assertEqual(ctx.exception.reason, "timeout")
+        self.assertEqual(controller.queued, 0)
+
+    def test_queued_request_runs_when_slot_frees_and_is_degraded_behind_a_queue(self):
+        controller = self.controller(clock=lambda: 0.0, initial_service_time=0.1)
+        release = threading.Event()
+        entered = threading.Event()
+        outcomes = []
+
+        def holder():
+            with controller.admit():
+                entered.set()
+                release.wait(5)
+
+        def waiter():
+            with controller.admit() as admitted:
+                outcomes.append(admitted.degraded)
+
+        first = threading.Thread(target=holder)
+        first.start()
+        entered.wait(5)
+        controller.queued = 1  # pretend another request is already queued
+        second = threading.Thread(target=waiter)
+        second.start()
+        while controller.queued < 2:
+            pass
+        controller.queued -= 1
+        release.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual(outcomes, [True])
+        self.assertEqual(controller.metrics.snapshot()["counters"]["admission.degraded"], 1)
+        self.assertEqual(controller.metrics.snapshot()["gauges"]["admission.in_flight"], 0)
+
+
+class DegradedRecommendTests(unittest.TestCase):
+    def test_degraded_results_are_similarity_only(self):
+        profile = {
+            "grades": {"maths": 95.0},
+            "overall_grade": 90.0,
+            "career_aspiration": "software engineer",
+            "skills": ["problem solving"],
+            "hobbies": ["coding/programming"],
+            "stream": "science",
+        }
+        results = recommend(profile, degraded=True)
+        self.assertLessEqual(len(results), config.RETURN_TOP_K)
+        self.assertTrue(results)
+        self.assertTrue(all(entry["reason"] == "" for entry in results))
+        scores = [entry["score"] for entry in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import config
+from major_matcher.catalog import CatalogRegistry, UnknownCatalogError
+
+
+def _write_catalog(folder: Path, names):
+    folder.mkdir(parents=True, exist_ok=True)
+    records = [
+        {
+            "major_id": f"M{i}",
+            "major_name": name,
+            "faculty": "faculty",
+            "required_hs_subjects": ["maths"],
+            "example_career_paths": [name.lower()],
+            "curriculum_keywords": [name.lower()],
+        }
+        for i, name in enumerate(names)
+    ]
+    path = folder / "majors.json"
+    path.write_text(json.dumps(records), encoding="utf-8")
+    return path
+
+
+class CatalogRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.north = _write_catalog(self.root / "north", ["Marine Biology", "Fisheries"])
+        self.south = _write_catalog(self.root / "south", ["Nursing", "Pharmacy", "Dentistry"])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_routes_to_named_catalog(self):
+        registry = CatalogRegistry()
+        registry.register("north", self.north, config.CONTEXT_PATH)
+        registry.register("south", self.south, config.CONTEXT_PATH)
+        self.assertEqual(len(registry.get("north")[0]), 2)
+        self.assertEqual(len(registry.get("south")[0]), 3)
+        with self.assertRaises(UnknownCatalogError):
+            registry.get("missing")
+
+    def test_discovery_stays_inside_catalogs_dir(self):
+        catalogs = self.root / "catalogs"
+        _write_catalog(catalogs / "east", ["Geology"])
+        registry = CatalogRegistry()
+        with mock.patch.object(config, "CATALOGS_DIR", catalogs):
+            self.assertEqual(len(registry.get("east")[0]), 1)
+            for name in ("../north", str(self.root / "south"), "east/..", ".."):
+                with self.assertRaises(UnknownCatalogError):
+                    registry.get(name)
+            self.assertNotIn("../north", registry.names())
+
+    def test_lru_eviction_keeps_most_recent(self):
+        registry = CatalogRegistry(memory_budget=1)
+        registry.register("north", self.north, config.CONTEXT_PATH)
+        registry.register("south", self.south, config.CONTEXT_PATH)
+        registry.get("north")
+        registry.get("south")
+        self.assertEqual(list(registry.loaded()), ["south"])
+
+    def test_concurrent_first_requests_build_once(self):
+        registry = CatalogRegistry()
+        registry.register("north", self.north, config.CONTEXT_PATH)
+        builds = []
+        gate = threading.Event()
+        original = registry._build
+
+        def slow_build(spec):
+            builds.append(spec)
+            gate.wait(timeout=5)
+            return original(spec)
+
+        registry._build = slow_build
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("north"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        gate.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_register_during_build_rebuilds_from_new_spec(self):
+        registry = CatalogRegistry()
+        registry.register("north", self.north, config.CONTEXT_PATH)
+        builds = []
+        started = threading.Event()
+        gate = threading.Event()
+        original = registry._build
+
+        def slow_build(spec):
+            builds.append(spec["majors_path"])
+            started.set()
+            gate.wait(timeout=5)
+            return original(spec)
+
+        registry._build = slow_build
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("north"))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        self.assertTrue(started.wait(timeout=5))
+        registry.register("north", self.south, config.CONTEXT_PATH)
+        gate.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(builds, [self.north, self.south])
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(len(result[0]) == 3 for result in results))
+        self.assertEqual(len(registry.get("north")[0]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import json
+import sys
+import unittest
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import recommend_with_shadows
+from major_matcher.cohort import CohortAggregator, QuantileSketch, aggregate_cohort, grade_band
+from major_matcher.synthetic import synthetic_profiles
+from major_matcher.user_profile import normalize_user_data
+
+BANDS = {"A": (90.0, 100.0), "B": (80.0, 89.0), "C": (70.0, 79.0), "D": (50.0, 69.0), "F": (30.0, 49.0)}
+
+
+class QuantileSketchTests(unittest.TestCase):
+    def assert_rank_error(self, sketch, values, bound):
+        ordered = np.sort(values)
+        for q in (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99):
+            (estimate,) = sketch.quantiles([q])
+            rank = np.searchsorted(ordered, estimate, side="right") / len(ordered)
+            self.assertLess(abs(rank - q), bound, q)
+
+    def test_rank_error_and_bounded_size(self):
+        values = np.random.default_rng(3).lognormal(size=50_000)
+        sketch = QuantileSketch(k=128)
+        for value in values:
+            sketch.add(value)
+        self.assertEqual(sketch.count, len(values))
+        self.assertEqual(sketch.quantiles([0.0, 1.0]), [values.min(), values.max()])
+        self.assertLess(sum(len(items) for items in sketch._levels), 3 * 128 + 64)
+        self.assert_rank_error(sketch, values, 4 / 128)
+
+    def test_merged_parts_match_whole(self):
+        values = np.random.default_rng(5).normal(size=20_000)
+        parts = [QuantileSketch(k=128) for _ in range(4)]
+        for index, value in enumerate(values):
+            parts[index % 4].add(value)
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(QuantileSketch.from_dict(json.loads(json.dumps(part.to_dict()))))
+        self.assertEqual(merged.count, len(values))
+        self.assert_rank_error(merged, values, 4 / 128)
+        self.assertEqual(QuantileSketch(k=8).quantiles([0.5]), [None])
+
+
+class CohortAggregatorTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.payloads = synthetic_profiles(90, seed=21)
+        cls.scored = []
+        cls.ids = []
+        for payload in cls.payloads:
+            user_data = normalize_user_data(payload)
+            trace = {}
+            results, _shadows = recommend_with_shadows(user_data, trace=trace)
+            cls.scored.append((user_data, results))
+            cls.ids.append(trace["top_ids"])
+
+    def test_grade_band(self):
+        self.assertEqual(grade_band(95, BANDS), "A")
+        self.assertEqual(grade_band(89.5, BANDS), "B")
+        self.assertEqual(grade_band(12, BANDS), "F")
+        self.assertEqual(grade_band(None, BANDS), "unknown")
+
+    def test_counts_match_materialized_results(self):
+        aggregate = CohortAggregator(bands=BANDS)
+        for user_data, results in self.scored:
+            aggregate.add(user_data, results)
+        summary = aggregate.summary()
+
+        segments = Counter(aggregate.segment(user_data) for user_data, _results in self.scored)
+        recommended = Counter(item["major_name"] for _user, results in self.scored for item in results)
+        top1 = Counter(results[0]["major_name"] for _user, results in self.scored if results)
+        self.assertEqual(summary["profiles"], len(self.scored))
+        self.assertEqual(summary["segments"], dict(sorted(segments.items())))
+        self.assertEqual({row["major_name"]: row["recommended"] for row in summary["majors"]}, dict(recommended))
+        self.assertEqual({row["major_name"]: row["top1"] for row in summary["majors"] if row["top1"]}, dict(top1))
+        for row in summary["majors"]:
+            scores = [item["score"] for _user, results in self.scored for item in results if item["major_name"] == row["major_name"]]
+            self.assertAlmostEqual(row["mean_score"], float(np.mean(scores)))
+            self.assertEqual(sum(row["histogram"]), len(scores))
+            self.assertEqual(sum(entry["recommended"] for entry in row["segments"].values()), len(scores))
+            self.assertGreaterEqual(row["quantiles"]["p50"], min(scores))
+            self.assertLessEqual(row["quantiles"]["p50"], max(scores))
+
+    def test_merge_and_round_trip_match_single_pass(self):
+        whole = CohortAggregator(bands=BANDS)
+        halves = [CohortAggregator(bands=BANDS), CohortAggregator(bands=BANDS)]
+        for index, (user_data, results) in enumerate(self.scored):
+            whole.add(user_data, results)
+            halves[index % 2].add(user_data, results)
+        merged = CohortAggregator.from_dict(json.loads(json.dumps(halves[0].to_dict())))
+        merged.merge(CohortAggregator.from_dict(json.loads(json.dumps(halves[1].to_dict()))))
+
+        expected, actual = whole.summary(), merged.summary()
+        self.assertEqual(actual["segments"], expected["segments"])
+        for mine, reference in zip(actual["majors"], expected["majors"]):
+            self.assertEqual(mine["major_name"], reference["major_name"])
+            self.assertEqual(mine["histogram"], reference["histogram"])
+            self.assertEqual(mine["segments"], reference["segments"])
+            self.assertAlmostEqual(mine["mean_score"], reference["mean_score"])
+        with self.assertRaises(ValueError):
+            merged.merge(CohortAggregator(bands=BANDS, bins=5))
+
+    def test_aggregate_cohort_streams_payloads(self):
+        aggregate = aggregate_cohort(iter(self.payloads), chunk_size=32)
+        reference = CohortAggregator()
+        for (user_data, results), ids in zip(self.scored, self.ids):
+            reference.add(user_data, results, ids)
+        self.assertEqual(aggregate.summary(), reference.summary())
+        self.assertTrue(all("major_id" in row for row in aggregate.summary()["majors"]))
+
+    def test_same_named_majors_are_kept_apart_by_id(self):
+        user_data, results = self.scored[0]
+        twins = [{"major_name": "Computer Science", "score": 0.5}, {"major_name": "Computer Science", "score": 0.3}]
+        halves = [CohortAggregator(bands=BANDS), CohortAggregator(bands=BANDS)]
+        halves[0].add(user_data, twins, ["SQU-CS", "UTAS-CS"])
+        halves[1].add(user_data, twins[::-1], ["UTAS-CS", "SQU-CS"])
+        merged = CohortAggregator.from_dict(json.loads(json.dumps(halves[0].to_dict())))
+        merged.merge(halves[1])
+        rows = {row["major_id"]: row for row in merged.summary()["majors"]}
+        self.assertEqual(set(rows), {"SQU-CS", "UTAS-CS"})
+        for major_id, score in (("SQU-CS", 0.5), ("UTAS-CS", 0.3)):
+            self.assertEqual(rows[major_id]["major_name"], "Computer Science")
+            self.assertEqual(rows[major_id]["recommended"], 2)
+            self.assertEqual(rows[major_id]["top1"], 1)
+            self.assertAlmostEqual(rows[major_id]["mean_score"], score)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import major_matcher
+from major_matcher import config, recommend, register_catalog
+from major_matcher.diversity import cap_rerank, mmr_rerank
+from major_matcher.user_profile import normalize_user_data
+
+PROFILE = {
+    "stream": "science",
+    "grades": {"overall": "92", "maths": "95", "physics": "90"},
+    "career_aspiration": "Software engineer",
+    "skills": ["Programming", "Problem solving"],
+    "hobbies": ["Coding"],
+}
+
+
+def entries(scores):
+    return [{"major_name": f"m{i}", "score": score, "index": i} for i, score in enumerate(scores)]
+
+
+class RerankerTests(unittest.TestCase):
+    def test_mmr_skips_near_duplicates(self):
+        # Majors 0, 1 and 2 are near-duplicates; 3 and 4 are unrelated.
+        neighbours = {
+            "indices": np.array([[1, 2], [0, 2], [0, 1], [4, 0], [3, 0]], dtype=np.int32),
+            "scores": np.array([[0.95, 0.9], [0.95, 0.9], [0.9, 0.9], [0.1, 0.0], [0.1, 0.0]], dtype=np.float32),
+        }
+        ranked = entries([1.0, 0.98, 0.97, 0.8, 0.7])
+        reranked = mmr_rerank(ranked, neighbours, k=3, weight=0.7)
+        self.assertEqual([entry["index"] for entry in reranked], [0, 3, 4, 1, 2])
+        self.assertEqual(mmr_rerank(ranked, neighbours, k=3, weight=1.0), ranked)
+        self.assertEqual(mmr_rerank(ranked, None, k=3), ranked)
+
+    def test_caps_limit_groups_and_backfill(self):
+        codes = {
+            "university_name": np.array([0, 0, 0, 1, -1], dtype=np.int32),
+            "faculty": np.array([0, 1, 2, 3, 4], dtype=np.int32),
+        }
+        ranked = entries([1.0, 0.9, 0.8, 0.7, 0.6])
+        caps = {"university_name": 2, "faculty": 2}
+        self.assertEqual([entry["index"] for entry in cap_rerank(ranked, codes, 4, caps)], [0, 1, 3, 4, 2])
+        self.assertEqual([entry["index"] for entry in cap_rerank(ranked[:3], codes, 3, caps)], [0, 1, 2])
+
+
+class RecommendDiversityTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.profile = normalize_user_data(PROFILE)
+        cls.top = "Bachelor of Science in Computer Science"
+        records = json.loads(config.MAJORS_PATH.read_text(encoding="utf-8"))
+        # The same program offered by three more universities.
+        original = next(record for record in records if record["major_name"] == cls.top)
+        for number in range(3):
+            records.append(dict(original, major_id=f"COPY-{number}", university_name=f"University {number}"))
+        majors_path = Path(cls.tmp.name) / "majors.json"
+        majors_path.write_text(json.dumps(records), encoding="utf-8")
+        register_catalog("diversity-copies", majors_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def copies(self, diversity):
+        results = recommend(self.profile, catalog="diversity-copies", diversity=diversity)
+        self.assertEqual(len(results), config.RETURN_TOP_K)
+        return sum(result["major_name"] == self.top for result in results)
+
+    def test_duplicates_crowd_out_alternatives_without_diversity(self):
+        self.assertGreaterEqual(self.copies("off"), 3)
+
+    def test_mmr_and_caps_make_room(self):
+        self.assertEqual(self.copies("mmr"), 1)
+        self.assertLessEqual(self.copies("caps"), config.DIVERSITY_CAPS["faculty"])
+
+    def test_config_default_and_unknown_mode(self):
+        previous = major_matcher.config.DIVERSITY_MODE
+        major_matcher.config.DIVERSITY_MODE = "caps"
+        try:
+            self.assertEqual(self.copies(None), self.copies("caps"))
+        finally:
+            major_matcher.config.DIVERSITY_MODE = previous
+        with self.assertRaises(ValueError):
+            recommend(self.profile, catalog="diversity-copies", diversity="shuffle")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher.data_loader import load_majors_data
+from major_matcher.evaluation import (
+    build_feature_tensors,
+    evaluate_weights,
+    load_labeled_profiles,
+    random_weights,
+    weight_grid,
+)
+from major_matcher.rules import apply_rules
+from major_matcher.similarity import rank_scores, score_majors, vectorize_majors, vectorize_user_profile
+
+
+class WeightSweepTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.majors_df = load_majors_data()
+        cls.vectors = vectorize_majors(cls.majors_df)
+        cls.labeled = load_labeled_profiles()
+        cls.tensors = build_feature_tensors(cls.labeled, cls.majors_df, cls.vectors, top_n=15)
+
+    def _reference(self, weights, k=4):
+        """MRR and hit@k computed the slow way through ``apply_rules``."""
+
+        reciprocal, hits = [], []
+        for item in self.labeled:
+            profile = item["profile"]
+            user_vector = vectorize_user_profile(profile, self.vectors["vectorizer"])
+            ranked = rank_scores(score_majors(user_vector, self.vectors), self.majors_df)
+            adjusted = apply_rules(ranked, profile, self.majors_df, top_n=weights["RULES_TOP_N"], weights=weights)
+            ids = [self.majors_df.iloc[e["index"]]["major_id"] for e in adjusted]
+            positions = [i for i, major_id in enumerate(ids) if major_id in item["expected"]]
+            reciprocal.append(1.0 / (positions[0] + 1) if positions else 0.0)
+            hits.append(bool(positions) and positions[0] < k)
+        return np.mean(reciprocal), np.mean(hits)
+
+    def test_sweep_matches_apply_rules(self):
+        settings = random_weights(6, {"RULES_TOP_N": (5, 15), "CAREER_BOOST_FACTOR": (1.0, 1.6)}, seed=3)
+        settings += weight_grid({"GRADE_PENALTY_FACTOR": [0.5, 1.0], "SKILL_OVERLAP_THRESHOLD": [1, 3]})
+        results = evaluate_weights(self.tensors, settings, ks=(1, 4), chunk_cells=200)
+
+        for i, weights in enumerate(settings):
+            mrr, hit = self._reference(weights)
+            self.assertAlmostEqual(results["mrr"][i], mrr)
+            self.assertAlmostEqual(results["hit@4"][i], hit)
+        self.assertTrue(np.all((results["ndcg@4"] >= 0) & (results["ndcg@4"] <= 1)))
+
+    def test_grid_size(self):
+        grid = weight_grid({"RULES_TOP_N": [8, 10], "SKILL_BOOST_FACTOR": [1.0, 1.1, 1.2]})
+        self.assertEqual(len(grid), 6)
+        self.assertEqual({w["RULES_TOP_N"] for w in grid}, {8, 10})
+
+
+if __name__ == "__main__":
+    unittest.main()
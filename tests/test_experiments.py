@@ -0,0 +1,64 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher.data_loader import load_majors_data
+from major_matcher.experiments import assign_variant, base_weights, resolve_weights
+from major_matcher.recommender import recommend, recommend_with_shadows
+from major_matcher.rules import apply_rule_variants, apply_rules, compute_rule_features
+from major_matcher.similarity import rank_scores, score_majors, vectorize_majors, vectorize_user_profile
+
+
+PROFILE = {
+    "overall_grade": 70,
+    "grades": {"math": 60, "physics": 65},
+    "career_aspiration": "software engineer building ai systems",
+    "skills": ["programming", "mathematics", "problem solving"],
+    "hobbies": ["robotics"],
+    "stream": "science",
+}
+
+
+class RuleVariantTests(unittest.TestCase):
+    def setUp(self):
+        self.majors_df = load_majors_data()
+        vectors = vectorize_majors(self.majors_df)
+        user_vector = vectorize_user_profile(PROFILE, vectors["vectorizer"])
+        self.ranked = rank_scores(score_majors(user_vector, vectors), self.majors_df)
+
+    def test_variants_match_separate_apply_rules_runs(self):
+        variants = {
+            "control": base_weights(),
+            "harsh": dict(base_weights(), GRADE_PENALTY_FACTOR=0.5, CAREER_BOOST_FACTOR=1.3, RULES_TOP_N=6),
+        }
+        features = compute_rule_features(self.ranked, PROFILE, self.majors_df, top_n=10)
+        combined = apply_rule_variants(features, variants)
+
+        for name, weights in variants.items():
+            expected = apply_rules(self.ranked, PROFILE, self.majors_df, top_n=weights["RULES_TOP_N"], weights=weights)
+            self.assertEqual([e["index"] for e in combined[name]], [e["index"] for e in expected])
+            np.testing.assert_allclose([e["score"] for e in combined[name]], [e["score"] for e in expected])
+        self.assertEqual(len(combined["harsh"]), 6)
+
+    def test_shadow_scoring_keeps_served_results(self):
+        served, shadows = recommend_with_shadows(PROFILE, shadow_variants=["soft-grades", "career-heavy"])
+        self.assertEqual(served, recommend(PROFILE))
+        self.assertEqual(set(shadows), {"soft-grades", "career-heavy"})
+        self.assertNotIn("reason", shadows["soft-grades"][0])
+
+    def test_assignment_is_deterministic(self):
+        split = {"control": 0.5, "soft-grades": 0.5}
+        first = [assign_variant(f"user-{i}", split) for i in range(200)]
+        self.assertEqual(first, [assign_variant(f"user-{i}", split) for i in range(200)])
+        self.assertEqual(set(first), set(split))
+        self.assertEqual(resolve_weights("soft-grades")["GRADE_PENALTY_FACTOR"], 0.85)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import config, recommend
+from major_matcher.data_loader import load_majors_data
+from major_matcher.experiments import base_weights
+from major_matcher.explain import explain_results
+from major_matcher.rules import apply_rules, compute_rule_features
+from major_matcher.similarity import rank_scores, score_majors, vectorize_majors, vectorize_user_profile
+from major_matcher.user_profile import normalize_user_data
+
+PROFILE = normalize_user_data(
+    {
+        "stream": "science",
+        "grades": {"overall": "62", "maths": "55", "physics": "70"},
+        "career_aspiration": "Software engineer building mobile apps",
+        "skills": ["Programming", "Problem solving"],
+        "hobbies": ["Coding", "Robotics"],
+    }
+)
+
+
+class ExplainTests(unittest.TestCase):
+    def assert_consistent(self, result, explanation):
+        rules = explanation["rules"]
+        self.assertEqual(set(rules), {"grade_penalty", "subject_penalty", "career_boost", "skill_boost"})
+        product = rules["grade_penalty"] * rules["subject_penalty"] * rules["career_boost"] * rules["skill_boost"]
+        self.assertAlmostEqual(explanation["multiplier"], product, places=12)
+        self.assertAlmostEqual(explanation["similarity"] * explanation["multiplier"], result["score"], places=12)
+        weights = [term["weight"] for term in explanation["terms"]]
+        self.assertEqual(weights, sorted(weights, reverse=True))
+
+    def test_off_by_default_keeps_reasons(self):
+        results = recommend(PROFILE)
+        self.assertTrue(results)
+        for result in results:
+            self.assertTrue(result["reason"])
+            self.assertNotIn("explanation", result)
+
+    def test_explained_results_keep_order_and_scores(self):
+        plain = recommend(PROFILE)
+        explained = recommend(PROFILE, explain=True)
+        self.assertEqual(
+            [(r["major_name"], r["score"], r["reason"]) for r in explained],
+            [(r["major_name"], r["score"], r["reason"]) for r in plain],
+        )
+        for result in explained:
+            self.assertLessEqual(len(result["explanation"]["terms"]), config.EXPLAIN_TOP_TERMS)
+            self.assert_consistent(result, result["explanation"])
+
+    def test_term_contributions_add_up_to_similarity(self):
+        with mock.patch.object(config, "EXPLAIN_TOP_TERMS", 10_000):
+            results = recommend(PROFILE, explain=True)
+        for result in results:
+            explanation = result["explanation"]
+            self.assertTrue(explanation["terms"])
+            total = sum(term["weight"] for term in explanation["terms"])
+            self.assertAlmostEqual(total, explanation["similarity"], places=9)
+
+    def test_index_modes(self):
+        majors_df = load_majors_data()
+        weights = base_weights()
+        for mode, compact in (("sparse", True), ("fields", False)):
+            vectors = vectorize_majors(majors_df, mode=mode, compact=compact)
+            user_vector = vectorize_user_profile(PROFILE, vectors["vectorizer"])
+            ranked = rank_scores(score_majors(user_vector, vectors), majors_df)
+            features = compute_rule_features(ranked, PROFILE, majors_df, top_n=config.RULES_TOP_N)
+            adjusted = apply_rules(ranked, PROFILE, majors_df)
+            explanations = explain_results(adjusted, features, weights, user_vector, vectors, top_terms=10_000)
+            for result, explanation in zip(adjusted, explanations):
+                self.assert_consistent(result, explanation)
+                total = sum(term["weight"] for term in explanation["terms"])
+                self.assertAlmostEqual(total, explanation["similarity"], places=5)
+                if mode == "fields":
+                    self.assertTrue(all(term["field"] in config.FIELD_WEIGHTS for term in explanation["terms"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
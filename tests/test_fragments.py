@@ -0,0 +1,68 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from flask import Flask, jsonify
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import config
+from major_matcher.catalog import get_registry
+from major_matcher.fragments import render_response
+from major_matcher.recommender import recommend_with_shadows
+from major_matcher.synthetic import synthetic_profiles
+from major_matcher.user_profile import normalize_user_data
+
+
+def _jsonify_bytes(results, fields):
+    app = Flask(__name__)
+    with app.app_context():
+        return jsonify({
+            "top_recommendation": results[0] if results else None,
+            "alternatives": results[1:],
+            **fields,
+        }).get_data()
+
+
+class FragmentResponseTests(unittest.TestCase):
+    def assert_same_bytes(self, profile, catalog=None, degraded=False, fields=None):
+        fields = fields or {"variant": "control", "degraded": degraded, "message": "success"}
+        for explain in (False, True):
+            results, _ = recommend_with_shadows(profile, catalog=catalog, degraded=degraded, explain=explain)
+            rendered, _ = recommend_with_shadows(
+                profile, catalog=catalog, degraded=degraded, rendered=True, explain=explain
+            )
+            self.assertEqual([item.major_name for item in rendered], [item["major_name"] for item in results])
+            self.assertEqual(render_response(rendered, fields), _jsonify_bytes(results, fields))
+
+    def test_matches_jsonify_for_synthetic_profiles(self):
+        for profile in synthetic_profiles(40, seed=7):
+            self.assert_same_bytes(normalize_user_data(profile))
+
+    def test_matches_jsonify_when_degraded_or_empty(self):
+        profile = normalize_user_data(synthetic_profiles(1, seed=2)[0])
+        self.assert_same_bytes(profile, degraded=True)
+        fields = {"variant": None, "degraded": False, "message": "No recommendation available."}
+        self.assertEqual(render_response([], fields), _jsonify_bytes([], fields))
+
+    def test_non_ascii_names_and_subjects_are_escaped_like_json(self):
+        records = json.loads(config.MAJORS_PATH.read_text(encoding="utf-8"))[:3]
+        records[0]["major_name"] = "هندسة البرمجيات \"SE\""
+        records[0]["required_hs_subjects"] = ["رياضيات", "physics"]
+        with tempfile.TemporaryDirectory() as tmp:
+            majors_path = Path(tmp) / "majors.json"
+            majors_path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+            get_registry().register("fragments-test", majors_path)
+            try:
+                for profile in synthetic_profiles(10, seed=1):
+                    self.assert_same_bytes(normalize_user_data(profile), catalog="fragments-test")
+            finally:
+                get_registry().evict("fragments-test")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import config
+from major_matcher.data_loader import load_majors_data
+from major_matcher.index_io import load_index, save_index
+from major_matcher.memory import index_memory_report
+from major_matcher.similarity import score_majors, vectorize_majors, vectorize_user_profile
+from major_matcher.user_profile import normalize_user_data
+from major_matcher.vocabulary import CompactVocabulary
+
+
+class IndexModeTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.majors_df = load_majors_data()
+        cls.profile = normalize_user_data(
+            {"career_aspiration": "software developer", "skills": ["programming"], "hobbies": ["coding"]}
+        )
+
+    def test_lsa_embeddings_are_contiguous_float32(self):
+        vectors = vectorize_majors(self.majors_df, mode="lsa")
+        embeddings = vectors["embeddings"]
+        self.assertEqual(embeddings.dtype, np.float32)
+        self.assertTrue(embeddings.flags["C_CONTIGUOUS"])
+        self.assertEqual(embeddings.shape[0], len(self.majors_df))
+        self.assertEqual(vectors["projection"].shape, (vectors["matrix"].shape[1], embeddings.shape[1]))
+
+        scores = score_majors(vectorize_user_profile(self.profile, vectors["vectorizer"]), vectors)
+        self.assertEqual(scores.shape, (len(self.majors_df),))
+        self.assertIn("Computer", self.majors_df.iloc[int(np.argmax(scores))]["major_name"])
+
+    def test_saved_index_scores_identically(self):
+        for mode in ("sparse", "lsa", "fields"):
+            vectors = vectorize_majors(self.majors_df, mode=mode)
+            with tempfile.TemporaryDirectory() as tmp:
+                restored = load_index(save_index(vectors, Path(tmp) / "index.npz"))
+            expected = score_majors(vectorize_user_profile(self.profile, vectors["vectorizer"]), vectors)
+            actual = score_majors(vectorize_user_profile(self.profile, restored["vectorizer"]), restored)
+            np.testing.assert_allclose(actual, expected, rtol=1e-6)
+
+    def test_compact_vocabulary_matches_dict(self):
+        vocabulary = {"data": 2, "data mining": 0, "zoology": 1, "café": 3}
+        compact = CompactVocabulary(vocabulary)
+        self.assertEqual(dict(compact.items()), vocabulary)
+        self.assertEqual(compact["data mining"], 0)
+        self.assertNotIn("mining", compact)
+        self.assertEqual(compact.lookup(["zoology", "unknown", "café"]).tolist(), [1, -1, 3])
+
+    def test_compact_index_is_smaller(self):
+        default = vectorize_majors(self.majors_df, compact=False)
+        compact = vectorize_majors(self.majors_df, compact=True)
+        self.assertEqual(compact["matrix"].dtype, np.float32)
+        self.assertEqual(compact["matrix"].indices.dtype, np.int32)
+        self.assertIsInstance(compact["vectorizer"].vocabulary_, CompactVocabulary)
+        self.assertLess(compact["matrix"].shape[1], default["matrix"].shape[1])
+        self.assertLess(index_memory_report(compact)["total"], index_memory_report(default)["total"])
+
+        user_vector = vectorize_user_profile(self.profile, compact["vectorizer"])
+        self.assertEqual(user_vector.dtype, np.float32)
+        self.assertEqual(score_majors(user_vector, compact).shape, (len(self.majors_df),))
+
+    def test_field_index_weights_apply_at_query_time(self):
+        vectors = vectorize_majors(self.majors_df, mode="fields")
+        user_vector = vectorize_user_profile(self.profile, vectors["vectorizer"])
+        slices = vectors["vectorizer"].field_slices
+
+        def expected(weights):
+            total = np.zeros(len(self.majors_df))
+            for field, (start, stop) in slices.items():
+                block = vectors["matrix"][:, start:stop] @ user_vector[:, start:stop].T
+                total += weights[field] * block.toarray().ravel()
+            return total / sum(weights[field] for field in slices)
+
+        np.testing.assert_allclose(score_majors(user_vector, vectors), expected(config.FIELD_WEIGHTS), rtol=1e-6)
+
+        original = dict(config.FIELD_WEIGHTS)
+        try:
+            config.FIELD_WEIGHTS["example_career_paths"] = 4.0
+            np.testing.assert_allclose(
+                score_majors(user_vector, vectors), expected(config.FIELD_WEIGHTS), rtol=1e-6
+            )
+        finally:
+            config.FIELD_WEIGHTS.clear()
+            config.FIELD_WEIGHTS.update(original)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import load_context, normalize_user_data, recommend
+from major_matcher.data_loader import load_majors_data
+from major_matcher.live_session import IncrementalScores, SessionStore, UnknownSessionError
+from major_matcher.similarity import score_majors, vectorize_majors, vectorize_user_profile
+from major_matcher.term_cache import build_term_cache, profile_values
+
+EDITS = [
+    {"op": "add", "field": "skills", "value": "Problem Solving"},
+    {"op": "set", "field": "career_aspiration", "value": "software engineer"},
+    {"op": "add", "field": "hobbies", "value": "Coding/Programming"},
+    {"op": "add", "field": "skills", "value": "Critical Thinking"},
+    {"op": "grade", "subject": "overall", "value": "70"},
+    {"op": "remove", "field": "skills", "value": "Problem Solving"},
+    {"op": "set", "field": "stream", "value": "science"},
+    {"op": "add", "field": "skills", "value": "robotics club"},
+    {"op": "set", "field": "career_aspiration", "value": "doctor in a hospital"},
+]
+
+
+class LiveSessionTests(unittest.TestCase):
+    def _assert_same(self, live, expected):
+        self.assertEqual([r["major_name"] for r in live], [r["major_name"] for r in expected])
+        np.testing.assert_allclose([r["score"] for r in live], [r["score"] for r in expected], rtol=1e-9)
+
+    def test_each_edit_matches_full_recommend(self):
+        store = SessionStore()
+        session_id = store.create(normalize_user_data({"grades": {"overall": 80}}))
+        session = store.get(session_id)
+        for edit in EDITS:
+            live = store.update(session_id, [edit])
+            self._assert_same(live, recommend(session.profile))
+        self.assertEqual(session.profile["skills"], ["critical thinking", "robotics club"])
+
+    def test_lsa_state_matches_score_majors(self):
+        majors_df = load_majors_data()
+        vectors = vectorize_majors(majors_df, mode="lsa")
+        cache = build_term_cache(vectors, load_context())
+        state = IncrementalScores(vectors)
+        counts = {}
+        profile = {"career_aspiration": "", "skills": [], "hobbies": []}
+        for skill in ["problem solving", "teamwork", "communication"]:
+            profile["skills"].append(skill)
+            new = cache.sequence_counts(profile_values(profile))
+            state.update(counts, new)
+            counts = new
+            expected = score_majors(vectorize_user_profile(profile, vectors["vectorizer"]), vectors)
+            np.testing.assert_allclose(state.scores(), expected, atol=1e-5)
+
+    def test_idle_expiry_and_capacity(self):
+        now = [0.0]
+        store = SessionStore(max_sessions=2, idle_seconds=10, clock=lambda: now[0])
+        first = store.create({})
+        second = store.create({})
+        now[0] = 5
+        store.get(first)
+        third = store.create({})
+        with self.assertRaises(UnknownSessionError):
+            store.get(second)
+        now[0] = 30
+        with self.assertRaises(UnknownSessionError):
+            store.get(third)
+        self.assertEqual(len(store), 0)
+
+    def test_rejects_unknown_edit(self):
+        store = SessionStore()
+        session_id = store.create({})
+        with self.assertRaises(ValueError):
+            store.update(session_id, [{"op": "rename", "field": "skills"}])
+
+    def test_rejected_batch_leaves_session_unchanged(self):
+        store = SessionStore()
+        session_id = store.create(normalize_user_data({"stream": "science"}))
+        before = store.update(session_id, [])
+        for bad in ({"op": "rename", "field": "skills"}, "add skills"):
+            with self.assertRaises((TypeError, ValueError)):
+                store.update(session_id, EDITS[:4] + [bad])
+            session = store.get(session_id)
+            self.assertEqual(session.profile["skills"], [])
+            self.assertEqual(session.profile["career_aspiration"], "")
+            self.assertEqual(store.update(session_id, []), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
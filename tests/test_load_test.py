@@ -0,0 +1,107 @@
+import argparse
+import importlib.util
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher.synthetic import STREAM_SUBJECTS, synthetic_profiles
+from major_matcher.user_profile import normalize_user_data, to_form_data
+
+_spec = importlib.util.spec_from_file_location("load_test", ROOT / "scripts" / "load_test.py")
+load_test = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(load_test)
+
+
+class SyntheticProfileTests(unittest.TestCase):
+    def test_profiles_are_seeded_and_use_stream_subjects(self):
+        profiles = synthetic_profiles(50, seed=3)
+        self.assertEqual(profiles, synthetic_profiles(50, seed=3))
+        for profile in profiles:
+            subjects = set(profile["grades"]) - {"overall"}
+            self.assertEqual(subjects, set(STREAM_SUBJECTS[profile["stream"]]))
+            self.assertTrue(1 <= len(profile["skills"]) <= 5)
+            self.assertFalse(any("e.g." in skill for skill in profile["skills"]))
+
+    def test_explain_share_only_adds_the_flag(self):
+        plain = synthetic_profiles(200, seed=3)
+        explained = synthetic_profiles(200, seed=3, explain_share=0.25)
+        self.assertFalse(any("explain" in profile for profile in plain))
+        flagged = sum(profile.pop("explain", False) for profile in explained)
+        self.assertTrue(20 <= flagged <= 80)
+        self.assertEqual(explained, plain)
+
+    def test_form_data_round_trips_through_normalization(self):
+        for profile in synthetic_profiles(50, seed=1):
+            normalized = normalize_user_data(profile)
+            self.assertEqual(normalize_user_data(to_form_data(normalized)), normalized)
+
+
+class LoadGeneratorTests(unittest.TestCase):
+    def setUp(self):
+        app = Flask(__name__)
+        self.seen = []
+
+        @app.route("/api/recommend", methods=["POST"])
+        def recommend():
+            self.seen.append((request.args.get("catalog"), request.get_json()))
+            if request.get_json().get("variant") == "bad":
+                return jsonify({"error": "busy"}), 503
+            return jsonify({"message": "success"})
+
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/recommend"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join(5)
+
+    def args(self, **overrides):
+        options = dict(
+            url=self.url, capture=None, synthetic=20, catalog=None, seed=0, rate=0.0,
+            concurrency=2, duration=5.0, requests=12, timeout=5.0, explain_share=0.0,
+        )
+        options.update(overrides)
+        return argparse.Namespace(**options)
+
+    def test_closed_loop_report(self):
+        report = load_test.run(self.args())
+        self.assertEqual(report["requests"], 12)
+        self.assertEqual(report["statuses"], {"200": 12})
+        self.assertEqual(report["error_rate"], 0.0)
+        self.assertLessEqual(report["latency_ms"]["p50"], report["latency_ms"]["p99"])
+        self.assertFalse(any("explain" in body for _catalog, body in self.seen))
+
+    def test_explain_share_of_synthetic_requests(self):
+        load_test.run(self.args(explain_share=1.0))
+        self.assertTrue(self.seen)
+        self.assertTrue(all(body["explain"] is True for _catalog, body in self.seen))
+
+    def test_open_loop_replays_capture(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            capture = Path(tmp) / "capture.jsonl"
+            lines = [
+                {"catalog": "oman-2026", "variant": None, "explain": True, "payload": {"skills": ["Teamwork"]}},
+                {"catalog": None, "variant": "bad", "payload": {"skills": []}},
+            ]
+            capture.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+            report = load_test.run(self.args(capture=capture, rate=50.0, duration=0.2, requests=None))
+        self.assertEqual(report["requests"], 10)
+        self.assertEqual(report["statuses"], {"200": 5, "503": 5})
+        self.assertEqual(report["error_rate"], 0.5)
+        self.assertIn(("oman-2026", {"skills": ["Teamwork"], "explain": True}), self.seen)
+
+
+if __name__ == "__main__":
+    unittest.main()
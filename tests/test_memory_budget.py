@@ -0,0 +1,78 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import config
+from major_matcher.memory_diagnostics import MemoryTracer, memory_report
+from major_matcher.synthetic import synthetic_profiles, write_synthetic_catalog
+from major_matcher.user_profile import normalize_user_data
+
+
+def _mib(value):
+    return f"{value / 1024 / 1024:.1f} MiB"
+
+
+class MemoryTracerTests(unittest.TestCase):
+    def test_stage_reports_peak_and_retained(self):
+        tracer = MemoryTracer()
+        try:
+            kept = []
+            with tracer.stage("alloc"):
+                temporary = bytearray(4_000_000)
+                kept.append(bytearray(1_000_000))
+                del temporary
+        finally:
+            tracer.close()
+        stage = tracer.stages["alloc"]
+        self.assertGreaterEqual(stage["peak"], 5_000_000)
+        self.assertGreaterEqual(stage["retained"], 1_000_000)
+        self.assertLess(stage["retained"], 2_000_000)
+
+
+class MemoryBudgetTests(unittest.TestCase):
+    """Fails when a synthetic catalog of MEMORY_TEST_MAJORS outgrows the configured budget."""
+
+    @classmethod
+    def setUpClass(cls):
+        profiles = [normalize_user_data(profile) for profile in synthetic_profiles(5, seed=0)]
+        with tempfile.TemporaryDirectory() as tmp:
+            majors_path = write_synthetic_catalog(Path(tmp) / "majors.json", config.MEMORY_TEST_MAJORS)
+            cls.report = memory_report(majors_path, profiles=profiles)
+
+    def test_report_covers_stages_and_components(self):
+        self.assertEqual(self.report["majors"], config.MEMORY_TEST_MAJORS)
+        self.assertEqual(set(self.report["stages"]), {"build.read", "build.index", "build.term_cache"})
+        self.assertIn("request.similarity", self.report["requests"])
+        self.assertIn("index.vectorizer.vocabulary_", self.report["components"])
+        self.assertIn("majors_df", self.report["components"])
+
+    def test_peak_within_budget(self):
+        peak = self.report["peak_bytes"]
+        self.assertLessEqual(
+            peak, config.MEMORY_TEST_PEAK_BYTES, f"peak {_mib(peak)}; stages: {self.report['stages']}"
+        )
+
+    def test_retained_within_budget(self):
+        retained = self.report["retained_bytes"]
+        self.assertLessEqual(
+            retained,
+            config.MEMORY_TEST_RETAINED_BYTES,
+            f"retained {_mib(retained)}; components: {self.report['components']}",
+        )
+
+    def test_request_peak_within_budget(self):
+        request = self.report["requests"]["request.total"]
+        self.assertLessEqual(
+            request["peak"],
+            config.MEMORY_TEST_REQUEST_PEAK_BYTES,
+            f"request peak {_mib(request['peak'])}; stages: {self.report['requests']}",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
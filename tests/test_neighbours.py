@@ -0,0 +1,41 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher.data_loader import load_majors_data
+from major_matcher.neighbours import build_neighbour_table
+from major_matcher.recommender import UnknownMajorError, related_majors
+from major_matcher.similarity import vectorize_majors
+
+
+class NeighbourTableTests(unittest.TestCase):
+    def test_blockwise_table_matches_dense_similarity(self):
+        matrix = vectorize_majors(load_majors_data())["matrix"]
+        table = build_neighbour_table(matrix, top_n=5, block_cells=60)
+
+        dense = (matrix @ matrix.T).toarray()
+        np.fill_diagonal(dense, -np.inf)
+        expected_scores = -np.sort(-dense, axis=1)[:, :5]
+        np.testing.assert_allclose(table["scores"], expected_scores, rtol=1e-6)
+        for row in range(matrix.shape[0]):
+            self.assertNotIn(row, table["indices"][row].tolist())
+            np.testing.assert_allclose(dense[row, table["indices"][row]], table["scores"][row], rtol=1e-6)
+
+    def test_related_majors_lookup(self):
+        related = related_majors("GUTECH-CS", k=3)
+        self.assertEqual(len(related), 3)
+        self.assertNotIn("GUTECH-CS", [item["major_id"] for item in related])
+        scores = [item["score"] for item in related]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        with self.assertRaises(UnknownMajorError):
+            related_majors("NOT-A-MAJOR")
+
+
+if __name__ == "__main__":
+    unittest.main()
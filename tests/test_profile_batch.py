@@ -0,0 +1,98 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import get_registry, normalize_user_data
+from major_matcher.profile_batch import normalize_batch
+from major_matcher.similarity import vectorize_user_profile
+from major_matcher.synthetic import synthetic_profiles
+
+ODD_PAYLOADS = [
+    {
+        "stream": " Science ",
+        "grades": {"Maths ": "95%", "maths": " 88 ", "Physics": "A", "Overall": "90", "overall": "about 91.5"},
+        "career_aspiration": "  Software Engineer (AI) ",
+        "skills": ["  AI / ML ", "Programming", "", "  "],
+        "custom_skills": ["Programming"],
+        "hobbies": "Reading",
+    },
+    {"grades": {"arabic": "٨٥", "english": None, "islam": 77, "pe": "1_000"}, "career_aspiration": None},
+    {"grades": "not a dict", "stream": None, "hobbies": ["Chess"], "custom_hobbies": ["  chess  ", "!!"]},
+    {},
+]
+
+
+class ProfileBatchTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.payloads = synthetic_profiles(300, seed=17) + ODD_PAYLOADS
+        cls.expected = [normalize_user_data(payload) for payload in cls.payloads]
+
+    def assert_profiles(self, batch, expected):
+        self.assertEqual(len(batch), len(expected))
+        for row, reference in enumerate(expected):
+            actual = batch.profile(row)
+            self.assertEqual(actual, reference, row)
+            self.assertEqual(list(actual["grades"]), list(reference["grades"]), row)
+
+    def test_matches_normalize_user_data(self):
+        batch = normalize_batch(self.payloads)
+        self.assert_profiles(batch, self.expected)
+        self.assertEqual(len(batch.values), len(set(batch.values)))
+        self.assertEqual(batch.grades.shape, (len(self.payloads), len(batch.subjects)))
+
+    def test_nan_grades_come_back_as_none(self):
+        payloads = [
+            {"grades": {"maths": "NaN", "physics": float("nan"), "english": "85", "overall": "nan"}},
+            {"grades": {"maths": "inf", "overall": 70}},
+        ]
+        expected = []
+        for payload in payloads:
+            reference = normalize_user_data(payload)
+            # The documented difference: NaN grades are missing in the grade matrix.
+            grades = {key: None if value != value else value for key, value in reference["grades"].items()}
+            overall = reference["overall_grade"]
+            expected.append(
+                dict(
+                    reference,
+                    grades=grades,
+                    grades_text="; ".join(f"{k}: {v}" for k, v in grades.items() if v is not None),
+                    overall_grade=None if overall != overall else overall,
+                )
+            )
+        self.assertNotEqual(expected[0], normalize_user_data(payloads[0]))
+        self.assert_profiles(normalize_batch(payloads), expected)
+
+    def test_dataframe_inputs(self):
+        synthetic = self.payloads[:300]
+        self.assert_profiles(normalize_batch(pd.DataFrame(synthetic)), self.expected[:300])
+        self.assert_profiles(normalize_batch(pd.json_normalize(synthetic)), self.expected[:300])
+
+    def test_empty_batch(self):
+        batch = normalize_batch([])
+        self.assertEqual(len(batch), 0)
+        self.assertEqual(batch.profiles(), [])
+
+    def test_user_matrix_matches_vectorize_user_profile(self):
+        _majors, _context, vectors = get_registry().get()
+        batch = normalize_batch(self.payloads)
+        for term_cache in (vectors.get("term_cache"), None):
+            with self.subTest(term_cache=term_cache is not None):
+                matrix = batch.user_matrix(dict(vectors, term_cache=term_cache))
+                expected = sparse.vstack(
+                    [vectorize_user_profile(profile, vectors["vectorizer"], term_cache) for profile in self.expected]
+                )
+                self.assertEqual(matrix.shape, expected.shape)
+                np.testing.assert_allclose(matrix.toarray(), expected.toarray(), rtol=0, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+import json
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import config, recommend, register_catalog
+from major_matcher.profile_store import ProfileStore
+from major_matcher.synthetic import synthetic_profiles, write_synthetic_catalog
+from major_matcher.user_profile import normalize_user_data
+
+
+class ProfileStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        folder = Path(self.tmp.name)
+        self.majors_path = write_synthetic_catalog(folder / "majors.json", 120, seed=4)
+        profiles = synthetic_profiles(150, seed=9)
+        self.profiles = {f"student-{i}": normalize_user_data(profile) for i, profile in enumerate(profiles)}
+        # Candidate lists no deeper than RULES_TOP_N make some updates fall back to a full re-score.
+        self.store = ProfileStore(folder / "profiles.sqlite3", depth=config.RULES_TOP_N, batch_size=40)
+        self.store.sync_catalog(self.majors_path)
+        self.store.put_profiles(self.profiles)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def records(self):
+        return json.loads(self.majors_path.read_text(encoding="utf-8"))
+
+    def write(self, records):
+        self.majors_path.write_text(json.dumps(records), encoding="utf-8")
+
+    def assert_store_exact(self):
+        for profile_id, profile in self.profiles.items():
+            self.assertEqual(self.store.get_results(profile_id), self.store.recommend(profile), profile_id)
+
+    def test_initial_results_match_recommend(self):
+        register_catalog("profile-store-test", self.majors_path)
+        self.assertEqual(self.store.count(), len(self.profiles))
+        for profile_id, profile in self.profiles.items():
+            stored = self.store.get_results(profile_id)
+            expected = recommend(profile, catalog="profile-store-test")
+            self.assertEqual(
+                [(item["major_name"], item["reason"]) for item in stored],
+                [(item["major_name"], item["reason"]) for item in expected],
+            )
+            for item, reference in zip(stored, expected):
+                self.assertAlmostEqual(item["score"], reference["score"], places=9)
+
+    def test_incremental_update_matches_full_rescore(self):
+        (popular, _count), (removed, _count) = Counter(
+            item["major_id"] for profile_id in self.profiles for item in self.store.get_results(profile_id)
+        ).most_common(2)
+        records = self.records()
+        for record in records:
+            if record["major_id"] == popular:
+                record["min_overall_percentage (%)"] = 99.5
+        edited = next(record for record in records if record["major_id"] not in (popular, removed))
+        edited["curriculum_keywords"] = ["robotics", "machine learning", "ethics"]
+        records.append(dict(records[0], major_id="NEW-1", major_name="Applied Robotics"))
+        records = [record for record in records if record["major_id"] != removed]
+        self.write(records)
+
+        report = self.store.sync_catalog(self.majors_path)
+        self.assertEqual(report["majors"]["added"], ["NEW-1"])
+        self.assertEqual(report["majors"]["removed"], [removed])
+        self.assertEqual(sorted(report["majors"]["changed"]), sorted([popular, edited["major_id"]]))
+        self.assertEqual(report["majors"]["text_changed"], [edited["major_id"]])
+        self.assertGreater(report["top_k_changed"], 0)
+        self.assertGreater(report["fully_rescored"], 0)
+        self.assertLessEqual(report["written"], len(self.profiles))
+        for change in report["changes"]:
+            stored = self.store.get_results(change["profile_id"])
+            self.assertEqual(change["after"], [item["major_id"] for item in stored])
+        self.assert_store_exact()
+
+    def test_unrelated_requirement_change_writes_nothing(self):
+        served = {item["major_id"] for profile_id in self.profiles for item in self.store.get_results(profile_id)}
+        records = self.records()
+        target = next(record for record in records if record["major_id"] not in served)
+        target["min_grade_requirements"] = {"maths": 99}
+        self.write(records)
+
+        report = self.store.sync_catalog(self.majors_path)
+        self.assertEqual(report["majors"]["changed"], [target["major_id"]])
+        self.assertEqual(report["majors"]["text_changed"], [])
+        self.assertEqual(report["top_k_changed"], 0)
+        self.assert_store_exact()
+
+    def test_reordered_catalog_stays_exact(self):
+        records = self.records()
+        records.reverse()
+        records[0]["industry_keywords"] = ["healthcare", "hospitals"]
+        self.write(records)
+        self.store.sync_catalog(self.majors_path)
+        self.assert_store_exact()
+
+    def test_reopened_store_keeps_catalog_and_results(self):
+        path = self.store.path
+        before = {profile_id: self.store.get_results(profile_id) for profile_id in self.profiles}
+        version = self.store.catalog_version
+        self.store.close()
+
+        self.store = ProfileStore(path, depth=config.RULES_TOP_N)
+        self.assertEqual(self.store.catalog_version, version)
+        self.assertEqual({profile_id: self.store.get_results(profile_id) for profile_id in self.profiles}, before)
+        report = self.store.sync_catalog(self.majors_path)
+        self.assertEqual(report["written"], 0)
+        self.assert_store_exact()
+        with self.assertRaises(ValueError):
+            ProfileStore(path, variant="soft-grades")
+
+
+    def failing_after(self, name, calls):
+        original = getattr(self.store, name)
+        seen = []
+
+        def wrapped(*args, **kwargs):
+            seen.append(1)
+            if len(seen) > calls:
+                raise RuntimeError("interrupted")
+            return original(*args, **kwargs)
+
+        return mock.patch.object(self.store, name, side_effect=wrapped)
+
+    def snapshot(self):
+        return {profile_id: self.store.get_results(profile_id) for profile_id in self.profiles}
+
+    def test_failed_sync_changes_nothing(self):
+        before, version = self.snapshot(), self.store.catalog_version
+        records = self.records()
+        records[0]["curriculum_keywords"] = ["astronomy", "telescopes"]
+        records[1]["min_overall_percentage (%)"] = 99.5
+        self.write(records)
+        with self.failing_after("_results", 30), self.assertRaises(RuntimeError):
+            self.store.sync_catalog(self.majors_path)
+        self.assertEqual(self.store.catalog_version, version)
+        self.assertEqual(self.snapshot(), before)
+        self.assert_store_exact()
+
+        self.store.sync_catalog(self.majors_path)
+        self.assertNotEqual(self.store.catalog_version, version)
+        self.assert_store_exact()
+
+    def test_failed_rebuild_keeps_index_and_vectors(self):
+        before, version = self.snapshot(), self.store.catalog_version
+        index_bytes = self.store.index_path.read_bytes()
+        records = self.records()
+        records.append(dict(records[0], major_id="NEW-1", curriculum_keywords=["volcanology", "seismographs"]))
+        self.write(records)
+        with self.failing_after("_score_profiles", 2), self.assertRaises(RuntimeError):
+            self.store.rebuild(self.majors_path)
+        self.assertEqual(self.store.index_path.read_bytes(), index_bytes)
+        self.assertEqual(list(self.store.index_path.parent.glob("*.tmp")), [])
+        self.assertEqual((self.store.catalog_version, self.snapshot()), (version, before))
+        self.assert_store_exact()
+
+    def test_reopen_finishes_a_committed_index_move(self):
+        records = self.records()
+        records.append(dict(records[0], major_id="NEW-1", curriculum_keywords=["volcanology", "seismographs"]))
+        self.write(records)
+        with mock.patch.object(self.store, "_settle_index"):
+            self.store.rebuild(self.majors_path)
+        version = self.store.catalog_version
+        self.assertTrue(self.store._staged_index(version).exists())
+        self.store.close()
+
+        self.store = ProfileStore(self.store.path, depth=config.RULES_TOP_N)
+        self.assertFalse(self.store._staged_index(version).exists())
+        self.assertEqual(self.store.catalog_version, version)
+        self.assert_store_exact()
+
+
+if __name__ == "__main__":
+    unittest.main()
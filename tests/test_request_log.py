@@ -0,0 +1,134 @@
+import io
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher.metrics import Metrics
+from major_matcher.recommender import recommend_with_shadows
+from major_matcher.request_log import RequestLogger
+
+
+class BlockingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait(5)
+        return super().write(text)
+
+
+class RequestLoggerTests(unittest.TestCase):
+    def test_records_are_written_as_json_lines(self):
+        stream = io.StringIO()
+        logger = RequestLogger(stream=stream, sample_rate=1.0, queue_size=10, metrics=Metrics())
+        logger.log({"request_id": "a", "top_ids": ["m1"]})
+        logger.log({"request_id": "b", "top_ids": []})
+        logger.close()
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([line["request_id"] for line in lines], ["a", "b"])
+        self.assertIn("ts", lines[0])
+        self.assertEqual(logger.metrics.snapshot()["counters"]["request_log.written"], 2)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        stream = BlockingStream()
+        logger = RequestLogger(stream=stream, sample_rate=1.0, queue_size=2, metrics=Metrics())
+        accepted = [logger.log({"n": n}) for n in range(10)]
+        self.assertFalse(all(accepted))
+        self.assertGreater(logger.dropped, 0)
+        self.assertEqual(logger.metrics.snapshot()["counters"]["request_log.dropped"], logger.dropped)
+        stream.release.set()
+        logger.close()
+        written = len(stream.getvalue().splitlines())
+        self.assertEqual(written + logger.dropped, 10)
+
+    def test_write_errors_are_counted_and_logging_continues(self):
+        class FailingStream(io.StringIO):
+            failures = 1
+
+            def write(self, text):
+                if self.failures:
+                    self.failures -= 1
+                    raise OSError("disk full")
+                return super().write(text)
+
+        stream = FailingStream()
+        logger = RequestLogger(stream=stream, sample_rate=1.0, queue_size=10, metrics=Metrics())
+        logger.log({"n": 1})
+        logger.flush()
+        logger.log({"n": 2})
+        logger.close()
+        counters = logger.metrics.snapshot()["counters"]
+        self.assertEqual(counters["request_log.write_errors"], 1)
+        self.assertEqual([json.loads(line)["n"] for line in stream.getvalue().splitlines()], [2])
+
+    def test_unopenable_path_does_not_block_flush(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            logger = RequestLogger(path=tmp, sample_rate=1.0, queue_size=2, metrics=Metrics())
+            for n in range(5):
+                logger.log({"n": n})
+                logger.flush()
+            logger.close()
+        self.assertEqual(logger.metrics.snapshot()["counters"]["request_log.write_errors"], 5)
+
+    def test_flush_returns_and_log_restarts_after_writer_dies(self):
+        class BrokenStream(io.StringIO):
+            broken = True
+
+            def write(self, text):
+                if self.broken:
+                    self.broken = False
+                    raise RuntimeError("unexpected")
+                return super().write(text)
+
+        stream = BrokenStream()
+        logger = RequestLogger(stream=stream, sample_rate=1.0, queue_size=10, metrics=Metrics())
+        with mock.patch.object(threading, "excepthook", lambda args: None):
+            logger.log({"n": 1})
+            logger._thread.join(5)
+        logger.flush()
+        logger.log({"n": 2})
+        logger.close()
+        self.assertEqual([json.loads(line)["n"] for line in stream.getvalue().splitlines()], [2])
+
+    def test_log_does_not_change_the_callers_record(self):
+        logger = RequestLogger(stream=io.StringIO(), sample_rate=1.0, queue_size=10, metrics=Metrics())
+        record = {"request_id": "a"}
+        logger.log(record)
+        logger.close()
+        self.assertEqual(record, {"request_id": "a"})
+
+    def test_sampling(self):
+        self.assertFalse(RequestLogger(stream=io.StringIO(), sample_rate=0.0).sampled())
+        self.assertTrue(RequestLogger(stream=io.StringIO(), sample_rate=1.0).sampled())
+        logger = RequestLogger(stream=io.StringIO(), sample_rate=0.25, rng=iter([0.1, 0.3]).__next__)
+        self.assertEqual([logger.sampled(), logger.sampled()], [True, False])
+
+
+class TraceTests(unittest.TestCase):
+    def test_trace_has_version_timings_and_top_ids(self):
+        profile = {
+            "grades": {"maths": 95.0},
+            "overall_grade": 90.0,
+            "career_aspiration": "software engineer",
+            "skills": ["problem solving"],
+            "hobbies": ["coding/programming"],
+            "stream": "science",
+        }
+        trace = {}
+        results, _shadows = recommend_with_shadows(profile, trace=trace)
+        self.assertTrue(trace["catalog_version"])
+        self.assertEqual(set(trace["timings_ms"]), {"similarity", "features", "rules", "reasons"})
+        self.assertEqual(len(trace["top_ids"]), len(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
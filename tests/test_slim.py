@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import config, load_majors_data, recommend, register_catalog
+from major_matcher.catalog import index_source
+from major_matcher.index_io import INDEX_FORMAT_VERSION, save_index
+from major_matcher.similarity import score_majors, vectorize_majors, vectorize_user_profile
+from major_matcher.slim import SLIM_INDEX_FORMAT_VERSION, SlimIndex, SlimRecommender
+from major_matcher.synthetic import synthetic_profiles
+from major_matcher.user_profile import normalize_user_data, profile_text
+
+
+class SlimRuntimeTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.majors_path = Path(cls.tmp.name) / "majors.json"
+        cls.majors_path.write_bytes(config.MAJORS_PATH.read_bytes())
+        cls.majors_df = load_majors_data(cls.majors_path)
+        cls.profiles = [normalize_user_data(profile) for profile in synthetic_profiles(60, seed=11)]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_format_version_matches_index_io(self):
+        self.assertEqual(SLIM_INDEX_FORMAT_VERSION, INDEX_FORMAT_VERSION)
+
+    def test_scores_match_sklearn_path(self):
+        for mode, compact, tolerance in (("sparse", False, 1e-12), ("sparse", True, 1e-6), ("lsa", False, 1e-5)):
+            with self.subTest(mode=mode, compact=compact):
+                vectors = vectorize_majors(self.majors_df, mode=mode, compact=compact)
+                index_path = save_index(vectors, Path(self.tmp.name) / f"{mode}-{compact}.npz")
+                slim = SlimIndex.load(index_path)
+                for profile in self.profiles:
+                    expected = score_majors(vectorize_user_profile(profile, vectors["vectorizer"]), vectors)
+                    actual = slim.score(*slim.transform(profile_text(profile)))
+                    np.testing.assert_allclose(actual, expected, rtol=0, atol=tolerance)
+
+    def test_recommendations_match_recommend(self):
+        save_index(
+            vectorize_majors(self.majors_df),
+            self.majors_path.with_name(config.CATALOG_INDEX_FILENAME),
+            index_source(self.majors_path),
+        )
+        register_catalog("slim-test", self.majors_path)
+        slim = SlimRecommender.load(self.majors_path)
+        for variant in (None, *config.WEIGHT_PROFILES):
+            for profile in self.profiles:
+                expected = recommend(profile, catalog="slim-test", variant=variant)
+                actual = slim.recommend(profile, variant=variant)
+                self.assertEqual(
+                    [(item["major_name"], item["reason"]) for item in actual],
+                    [(item["major_name"], item["reason"]) for item in expected],
+                )
+                np.testing.assert_allclose(
+                    [item["score"] for item in actual], [item["score"] for item in expected], atol=1e-12
+                )
+
+    def test_serving_imports_neither_sklearn_nor_pandas(self):
+        save_index(
+            vectorize_majors(self.majors_df),
+            self.majors_path.with_name(config.CATALOG_INDEX_FILENAME),
+            index_source(self.majors_path),
+        )
+        script = (
+            "import sys\n"
+            "from major_matcher.slim import SlimRecommender\n"
+            "from major_matcher.user_profile import normalize_user_data\n"
+            f"slim = SlimRecommender.load({str(self.majors_path)!r})\n"
+            "slim.recommend(normalize_user_data({'career_aspiration': 'Doctor', 'skills': ['Teamwork']}))\n"
+            "print(sorted(name for name in ('sklearn', 'pandas', 'scipy') if name in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_rejects_missing_or_stale_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            majors_path = Path(tmp) / "majors.json"
+            majors_path.write_bytes(self.majors_path.read_bytes())
+            with self.assertRaises(FileNotFoundError):
+                SlimRecommender.load(majors_path)
+            index_path = save_index(vectorize_majors(self.majors_df), Path(tmp) / config.CATALOG_INDEX_FILENAME)
+            with self.assertRaises(ValueError):
+                SlimRecommender.load(majors_path)
+            save_index(vectorize_majors(self.majors_df), index_path, index_source(majors_path))
+            SlimRecommender.load(majors_path)
+            # An edited majors file is stale even when the index looks newer.
+            stat = index_path.stat()
+            majors_path.write_bytes(majors_path.read_bytes() + b"\n")
+            os.utime(majors_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+            with self.assertRaises(ValueError):
+                SlimRecommender.load(majors_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
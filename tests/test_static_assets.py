@@ -0,0 +1,128 @@
+import gzip
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from flask import Flask
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.static_assets import IMMUTABLE_CACHE, REVALIDATE_CACHE, StaticAssets, build_static
+from major_matcher import config
+
+
+class StaticAssetsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.build_dir = Path(self.tmp.name) / "static"
+        assets = StaticAssets(config.FRONTEND_DIR, self.build_dir)
+        self.assets = assets
+        self.app = Flask(__name__)
+
+        @self.app.route("/<path:name>")
+        def serve(name):
+            return assets.response(name) or ("missing", 404)
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fingerprinted(self, stem, suffix):
+        return next(
+            name
+            for name, entry in self.assets.files.items()
+            if entry["immutable"] and name.startswith(stem + ".") and name.endswith(suffix)
+        )
+
+    def test_html_points_at_fingerprinted_assets(self):
+        response = self.client.get("/index.html")
+        body = response.get_data(as_text=True)
+        self.assertIn(self.fingerprinted("style", ".css"), body)
+        self.assertIn(self.fingerprinted("translations", ".js"), body)
+        self.assertEqual(response.headers["Cache-Control"], REVALIDATE_CACHE)
+
+    def test_gzip_is_served_when_accepted(self):
+        name = self.fingerprinted("translations", ".js")
+        response = self.client.get(f"/{name}", headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["Cache-Control"], IMMUTABLE_CACHE)
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.get_data()), (config.FRONTEND_DIR / "translations.js").read_bytes())
+
+        plain = self.client.get(f"/{name}")
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertNotEqual(plain.headers["ETag"], response.headers["ETag"])
+
+    def test_matching_etag_returns_304(self):
+        first = self.client.get("/style.css", headers={"Accept-Encoding": "gzip"})
+        again = self.client.get(
+            "/style.css", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]}
+        )
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.get_data(), b"")
+        self.assertEqual(again.headers["ETag"], first.headers["ETag"])
+
+    def test_unknown_file_is_not_served(self):
+        self.assertEqual(self.client.get("/run_frontend.py").status_code, 404)
+
+    def test_build_skips_compression_for_tiny_files(self):
+        source = Path(self.tmp.name) / "src"
+        source.mkdir()
+        (source / "tiny.css").write_text("a{}", encoding="utf-8")
+        manifest = build_static(source, Path(self.tmp.name) / "out")
+        self.assertEqual(list(manifest["files"]["tiny.css"]["encodings"]), ["identity"])
+
+
+    def test_concurrent_builds_leave_one_complete_build(self):
+        build_dir = Path(self.tmp.name) / "shared"
+        errors = []
+
+        def start():
+            try:
+                StaticAssets(config.FRONTEND_DIR, build_dir)
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=start) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        assets = StaticAssets(config.FRONTEND_DIR, build_dir)
+        for entry in assets.files.values():
+            for variant in entry["encodings"].values():
+                self.assertTrue((build_dir / variant["file"]).exists())
+        self.assertEqual([path.name for path in build_dir.parent.iterdir() if path.name.startswith(".")], [])
+
+
+class AppRoutingTests(unittest.TestCase):
+    def test_api_misses_are_not_served_as_assets(self):
+        from backend.app import app
+
+        client = app.test_client()
+        self.assertEqual(client.get("/api/recommend").status_code, 405)
+        missing = client.get("/api/recomend")
+        self.assertEqual(missing.status_code, 404)
+        self.assertNotIn(b"Not found: api/", missing.get_data())
+        self.assertEqual(client.get("/questionnaire.html").status_code, 200)
+        self.assertEqual(client.get("/apiary.html").status_code, 404)
+
+    def test_fast_json_stays_on_in_debug_mode(self):
+        from backend import app as backend
+
+        debug = backend.app.debug
+        backend.app.debug = True
+        try:
+            self.assertTrue(backend._fast_json())
+        finally:
+            backend.app.debug = debug
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher.data_loader import load_majors_data
+from major_matcher.stream_loader import load_majors_columns, load_majors_stream
+
+
+class StreamLoaderTests(unittest.TestCase):
+    def test_matches_dataframe_loader(self):
+        expected = load_majors_data()
+        streamed, errors = load_majors_stream(chunk_records=4)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(streamed), len(expected))
+        for column in expected.columns:
+            for left, right in zip(expected[column], streamed[column]):
+                if left != left and right != right:
+                    continue
+                self.assertEqual(left, right, column)
+
+    def test_reports_malformed_records_and_keeps_the_rest(self):
+        text = (
+            "[\n"
+            '  {"major_name": "Physics", "min_overall_percentage (%)": "80"},\n'
+            '  {"major_name": "Broken",, },\n'
+            "  42,\n"
+            '  {"major_name": "Tricky \\" ] } name", "required_hs_subjects": ["Maths"]}\n'
+            "]\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "majors.json"
+            path.write_text(text, encoding="utf-8")
+            columns, errors = load_majors_columns(path, chunk_chars=8)
+
+        self.assertEqual(columns["major_name"], ["Physics", 'Tricky " ] } name'])
+        self.assertEqual(list(columns["min_overall_percentage"][:1]), [80.0])
+        self.assertEqual(columns["required_hs_subjects"][1], ["mathematics"])
+        self.assertEqual([error["index"] for error in errors], [1, 2])
+        self.assertEqual([error["line"] for error in errors], [3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
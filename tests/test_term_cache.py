@@ -0,0 +1,57 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher.data_loader import load_context, load_majors_data
+from major_matcher.similarity import vectorize_majors, vectorize_user_profile
+from major_matcher.term_cache import build_term_cache
+from major_matcher.user_profile import normalize_user_data
+
+PAYLOADS = [
+    {
+        "stream": "science",
+        "career_aspiration": "Software engineering or data analytics",
+        "skills": ["Problem Solving", "Teamwork", "Digital Literacy / Technology Skills"],
+        "custom_skills": ["AI", "ML"],
+        "hobbies": ["Coding/Programming", "Reading"],
+    },
+    {
+        "stream": "literary",
+        "career_aspiration": "journalism and public relations",
+        "skills": ["Communication", "Creativity"],
+        "hobbies": ["Photography", "Debating"],
+        "custom_hobbies": ["blogging", "the"],
+    },
+    # Values chosen so that bigrams span two neighbouring values.
+    {"career_aspiration": "data", "skills": ["science", "machine"], "hobbies": ["learning", "web"], "stream": "design"},
+    {"career_aspiration": "", "skills": [], "hobbies": []},
+]
+
+
+class TermCacheTests(unittest.TestCase):
+    def test_assembled_vectors_match_transform(self):
+        majors_df = load_majors_data()
+        for compact in (False, True):
+            vectors = vectorize_majors(majors_df, compact=compact)
+            cache = build_term_cache(vectors, load_context())
+            for payload in PAYLOADS:
+                profile = normalize_user_data(payload)
+                expected = vectorize_user_profile(profile, vectors["vectorizer"]).toarray()
+                actual = vectorize_user_profile(profile, vectors["vectorizer"], cache).toarray()
+                np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-7)
+
+    def test_canonical_values_are_precomputed(self):
+        vectors = vectorize_majors(load_majors_data())
+        cache = build_term_cache(vectors, load_context())
+        for value in ("problem solving", "coding programming", "science", "literary"):
+            self.assertIn(value, cache.entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
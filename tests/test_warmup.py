@@ -0,0 +1,98 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import config
+from major_matcher.catalog import CatalogRegistry, index_source
+from major_matcher.data_loader import load_majors_data
+from major_matcher.index_io import save_index
+from major_matcher.similarity import vectorize_majors
+from major_matcher.warmup import Readiness, warm_up
+
+
+class WarmUpTests(unittest.TestCase):
+    def test_warm_up_reports_ready_with_phase_timings(self):
+        readiness = warm_up(readiness=Readiness())
+        snapshot = readiness.snapshot()
+        self.assertEqual(snapshot["status"], "ready")
+        self.assertIn(f"catalog:{config.DEFAULT_CATALOG}", snapshot["phases_ms"])
+        self.assertIn("total", snapshot["phases_ms"])
+
+    def test_failed_warm_up_is_not_ready(self):
+        readiness = warm_up(catalogs=["no-such-catalog"], readiness=Readiness())
+        self.assertFalse(readiness.ready)
+        self.assertEqual(readiness.state, "failed")
+
+    def test_registry_loads_saved_index(self):
+        majors_df = load_majors_data()
+        with tempfile.TemporaryDirectory() as tmp:
+            majors_path = Path(tmp) / "majors.json"
+            majors_path.write_bytes(config.MAJORS_PATH.read_bytes())
+            index_path = majors_path.with_name(config.CATALOG_INDEX_FILENAME)
+            save_index(vectorize_majors(majors_df), index_path, index_source(majors_path))
+
+            registry = CatalogRegistry()
+            registry.register("saved", majors_path, config.CONTEXT_PATH)
+            with self.assertLogs("major_matcher.catalog", level="INFO") as logs:
+                _df, _context, vectors = registry.get("saved")
+        self.assertIn("index loaded", logs.output[0])
+        self.assertEqual(vectors["major_ids"]["GUTECH-CS"], 0)
+        self.assertIsNotNone(vectors["term_cache"])
+        expected = vectorize_majors(majors_df)["matrix"]
+        np.testing.assert_allclose(vectors["matrix"].toarray(), expected.toarray())
+
+
+    def test_registry_rebuilds_index_of_other_content_or_settings(self):
+        majors_df = load_majors_data()
+        with tempfile.TemporaryDirectory() as tmp:
+            majors_path = Path(tmp) / "majors.json"
+            majors_path.write_bytes(config.MAJORS_PATH.read_bytes())
+            index_path = majors_path.with_name(config.CATALOG_INDEX_FILENAME)
+            save_index(vectorize_majors(majors_df), index_path, index_source(majors_path))
+
+            with mock.patch.object(config, "LSA_COMPONENTS", config.LSA_COMPONENTS + 1):
+                registry = CatalogRegistry()
+                registry.register("saved", majors_path, config.CONTEXT_PATH)
+                with self.assertLogs("major_matcher.catalog", level="INFO") as logs:
+                    registry.get("saved")
+            self.assertIn("index built", logs.output[-1])
+
+            # Same row count, older mtime than the index, different text.
+            stat = index_path.stat()
+            edited = majors_path.read_text(encoding="utf-8").replace("Computer", "Kompyuter")
+            majors_path.write_text(edited, encoding="utf-8")
+            os.utime(majors_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+            registry = CatalogRegistry()
+            registry.register("saved", majors_path, config.CONTEXT_PATH)
+            with self.assertLogs("major_matcher.catalog", level="INFO") as logs:
+                registry.get("saved")
+            self.assertIn("index built", logs.output[-1])
+
+    def test_registry_keeps_saved_index_when_field_weights_change(self):
+        majors_df = load_majors_data()
+        with tempfile.TemporaryDirectory() as tmp:
+            majors_path = Path(tmp) / "majors.json"
+            majors_path.write_bytes(config.MAJORS_PATH.read_bytes())
+            index_path = majors_path.with_name(config.CATALOG_INDEX_FILENAME)
+            save_index(vectorize_majors(majors_df), index_path, index_source(majors_path))
+
+            weights = {field: weight * 2 + 0.5 for field, weight in config.FIELD_WEIGHTS.items()}
+            with mock.patch.object(config, "FIELD_WEIGHTS", weights):
+                registry = CatalogRegistry()
+                registry.register("saved", majors_path, config.CONTEXT_PATH)
+                with self.assertLogs("major_matcher.catalog", level="INFO") as logs:
+                    registry.get("saved")
+            self.assertIn("index loaded", logs.output[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
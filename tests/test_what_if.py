@@ -0,0 +1,106 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from major_matcher import config, normalize_user_data, recommend, register_catalog
+from major_matcher.what_if_analysis import apply_grade_deltas, prepare_what_if, what_if
+
+
+PROFILE = normalize_user_data(
+    {
+        "grades": {"overall": 72, "math": 60},
+        "career_aspiration": "software engineer",
+        "skills": ["Problem Solving", "Critical Thinking"],
+        "hobbies": ["Video Games"],
+    }
+)
+
+
+class WhatIfTests(unittest.TestCase):
+    def _top(self, results):
+        return [(r["major_name"], round(r["score"], 12), r["reason"]) for r in results]
+
+    def test_matches_full_recommend(self):
+        result = what_if(PROFILE, {"overall": 6})
+        changed = apply_grade_deltas(PROFILE, {"overall": 6})
+        self.assertEqual(changed["overall_grade"], 78.0)
+        self.assertEqual(self._top(result["baseline"]), self._top(recommend(PROFILE)))
+        self.assertEqual(self._top(result["recommendations"]), self._top(recommend(changed)))
+
+    def test_package_exports_the_function(self):
+        import major_matcher
+
+        self.assertIs(major_matcher.what_if, what_if)
+
+    def test_base_is_reused_across_grade_changes(self):
+        first = prepare_what_if(PROFILE)
+        other = dict(PROFILE, overall_grade=95.0)
+        self.assertIs(prepare_what_if(other), first)
+
+    def test_minimal_changes_reach_top_k(self):
+        records = [
+            {"major_id": "ROB", "major_name": "Robotics", "curriculum_keywords": ["robots", "factories"],
+             "min_overall_percentage": 60, "min_grade_requirements": {"physics": 80, "chemistry": 85}},
+            {"major_id": "MECH", "major_name": "Mechatronics", "curriculum_keywords": ["robotics", "machines"],
+             "min_overall_percentage": 60, "min_grade_requirements": {"physics": 75}},
+            {"major_id": "AUTO", "major_name": "Automation", "curriculum_keywords": ["robots", "factories", "lines"],
+             "min_overall_percentage": 60},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "majors.json"
+            path.write_text(json.dumps(records), encoding="utf-8")
+            register_catalog("what-if-test", path, config.CONTEXT_PATH)
+            profile = normalize_user_data(
+                {"grades": {"overall": 90, "physics": 70, "chemistry": 70}, "career_aspiration": "robots factories"}
+            )
+            before = what_if(profile, catalog="what-if-test", target_major="ROB", k=1)
+
+        self.assertNotEqual(before["baseline"][0]["major_id"], "ROB")
+        target = before["target"]
+        self.assertTrue(target["reachable"])
+        deltas = {subject: grade - profile["grades"][subject] for subject, grade in target["changes"].items()}
+        after = what_if(profile, deltas, catalog="what-if-test", k=1)
+        self.assertEqual(after["recommendations"][0]["major_id"], "ROB")
+        self.assertEqual(target["changes"], {"physics": 80.0, "chemistry": 85.0})
+        self.assertEqual(target["points"], sum(deltas.values()))
+
+    def test_unknown_subject_delta(self):
+        with self.assertRaises(ValueError):
+            apply_grade_deltas(PROFILE, {"chemistry": 5})
+
+
+    def test_invalid_deltas_are_rejected(self):
+        for deltas in ([["math", 5]], {"math": "lots"}, {"math": float("nan")}, {"overall": float("inf")}, {"math": None}):
+            with self.assertRaises(ValueError):
+                apply_grade_deltas(PROFILE, deltas)
+
+    def test_grades_are_clamped(self):
+        changed = apply_grade_deltas(PROFILE, {"math": 1e9, "overall": -500})
+        self.assertEqual(changed["grades"]["mathematics"], 100.0)
+        self.assertEqual(changed["overall_grade"], 0.0)
+
+    def test_replaced_catalog_is_rescored(self):
+        records = [
+            {"major_id": "A", "major_name": "Robotics", "curriculum_keywords": ["software", "engineer"]},
+            {"major_id": "B", "major_name": "Nursing", "curriculum_keywords": ["hospital"]},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            first, second = Path(tmp) / "one.json", Path(tmp) / "two.json"
+            first.write_text(json.dumps(records), encoding="utf-8")
+            second.write_text(json.dumps(records[::-1]), encoding="utf-8")
+            register_catalog("what-if-replace", first, config.CONTEXT_PATH)
+            before = prepare_what_if(PROFILE, catalog="what-if-replace")
+            register_catalog("what-if-replace", second, config.CONTEXT_PATH)
+            after = prepare_what_if(PROFILE, catalog="what-if-replace")
+        self.assertIsNot(after, before)
+        self.assertEqual(list(after.majors_df["major_id"]), ["B", "A"])
+
+
+if __name__ == "__main__":
+    unittest.main()